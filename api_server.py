@@ -4,130 +4,765 @@ BERT Aspect Extraction - FastAPI
 Çıktı: Her yorum için 25 elemanlı dizi
 
 Çalıştırma: python api_server.py
+Çoklu süreç: API_WORKERS=4 python api_server.py
 """
 
 import torch
-import torch.nn as nn
-from transformers import AutoModel, AutoTokenizer
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from starlette.requests import ClientDisconnect
+from typing import List, Literal, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import Counter
+from contextlib import asynccontextmanager
+import threading
+import asyncio
+import queue
+import time
 import uvicorn
+import json
+import io
 import os
+import numpy as np
+
+from aspect_model import (
+    load_model, load_tokenizer, load_onnx_session, quantize_int8,
+    checkpoint_tag, length_buckets, MAX_LENGTH
+)
+from prediction_cache import PredictionCache, RESULT_SHAPE
+from presence_filter import load_filter
+from text_clean import clean_texts, dedup_texts, MIN_TEXT_LENGTH
+
+# msgpack opsiyonel: yoksa sadece JSON ve .npy yanıtları verilir
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
 
 # ============================================
 # AYARLAR
 # ============================================
-CHECKPOINT_DIR = "checkpoint-6000"
-MAX_LENGTH = 256
+# Model: "teacher" (BERTurk-base checkpoint) | "student" (distill.py ile eğitilen
+# küçük model, aynı 25x22 çıktı). Karşılaştırma: STUDENT_DIR/distill_report.json
+ASPECT_MODEL = os.environ.get("ASPECT_MODEL", "teacher")
+TEACHER_DIR = "checkpoint-6000"
+STUDENT_DIR = os.environ.get("ASPECT_STUDENT_DIR", "checkpoint-student")
+CHECKPOINT_DIR = STUDENT_DIR if ASPECT_MODEL == "student" else TEACHER_DIR
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+API_PORT = int(os.environ.get("API_PORT", 8000))
+
+# Çoklu süreç: API_WORKERS > 1 ise uvicorn bu kadar worker süreci açar.
+# Ağırlıklar safetensors dosyasından mmap ile bağlandığı için (bkz.
+# aspect_model.load_safetensors_mmap) tüm worker'lar aynı fiziksel sayfaları
+# paylaşır; worker eklemek ~440 MB'ı çoğaltmaz. int8 modunda quantize edilen
+# ağırlıklar her worker'a özeldir.
+API_WORKERS = int(os.environ.get("API_WORKERS", 1))
+WORKER_HEALTHCHECK_TIMEOUT = int(os.environ.get("WORKER_HEALTHCHECK_TIMEOUT", 120))  # sn
+
+# Micro-batching: istekler bu pencere boyunca (veya BATCH_MAX_SIZE metne
+# ulaşana kadar) toplanır, tek forward ile işlenir
+BATCH_WINDOW_MS = 10
+BATCH_MAX_SIZE = 64
+
+# Inference executor: süreç başına aynı anda en fazla INFERENCE_WORKERS forward
+# çalışır; çekirdekler API_WORKERS x INFERENCE_WORKERS forward'a eşit bölünür.
+# Kuyrukta MAX_QUEUE'dan fazla metin bekliyorsa yeni istekler 503 alır.
+CPU_COUNT = os.cpu_count() or 1
+THREADS_PER_WORKER = int(os.environ.get("THREADS_PER_WORKER", 4))
+INFERENCE_WORKERS = int(os.environ.get(
+    "INFERENCE_WORKERS", max(1, CPU_COUNT // API_WORKERS // THREADS_PER_WORKER)))
+MAX_QUEUE = int(os.environ.get("MAX_QUEUE", 2048))
+REQUEST_TIMEOUT = float(os.environ.get("REQUEST_TIMEOUT", 30))  # sn
+
+# Model her aspect için en olası TOP_K class'ı ve olasılıklarını üretir
+# (önbellek de bu formatta tutar). /predict_batch?top_k=0|1|2 ile istenir.
+TOP_K = RESULT_SHAPE[1]
+
+# NDJSON akışı (/predict_stream): satırlar STREAM_BATCH_SIZE'lık iç batch'lerde
+# işlenir, her batch bitince sonuçları hemen yazılır. Bellekte en fazla iki batch
+# tutulur (biri modeldeyken sıradaki okunur); girdi boyutundan bağımsızdır.
+STREAM_BATCH_SIZE = int(os.environ.get("STREAM_BATCH_SIZE", 256))
+STREAM_MAX_LINE_BYTES = 1 << 20   # tek satır için üst sınır (1 MB)
+STREAM_RETRIES = 5                # akış ortasında 503 (kuyruk dolu) alınırsa tekrar sayısı
+
+# Padding: "bucket" -> metinler token uzunluğuna göre sıralanıp kovalara
+# bölünür, her kova kendi en uzun üyesine kadar doldurulur.
+# "max_length" -> eski davranış (her metin MAX_LENGTH'e doldurulur)
+PADDING_MODE = "bucket"
+BUCKET_SIZE = 16
+
+# Backend: "torch" (eager PyTorch) | "onnx" (ONNX Runtime, CPU)
+# ONNX modeli için önce: python onnx_export.py
+BACKEND = os.environ.get("ASPECT_BACKEND", "torch")
+ONNX_PATH = os.environ.get("ASPECT_ONNX_PATH", os.path.join(CHECKPOINT_DIR, "model.onnx"))
+ORT_INTRA_THREADS = int(os.environ.get("ORT_INTRA_THREADS", 0))  # 0 -> worker başına çekirdek
+ORT_INTER_THREADS = int(os.environ.get("ORT_INTER_THREADS", 0))
+ORT_OPT_LEVEL = os.environ.get("ORT_OPT_LEVEL", "all")  # disable | basic | extended | all
+
+# Quantization (sadece torch backend + CPU): "none" | "int8"
+# int8 ancak quant_eval.py raporu bu checkpoint için (checkpoint_tag) presence-F1
+# düşüşünü eşiğin altında gösteriyorsa açılır, aksi halde fp32 ile devam edilir
+QUANTIZE = os.environ.get("ASPECT_QUANTIZE", "none")
+QUANT_REPORT = os.path.join(CHECKPOINT_DIR, "quant_report.json")
+QUANT_MAX_F1_DROP = float(os.environ.get("QUANT_MAX_F1_DROP", 0.01))
+
+# Tahmin önbelleği: bellek LRU (CACHE_SIZE=0 -> kapalı) + opsiyonel SQLite
+# Anahtar model versiyonunu içerir; checkpoint değişince eski kayıtlar kullanılmaz
+CACHE_SIZE = int(os.environ.get("ASPECT_CACHE_SIZE", 100_000))
+CACHE_DB = os.environ.get("ASPECT_CACHE_DB", "")  # örn. "tahmin_cache.db"
+
+# Presence ön-filtresi (opsiyonel, iki aşamalı mod): hashed n-gram modelinin
+# "hiç aspect yok" dediği yorumlar BERT'e gönderilmez, 25 sıfır döner.
+# Önce: python presence_filter.py (eşik ve recall raporu presence_filter.json'da)
+PRESENCE_FILTER = os.environ.get("ASPECT_PRESENCE_FILTER", "0") == "1"
+PRESENCE_THRESHOLD = os.environ.get("PRESENCE_THRESHOLD", "")  # boş -> raporda seçilen eşik
+
+# Sunucu tarafı temizleme: /predict_batch'e {"clean": true} ile ham yorum
+# gönderilebilir; otel_pipeline ile aynı clean_text + MIN_TEXT_LENGTH filtresi
+# uygulanır, kısa kalanlar modele gitmez (JSON'da null, ikili yanıtta sıfır
+# satır; indeksleri X-Dropped başlığında). Batch içindeki tekrarlar modele bir
+# kez gider, sonuç hepsine dağıtılır: "dedup": "exact" (varsayılan) birebir
+# aynı, "near" (isteğe bağlı) noktalama/boşluk/büyük-küçük harf (Türkçe I/İ
+# kurallarıyla) farkı olan metinler; cased modelde tahmini değiştirebilir
+# (sayı: X-Deduplicated)
+
+# ============================================
+# MODEL YÜKLE
+# ============================================
+def int8_approved():
+    """quant_eval.py raporu int8 için F1 düşüşünü kabul edilebilir buluyor mu?"""
+    if DEVICE != "cpu" or BACKEND != "torch":
+        print("⚠️  int8 sadece torch backend + CPU ile destekleniyor, fp32 kullanılacak.")
+        return False
+    if not os.path.exists(QUANT_REPORT):
+        print(f"⚠️  {QUANT_REPORT} yok! Önce: python quant_eval.py (fp32 kullanılacak)")
+        return False
+    with open(QUANT_REPORT, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    tag = checkpoint_tag(CHECKPOINT_DIR)
+    if report.get("checkpoint_tag") != tag:
+        print(f"⚠️  {QUANT_REPORT} başka bir checkpoint için ({report.get('checkpoint_tag')} != {tag}). "
+              f"Tekrar: python quant_eval.py (fp32 kullanılacak)")
+        return False
+    drop = report["presence_f1_drop"]
+    if drop > QUANT_MAX_F1_DROP:
+        print(f"⚠️  int8 reddedildi: presence-F1 düşüşü {drop:.4f} > {QUANT_MAX_F1_DROP} (fp32 kullanılacak)")
+        return False
+    print(f"✅ int8 onaylı: presence-F1 düşüşü {drop:.4f}")
+    return True
+
+TORCH_THREADS = max(1, CPU_COUNT // (API_WORKERS * INFERENCE_WORKERS))
+torch.set_num_threads(TORCH_THREADS)
+
+# Model import sırasında değil, uygulama açılışında arka plan thread'inde
+# yüklenir (bkz. lifespan): /health (liveness) hemen cevap verir, /ready ve
+# tahmin uçları model hazır olana kadar 503 döner.
+MODEL_STATE = "loading"   # loading | ready | error
+LOAD_ERROR = None
+LOAD_SECONDS = None
+
+tokenizer = None
+model = None
+ort_session = None
+MODEL_TAG = None
+cache = None
+presence_filter = None
+presence_threshold = None
+presence_stats = Counter()
+presence_lock = threading.Lock()
+clean_stats = Counter()
+
+def load_presence_filter():
+    """presence_filter.json + ağırlıkları yükler; yoksa filtre kapalı kalır"""
+    global presence_filter, presence_threshold
+    presence_filter, config = load_filter(TEACHER_DIR)  # filtre modelden bağımsız
+    if presence_filter is None:
+        print("⚠️  Presence filtresi yok! Önce: python presence_filter.py (filtre kapalı)")
+        return
+    presence_threshold = float(PRESENCE_THRESHOLD or config["threshold"])
+    print(f"✅ Presence filtresi açık: eşik {presence_threshold}")
+
+def print_distill_report():
+    """Öğrenci servis ediliyorsa distill.py karşılaştırmasını özetler"""
+    path = os.path.join(STUDENT_DIR, "distill_report.json")
+    if not os.path.exists(path):
+        print(f"⚠️  {path} yok! Öğrenci doğrulanmamış (python distill.py)")
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        teacher, student = json.load(f)["sonuclar"]
+    print(f"📊 Öğrenci: presence-F1 {student['presence']['f1']:.4f} (öğretmen {teacher['presence']['f1']:.4f}) | "
+          f"{student['yorum_sn']} yorum/sn (öğretmen {teacher['yorum_sn']})")
+
+def load_all():
+    """Tokenizer, model/ONNX oturumu, int8 ve önbelleği yükler; MODEL_STATE'i günceller"""
+    global tokenizer, model, ort_session, QUANTIZE, MODEL_TAG, cache
+    global MODEL_STATE, LOAD_ERROR, LOAD_SECONDS
+    start = time.perf_counter()
+    print(f"🖥️  Device: {DEVICE if BACKEND == 'torch' else 'cpu'} | Backend: {BACKEND} | "
+          f"Workers: {INFERENCE_WORKERS} x {TORCH_THREADS} thread")
+    print(f"📁 Checkpoint: {CHECKPOINT_DIR} ({ASPECT_MODEL})")
+    print("\n🔄 Model yükleniyor...")
+    try:
+        if not os.path.exists(CHECKPOINT_DIR):
+            raise FileNotFoundError(f"{CHECKPOINT_DIR} bulunamadı!")
+
+        # Config ve tokenizer checkpoint klasöründen okunur (ilk açılışta oraya kaydedilir)
+        tokenizer = load_tokenizer(CHECKPOINT_DIR)
+        if ASPECT_MODEL == "student":
+            print_distill_report()
+        if BACKEND == "onnx":
+            if not os.path.exists(ONNX_PATH):
+                raise FileNotFoundError(f"{ONNX_PATH} bulunamadı! Önce: python onnx_export.py")
+            ort_session = load_onnx_session(
+                ONNX_PATH, ORT_INTRA_THREADS or TORCH_THREADS, ORT_INTER_THREADS, ORT_OPT_LEVEL)
+        else:
+            model = load_model(CHECKPOINT_DIR, DEVICE)
+
+        if QUANTIZE == "int8" and int8_approved():
+            model = quantize_int8(model)
+        else:
+            QUANTIZE = "none"
+        MODEL_TAG = f"{checkpoint_tag(CHECKPOINT_DIR)}-{BACKEND}-{'int8' if QUANTIZE == 'int8' else 'fp32'}"
+        if PRESENCE_FILTER:
+            load_presence_filter()
+        if presence_filter is not None:
+            MODEL_TAG += f"-pf{presence_threshold}"
+
+        if CACHE_SIZE > 0 or CACHE_DB:
+            cache = PredictionCache(MODEL_TAG, max_items=CACHE_SIZE, db_path=CACHE_DB or None)
+    except Exception as e:
+        LOAD_ERROR = str(e)
+        MODEL_STATE = "error"
+        print(f"❌ HATA: {e}")
+        return
+
+    LOAD_SECONDS = round(time.perf_counter() - start, 3)
+    MODEL_STATE = "ready"
+    print(f"✅ Model yüklendi! ({MODEL_TAG}, {LOAD_SECONDS} sn)")
 
 # ============================================
-# MODEL
+# TAHMİN
 # ============================================
-class BertMultiHeadFocal(nn.Module):
-    def __init__(self, base_model_name, num_aspects=25, num_classes=22, dropout=0.1):
-        super().__init__()
-        self.bert = AutoModel.from_pretrained(base_model_name)
-        hidden = self.bert.config.hidden_size
-        self.dropout = nn.Dropout(dropout)
-        self.heads = nn.ModuleList([
-            nn.Linear(hidden, num_classes) for _ in range(num_aspects)
-        ])
+def predict_topk(input_ids, attention_mask):
+    """
+    Tokenize edilmiş batch -> (en olası TOP_K class id [B, 25, TOP_K] uint8,
+    softmax olasılıkları [B, 25, TOP_K] float16), seçili backend ile
+    """
+    if ort_session is not None:
+        logits = torch.from_numpy(ort_session.run(["logits"], {
+            "input_ids": input_ids.numpy(),
+            "attention_mask": attention_mask.numpy()
+        })[0])
+    else:
+        with torch.no_grad():
+            logits = model(input_ids.to(DEVICE), attention_mask.to(DEVICE))['logits'].float().cpu()
+    probs, ids = torch.softmax(logits, dim=-1).topk(TOP_K, dim=-1)
+    return ids.to(torch.uint8).numpy(), probs.to(torch.float16).numpy()
+
+def labels_of(result):
+    """(ids, probs) -> 25 elemanlı argmax class id listesi"""
+    return result[0][:, 0].tolist()
+
+def empty_result(presence_prob):
+    """Filtrede elenen yorum: 25 aspect için class 0, olasılık 1 - presence"""
+    ids = np.zeros(RESULT_SHAPE, dtype=np.uint8)
+    probs = np.zeros(RESULT_SHAPE, dtype=np.float16)
+    probs[:, 0] = 1.0 - presence_prob
+    return ids, probs
+
+def run_model(texts, padding=PADDING_MODE):
+    """Metin listesi -> her metin için (ids [25, TOP_K], probs [25, TOP_K])"""
+    if presence_filter is None:
+        return run_bert(texts, padding)
+
+    scores = presence_filter.predict_proba(texts)
+    keep = [i for i, s in enumerate(scores) if s >= presence_threshold]
+    with presence_lock:
+        presence_stats["checked"] += len(texts)
+        presence_stats["skipped"] += len(texts) - len(keep)
+
+    results = [None if s >= presence_threshold else empty_result(float(s)) for s in scores]
+    if keep:
+        for i, result in zip(keep, run_bert([texts[i] for i in keep], padding)):
+            results[i] = result
+    return results
+
+def run_bert(texts, padding=PADDING_MODE):
+    """Metin listesi -> her metin için (ids [25, TOP_K], probs [25, TOP_K]), sadece BERT"""
+    if padding == "max_length":
+        inputs = tokenizer(
+            texts,
+            return_tensors="pt",
+            padding="max_length",
+            max_length=MAX_LENGTH,
+            truncation=True
+        )
+        ids, probs = predict_topk(inputs['input_ids'], inputs['attention_mask'])
+        return list(zip(ids, probs))
+    
+    # Kova kova çalıştır, sonuçları orijinal sıraya geri yerleştir
+    results = [None] * len(texts)
+    for idx, input_ids, attention_mask in length_buckets(tokenizer, texts, BUCKET_SIZE):
+        ids, probs = predict_topk(input_ids, attention_mask)
+        for row, i in enumerate(idx):
+            results[i] = (ids[row], probs[row])
     
-    def forward(self, input_ids=None, attention_mask=None):
-        out = self.bert(input_ids=input_ids, attention_mask=attention_mask)
-        cls = out.last_hidden_state[:, 0, :]
-        cls = self.dropout(cls)
-        logits = torch.stack([head(cls) for head in self.heads], dim=1)
-        return {"logits": logits}
+    return results
 
 # ============================================
-# MODEL YÜKLE
+# MICRO-BATCHING
 # ============================================
-print(f"🖥️  Device: {DEVICE}")
-print(f"📁 Checkpoint: {CHECKPOINT_DIR}")
-print("\n🔄 Model yükleniyor...")
+def _bucket(n):
+    """Histogram kovası: 1, 2, 3-4, 5-8, 9-16, ..."""
+    if n <= 2:
+        return str(n)
+    hi = 1 << (n - 1).bit_length()
+    return f"{hi // 2 + 1}-{hi}"
 
-if not os.path.exists(CHECKPOINT_DIR):
-    print(f"❌ HATA: {CHECKPOINT_DIR} bulunamadı!")
-    exit(1)
+class BatchStats:
+    """Batch boyutu ve kuyruk derinliği histogramları"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.texts = 0
+        self.batch_size = Counter()
+        self.queue_depth = Counter()
 
-tokenizer = AutoTokenizer.from_pretrained("dbmdz/bert-base-turkish-cased")
+    def record(self, batch_size, queue_depth):
+        with self.lock:
+            self.batches += 1
+            self.texts += batch_size
+            self.batch_size[_bucket(batch_size)] += 1
+            self.queue_depth[_bucket(queue_depth)] += 1
 
-model = BertMultiHeadFocal(
-    base_model_name="dbmdz/bert-base-turkish-cased",
-    num_aspects=25,
-    num_classes=22,
-    dropout=0.1
-)
+    def snapshot(self):
+        with self.lock:
+            return {
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "batch_size_hist": dict(self.batch_size),
+                "queue_depth_hist": dict(self.queue_depth),
+            }
+
+class QueueFullError(Exception):
+    pass
+
+class MicroBatcher:
+    """
+    Eşzamanlı isteklerden gelen metinleri toplayıp tek batch'te modele verir.
+    Her metin için bir Future döner; sonuç hazır olunca Future tamamlanır.
+    Toplanan batch'ler sınırlı bir inference executor'da çalışır; tüm worker'lar
+    meşgulken yeni metinler kuyrukta birikir (bir sonraki batch büyür).
+    """
+    def __init__(self, run_fn, window_ms=BATCH_WINDOW_MS, max_size=BATCH_MAX_SIZE,
+                 workers=INFERENCE_WORKERS, max_queue=MAX_QUEUE):
+        self.run_fn = run_fn
+        self.window = window_ms / 1000.0
+        self.max_size = max_size
+        self.max_queue = max_queue
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.stats = BatchStats()
+        self.rejected = 0
+        self.slots = threading.Semaphore(workers)
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inference")
+        self.thread = threading.Thread(target=self._loop, name="micro-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, texts):
+        """Kuyruk doluysa hiçbir metni eklemeden QueueFullError fırlatır"""
+        with self.lock:
+            pending = self.queue.qsize()
+            if pending and pending + len(texts) > self.max_queue:
+                self.rejected += 1
+                raise QueueFullError(f"{pending} metin kuyrukta bekliyor")
+            futures = []
+            for text in texts:
+                fut = Future()
+                self.queue.put((text, fut))
+                futures.append(fut)
+        return futures
 
-model_path = os.path.join(CHECKPOINT_DIR, "model.safetensors")
-from safetensors.torch import load_file
-state_dict = load_file(model_path)
-model.load_state_dict(state_dict)
+    def _next(self, timeout=None):
+        """Kuyruktan sıradaki metni al (zaman aşımıyla iptal edilenleri atla)"""
+        while True:
+            text, fut = self.queue.get(timeout=timeout)
+            if fut.set_running_or_notify_cancel():
+                return text, fut
 
-model = model.to(DEVICE)
-model.eval()
-print("✅ Model yüklendi!")
+    def _collect(self):
+        """İlk metni bekle, sonra pencere dolana kadar kuyruktan topla"""
+        batch = [self._next()]
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._next(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _loop(self):
+        while True:
+            self.slots.acquire()
+            batch = self._collect()
+            self.stats.record(len(batch), self.queue.qsize())
+            self.executor.submit(self._run, batch)
+
+    def _run(self, batch):
+        try:
+            texts = [text for text, _ in batch]
+            try:
+                preds = self.run_fn(texts)
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                return
+            for (_, fut), pred in zip(batch, preds):
+                fut.set_result(pred)
+        finally:
+            self.slots.release()
+
+batcher = MicroBatcher(run_model)
+
+# ============================================
+# ÖNBELLEK
+# ============================================
+async def wait_results(futures):
+    """Batcher sonuçlarını event loop'u bloklamadan bekle"""
+    gathered = asyncio.gather(*[asyncio.wrap_future(f) for f in futures])
+    # İstek iptal edilirse (ör. akışta bağlantı koptu) gather'ın CancelledError'ı
+    # okunmuş sayılsın; aksi halde "exception was never retrieved" loglanır
+    gathered.add_done_callback(lambda g: g.cancelled() or g.exception())
+    try:
+        return await asyncio.wait_for(gathered, timeout=REQUEST_TIMEOUT)
+    except asyncio.TimeoutError:
+        for f in futures:
+            f.cancel()
+        raise HTTPException(status_code=503, detail="Tahmin zaman aşımına uğradı",
+                            headers={"Retry-After": "1"})
+
+def submit_or_503(texts):
+    try:
+        return batcher.submit(texts)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=f"Sunucu meşgul: {e}",
+                            headers={"Retry-After": "1"})
+
+def ensure_ready():
+    if MODEL_STATE != "ready":
+        detail = "Model yükleniyor" if MODEL_STATE == "loading" else f"Model yüklenemedi: {LOAD_ERROR}"
+        raise HTTPException(status_code=503, detail=detail, headers={"Retry-After": "5"})
+
+async def predict_texts(texts):
+    """Önbellekte olmayan metinleri batcher'a gönderir, sonuçları önbelleğe yazar"""
+    ensure_ready()
+    if cache is None:
+        return list(await wait_results(submit_or_503(texts)))
+    
+    results = await run_in_threadpool(cache.get_many, texts)
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        preds = await wait_results(submit_or_503([texts[i] for i in missing]))
+        for i, pred in zip(missing, preds):
+            results[i] = pred
+        await run_in_threadpool(cache.put_many, [texts[i] for i in missing], preds)
+    return results
+
+async def predict_unique(texts, clean=False, near=False):
+    """
+    Temizlik (opsiyonel) + batch içi tekrar ayıklama; her tekil metin modele bir kez gider
+    -> (her girdi için sonuç ya da None (temizlik sonrası kısa), modele gitmeyen tekrar sayısı)
+    """
+    if clean:
+        texts = await run_in_threadpool(clean_texts, texts)
+    keep = [i for i, t in enumerate(texts) if not clean or len(t) >= MIN_TEXT_LENGTH]
+    unique, inverse = dedup_texts([texts[i] for i in keep], near)
+    preds = await predict_texts(unique) if unique else []
+
+    results = [None] * len(texts)
+    for i, u in zip(keep, inverse):
+        results[i] = preds[u]
+    deduplicated = len(keep) - len(unique)
+    clean_stats["texts"] += len(texts)
+    clean_stats["dropped"] += len(texts) - len(keep)
+    clean_stats["deduplicated"] += deduplicated
+    return results, deduplicated
+
+# ============================================
+# YANIT FORMATLARI
+# ============================================
+NPY_MEDIA_TYPE = "application/x-npy"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+def response_format(accept):
+    """Accept başlığından "npy" | "msgpack" | "json" """
+    if NPY_MEDIA_TYPE in accept:
+        return "npy"
+    if "msgpack" in accept:
+        if not MSGPACK_AVAILABLE:
+            raise HTTPException(status_code=406, detail="msgpack kurulu değil (pip install msgpack)")
+        return "msgpack"
+    return "json"
+
+def stack_results(results, top_k):
+    """
+    (ids, probs) listesi -> ids [N, 25(, k)] uint8, probs [N, 25(, k)] float16; k=1 ise son eksen düşer
+    None (temizlikte elenen) yorumlar sıfır satır olur
+    """
+    k = max(top_k, 1)
+    if any(r is None for r in results):
+        zero = (np.zeros(RESULT_SHAPE, dtype=np.uint8), np.zeros(RESULT_SHAPE, dtype=np.float16))
+        results = [zero if r is None else r for r in results]
+    if results:
+        ids = np.stack([r[0][:, :k] for r in results])
+        probs = np.stack([r[1][:, :k] for r in results])
+    else:
+        ids = np.zeros((0, RESULT_SHAPE[0], k), dtype=np.uint8)
+        probs = np.zeros((0, RESULT_SHAPE[0], k), dtype=np.float16)
+    if k == 1:
+        ids, probs = ids[:, :, 0], probs[:, :, 0]
+    return ids, probs
+
+def encode_results(results, top_k, fmt):
+    """
+    json:    [{"labels": [...], "probs": [...]} | null, ...]
+    npy:     top_k=0 -> uint8 [N, 25]; değilse ("labels" uint8, "probs" float16) alanlı kayıt dizisi
+    msgpack: {"shape": [N, 25(, k)], "labels": uint8 bayt, "probs": float16 (little-endian) bayt}
+    """
+    ids, probs = stack_results(results, top_k)
+    if fmt == "json":
+        probs = np.round(probs.astype(np.float64), 4)
+        return JSONResponse([{"labels": i, "probs": p} if r is not None else None
+                             for i, p, r in zip(ids.tolist(), probs.tolist(), results)])
+
+    if fmt == "npy":
+        if top_k == 0:
+            arr = ids
+        else:
+            arr = np.empty(len(ids), dtype=[("labels", np.uint8, ids.shape[1:]),
+                                            ("probs", np.float16, probs.shape[1:])])
+            arr["labels"] = ids
+            arr["probs"] = probs
+        buf = io.BytesIO()
+        np.save(buf, arr)
+        return Response(buf.getvalue(), media_type=NPY_MEDIA_TYPE)
+
+    body = {"shape": list(ids.shape), "labels": ids.tobytes()}
+    if top_k > 0:
+        body["probs"] = probs.astype("<f2").tobytes()
+    return Response(msgpack.packb(body), media_type=MSGPACK_MEDIA_TYPE)
 
 # ============================================
 # FASTAPI
 # ============================================
-app = FastAPI(title="Aspect API")
+@asynccontextmanager
+async def lifespan(app):
+    threading.Thread(target=load_all, name="model-loader", daemon=True).start()
+    yield
+
+app = FastAPI(title="Aspect API", lifespan=lifespan)
 
 class SingleRequest(BaseModel):
     text: str
 
 class BatchRequest(BaseModel):
     texts: List[str]
+    clean: bool = False                          # ham yorum: sunucuda temizle + kısa olanları ele
+    dedup: Literal["exact", "near"] = "exact"
 
 @app.get("/health")
-def health():
-    return {"status": "ok", "device": DEVICE}
+async def health():
+    """Liveness: süreç ayakta mı (model yüklenirken de 200)"""
+    return {
+        "status": "ok",
+        "model": MODEL_STATE,
+        "aspect_model": ASPECT_MODEL,
+        "device": DEVICE if BACKEND == "torch" else "cpu",
+        "backend": BACKEND,
+        "quantize": QUANTIZE,
+        "pid": os.getpid(),
+    }
+
+@app.get("/ready")
+async def ready():
+    """Readiness: model yüklendi ve tahmin alınabilir mi (değilse 503)"""
+    body = {
+        "status": MODEL_STATE,
+        "model_tag": MODEL_TAG,
+        "load_seconds": LOAD_SECONDS,
+        "error": LOAD_ERROR,
+    }
+    if MODEL_STATE != "ready":
+        return JSONResponse(status_code=503, content=body, headers={"Retry-After": "5"})
+    return body
+
+@app.get("/stats")
+async def stats():
+    """Micro-batching histogramları, executor durumu ve önbellek hit/miss sayaçları"""
+    return {
+        "window_ms": BATCH_WINDOW_MS,
+        "max_batch_size": BATCH_MAX_SIZE,
+        "inference_workers": INFERENCE_WORKERS,
+        "torch_threads": TORCH_THREADS,
+        "max_queue": MAX_QUEUE,
+        "queue_size": batcher.queue.qsize(),
+        "rejected": batcher.rejected,
+        **batcher.stats.snapshot(),
+        "cache": cache.stats() if cache is not None else None,
+        "presence_filter": {"threshold": presence_threshold, **presence_stats}
+                           if presence_filter is not None else None,
+        "clean": {"min_length": MIN_TEXT_LENGTH, **clean_stats},
+    }
 
 @app.post("/predict")
-def predict_single(req: SingleRequest) -> List[int]:
+async def predict_single(req: SingleRequest) -> List[int]:
     """Tek yorum -> 25 elemanlı dizi"""
-    inputs = tokenizer(
-        req.text,
-        return_tensors="pt",
-        padding="max_length",
-        max_length=MAX_LENGTH,
-        truncation=True
-    )
-    inputs = {k: v.to(DEVICE) for k, v in inputs.items()}
-    
-    with torch.no_grad():
-        outputs = model(inputs['input_ids'], inputs['attention_mask'])
-        preds = torch.argmax(outputs['logits'], dim=-1).squeeze()
-    
-    return preds.cpu().tolist()
+    return labels_of((await predict_texts([req.text]))[0])
 
 @app.post("/predict_batch")
-def predict_batch(req: BatchRequest) -> List[List[int]]:
-    """Çoklu yorum -> Her biri 25 elemanlı dizi listesi"""
-    if not req.texts:
-        return []
-    
-    inputs = tokenizer(
-        req.texts,
-        return_tensors="pt",
-        padding="max_length",
-        max_length=MAX_LENGTH,
-        truncation=True
-    )
-    inputs = {k: v.to(DEVICE) for k, v in inputs.items()}
-    
-    with torch.no_grad():
-        outputs = model(inputs['input_ids'], inputs['attention_mask'])
-        preds = torch.argmax(outputs['logits'], dim=-1)
-    
-    return preds.cpu().tolist()
+async def predict_batch(req: BatchRequest, request: Request, response: Response,
+                        top_k: Optional[int] = Query(None, ge=0, le=TOP_K)) -> List[Optional[List[int]]]:
+    """
+    Çoklu yorum -> Her biri 25 elemanlı dizi listesi
+    top_k=1|2: her aspect için en olası 1/2 class ve olasılıkları da döner.
+    Accept: application/x-npy | application/msgpack -> ikili yanıt (varsayılan top_k=1)
+    clean=true: ham yorumlar sunucuda temizlenir, kısa kalanlar için null döner
+    dedup="near": noktalama/boşluk/büyük-küçük harf farkı olan tekrarlar da modele bir kez gider
+    """
+    fmt = response_format(request.headers.get("accept", ""))
+    if top_k is None:
+        top_k = 0 if fmt == "json" else 1
+
+    results, deduplicated = await predict_unique(req.texts, req.clean, req.dedup == "near")
+    headers = {"X-Deduplicated": str(deduplicated)}
+    if req.clean:
+        headers["X-Dropped"] = ",".join(str(i) for i, r in enumerate(results) if r is None)
+    if fmt == "json" and top_k == 0:
+        response.headers.update(headers)
+        return [labels_of(r) if r is not None else None for r in results]
+    resp = encode_results(results, top_k, fmt)
+    resp.headers.update(headers)
+    return resp
+
+# ============================================
+# NDJSON AKIŞ
+# ============================================
+class NDJSONStreamResponse(StreamingResponse):
+    """
+    İstek gövdesi, yanıt akarken okunur. StreamingResponse (ASGI spec < 2.4)
+    arka planda receive() ile disconnect dinler ve gövde parçalarını tüketir;
+    burada yanıt doğrudan akıtılır, bağlantı kopması request.stream()'den gelir.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+
+async def read_ndjson(request):
+    """İstek gövdesinden (satır no, satır) üretir; tüm gövde belleğe alınmaz"""
+    buf = b""
+    line_no = 0
+    async for chunk in request.stream():
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+        if len(buf) > STREAM_MAX_LINE_BYTES:
+            raise ValueError(f"{line_no + 1}. satır {STREAM_MAX_LINE_BYTES} bayttan uzun")
+    if buf.strip():
+        yield line_no + 1, buf
+
+async def read_batches(request):
+    """NDJSON satırlarını STREAM_BATCH_SIZE'lık (satır no, id, metin) batch'lerine böler; hatalı satırlar ayrı döner"""
+    items, errors = [], []
+    async for line_no, line in read_ndjson(request):
+        try:
+            obj = json.loads(line)
+            items.append((line_no, obj.get("id", line_no), str(obj["text"])))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            errors.append({"id": None, "line": line_no, "error": "geçersiz satır, beklenen: {\"id\", \"text\"}"})
+        if len(items) >= STREAM_BATCH_SIZE:
+            yield items, errors
+            items, errors = [], []
+    if items or errors:
+        yield items, errors
+
+async def predict_with_retry(texts):
+    """Akış başladıktan sonra durum kodu değişemez; 503'te bekleyip tekrar dener"""
+    for attempt in range(STREAM_RETRIES):
+        try:
+            return await predict_texts(texts)
+        except HTTPException as e:
+            if e.status_code != 503 or attempt == STREAM_RETRIES - 1:
+                raise
+            await asyncio.sleep(float(e.headers.get("Retry-After", 1)))
+
+async def stream_results(request):
+    """Bir batch modeldeyken sıradakini okur; her batch bitince NDJSON satırlarını yazar"""
+    async def run(items, errors):
+        # (satır no, çıktı satırı): hatalı satırlar da girdideki yerinde yazılır
+        lines = [(err["line"], err) for err in errors]
+        if items:
+            try:
+                preds = await predict_with_retry([text for _, _, text in items])
+                lines += [(n, {"id": i, "labels": labels_of(p)}) for (n, i, _), p in zip(items, preds)]
+            except HTTPException as e:
+                lines += [(n, {"id": i, "error": e.detail}) for n, i, _ in items]
+        lines.sort(key=lambda x: x[0])
+        return "".join(json.dumps(obj, ensure_ascii=False) + "\n" for _, obj in lines)
+
+    pending = None
+    try:
+        async for items, errors in read_batches(request):
+            task = asyncio.ensure_future(run(items, errors))
+            if pending is not None:
+                yield await pending
+            pending = task
+        if pending is not None:
+            yield await pending
+            pending = None
+    except ValueError as e:
+        if pending is not None:
+            yield await pending
+            pending = None
+        yield json.dumps({"id": None, "error": str(e)}, ensure_ascii=False) + "\n"
+    except ClientDisconnect:
+        pass
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+@app.post("/predict_stream")
+async def predict_stream(request: Request):
+    """
+    NDJSON girdi (satır başına {"id", "text"}) -> NDJSON çıktı (satır başına
+    {"id", "labels"}). id olduğu gibi geri döner (yoksa satır numarası).
+    Sonuçlar her iç batch bittiğinde akıtılır.
+    """
+    ensure_ready()
+    return NDJSONStreamResponse(stream_results(request))
 
 if __name__ == "__main__":
     print("\n" + "="*50)
-    print("🚀 API: http://localhost:8000")
-    print("📚 Docs: http://localhost:8000/docs")
+    print(f"🚀 API: http://localhost:{API_PORT}")
+    print(f"📚 Docs: http://localhost:{API_PORT}/docs")
+    if API_WORKERS > 1:
+        print(f"👥 Worker süreci: {API_WORKERS}")
     print("="*50 + "\n")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    if API_WORKERS > 1:
+        # Her worker modülü kendisi import eder; ağırlıklar mmap ile paylaşılır.
+        # Worker açılışı (torch/transformers import) uvicorn'un varsayılan
+        # sağlık kontrolü süresini (5 sn) aşabilir
+        uvicorn.run("api_server:app", host="0.0.0.0", port=API_PORT, workers=API_WORKERS,
+                    timeout_worker_healthcheck=WORKER_HEALTHCHECK_TIMEOUT)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=API_PORT)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect Özet Motoru - build_aspect_summary'nin NumPy sürümü
+Tahminler [N, 25] uint8 class id matrisi olarak alınır; aspect x class id
+sayımı tek bir bincount ile yapılır, duygu/neden dağılımı ve en sık 2 neden bu
+[25, 22] tablodan tamsayı aritmetiğiyle çıkarılır. Sonuç referans saf Python
+build_aspect_summary ile birebir aynı aspect_summary dict'idir (eşitlikte neden
+sırası Counter.most_common gibi ilk görülme sırasıdır).
+
+Kullanım:
+    from aspect_aggregate import summarize
+    aspect_summary = summarize(labels, probs, min_confidence=0.5)
+
+Zaman pencereli / azalan özetler: window_summary, decayed_summary (tüm geçmiş
+üzerinden); artımlı sürümleri için bkz. aspect_store.AspectStore
+
+Eşdeğerlik testi: tests/test_aggregate.py | benchmark: python bench_aggregate.py
+"""
+
+from collections import Counter
+
+import numpy as np
+
+# ============================================
+# AYARLAR
+# ============================================
+NUM_ASPECTS = 25
+NUM_NEDEN = 7
+MAX_CLASS_ID = 3 * NUM_NEDEN  # 21; class_id = 1 + (duygu-1)*7 + (neden-1)
+FLOAT_DECIMALS = 2            # ağırlıklı (float) özetlerde sayıların basamağı
+GUN = 86400
+
+# Aspect isimleri (index 0-24)
+ASPECT_NAMES = [
+    "temizlik", "konum", "oda_kalitesi", "uyku_yatak_kalitesi", "gurultu",
+    "personel", "fiyat_performans", "yemek_kalitesi", "yemek_cesitliligi", "havuz",
+    "spa_hamam", "plaj", "cocuk_dostu", "wifi", "banyo_tuvalet",
+    "klima_isitma", "resepsiyon", "otopark", "guvenlik", "manzara",
+    "oda_servisi", "fitness_spor", "mini_bar", "balkon_teras", "aktivite_zenginligi"
+]
+
+# Neden kodları
+NEDEN_MAP = {
+    1: "yokluk",
+    2: "kalite",
+    3: "erisim",
+    4: "servis",
+    5: "fiyat",
+    6: "olumlu_kalite",
+    7: "notr_bilgi"
+}
+_NEDEN_NAMES = [NEDEN_MAP[k] for k in range(1, NUM_NEDEN + 1)]
+
+# ============================================
+# SAYIM
+# ============================================
+def aspect_counts(labels, confidences=None, min_confidence=0.0, weights=None):
+    """
+    labels: [N, 25] class id (uint8 ya da liste), confidences: aynı şekil (opsiyonel)
+    min_confidence altındaki mention'lar sayılmaz.
+    weights: [N] yorum ağırlıkları (opsiyonel, örn. zamanla azalma); verilirse sayım float
+
+    Returns: (sayım [25, 22], ilk [25, 22])
+        sayım: aspect x class id mention sayısı (class 0 hep 0)
+        ilk: o class'ın aspect'te ilk görüldüğü satır (yoksa N); eşit
+             sayılı nedenlerin sırası için (Counter.most_common gibi)
+    """
+    labels = np.asarray(labels, dtype=np.uint8).reshape(-1, NUM_ASPECTS)
+    n = len(labels)
+    # Mention'ların düz indeksleri (satır sırasıyla); uint8'de 0 - 1 = 255 taşar,
+    # böylece tek karşılaştırma 1..21 aralığını seçer
+    flat = np.flatnonzero(labels - np.uint8(1) < MAX_CLASS_ID)
+    if confidences is not None:
+        # Sadece mention'ların olasılıkları, float64'te karşılaştırılır
+        # (float16/32 dizide eşik yuvarlanıp referanstan farklı sonuç verebilir)
+        confidences = np.asarray(confidences).reshape(-1)
+        flat = flat[~(confidences[flat].astype(np.float64) < min_confidence)]
+
+    num_classes = MAX_CLASS_ID + 1
+    rows = flat // NUM_ASPECTS
+    code = flat % NUM_ASPECTS * num_classes + labels.reshape(-1)[flat]
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)[rows]
+    counts = np.bincount(code, weights=weights, minlength=NUM_ASPECTS * num_classes)
+    first = np.full(NUM_ASPECTS * num_classes, n, dtype=np.intp)
+    np.minimum.at(first, code, rows)
+    return counts.reshape(NUM_ASPECTS, num_classes), first.reshape(NUM_ASPECTS, num_classes)
+
+def top_nedenler(neden_counts, first, top_n=2):
+    """[..., 7] sayım + ilk görülme -> [..., top_n] neden indeksi (yoksa -1)"""
+    order = np.lexsort((first, -neden_counts), axis=-1)[..., :top_n]
+    counts = np.take_along_axis(neden_counts, order, axis=-1)
+    return np.where(counts > 0, order, -1)
+
+# ============================================
+# ÖZET
+# ============================================
+def summary_from_counts(counts, first=None):
+    """
+    aspect_counts çıktısından aspect_summary dict (sadece mention'ı olan aspect'ler)
+    first=None: eşit sayılı nedenler neden koduna göre sıralanır (zaman penceresi vb.)
+    float sayımlar (ağırlıklı) FLOAT_DECIMALS basamağa yuvarlanır.
+    """
+    if first is None:
+        first = np.zeros(counts.shape, dtype=np.intp)
+    if counts.dtype.kind == "f":
+        counts = np.round(counts, FLOAT_DECIMALS)
+    # class_id = 1 + (duygu-1)*7 + (neden-1) -> [25, duygu(olumsuz/nötr/olumlu), neden]
+    counts = counts[:, 1:].reshape(NUM_ASPECTS, 3, NUM_NEDEN)
+    first = first[:, 1:].reshape(NUM_ASPECTS, 3, NUM_NEDEN)
+    duygu = counts.sum(axis=-1).tolist()
+    top = top_nedenler(counts[:, ::-2], first[:, ::-2]).tolist()  # (olumlu, olumsuz)
+    names = [None] + _NEDEN_NAMES  # -1 -> None
+
+    aspect_stats = {}
+    for a, (negatif, notr, pozitif) in enumerate(duygu):
+        if negatif + notr + pozitif == 0:
+            continue
+        (poz1, poz2), (neg1, neg2) = top[a]
+        aspect_stats[ASPECT_NAMES[a]] = {
+            "pozitif": pozitif,
+            "negatif": negatif,
+            "notr": notr,
+            "poz_neden1": names[poz1 + 1],
+            "poz_neden2": names[poz2 + 1],
+            "neg_neden1": names[neg1 + 1],
+            "neg_neden2": names[neg2 + 1]
+        }
+    return aspect_stats
+
+def summarize(labels, confidences=None, min_confidence=0.0, weights=None):
+    """build_aspect_summary ile aynı girdi/çıktı, vektörize (weights: bkz. aspect_counts)"""
+    return summary_from_counts(*aspect_counts(labels, confidences, min_confidence, weights))
+
+# ============================================
+# REFERANS (saf Python)
+# ============================================
+def decode_class_id(class_id):
+    """
+    Class ID'den duygu ve neden çıkar
+    class_id = 1 + (duygu-1)*7 + (neden-1)
+    
+    Returns: (duygu, neden) veya (None, None) if class_id == 0
+    duygu: 1=olumsuz, 2=notr, 3=olumlu
+    neden: 1-7
+    """
+    if class_id == 0:
+        return None, None
+    
+    # Tersine hesapla
+    # class_id - 1 = (duygu-1)*7 + (neden-1)
+    idx = class_id - 1
+    duygu = (idx // 7) + 1  # 1, 2, 3
+    neden = (idx % 7) + 1   # 1-7
+    
+    return duygu, neden
+
+def get_top_nedenler(neden_list, top_n=2):
+    """En sık geçen nedenleri döndür"""
+    if not neden_list:
+        return [None] * top_n
+    
+    counter = Counter(neden_list)
+    most_common = counter.most_common(top_n)
+    
+    result = []
+    for i in range(top_n):
+        if i < len(most_common):
+            neden_code = most_common[i][0]
+            result.append(NEDEN_MAP.get(neden_code))
+        else:
+            result.append(None)
+    
+    return result
+
+def build_aspect_summary(predictions_list, confidences=None, min_confidence=0.0):
+    """
+    Tüm yorumların tahminlerinden aspect_summary oluştur
+    (Referans sürüm; pipeline aynı çıktıyı veren summarize'ı kullanır,
+    eşdeğerlik: tests/test_aggregate.py)
+    
+    predictions_list: [[0,2,16,0,...], [0,0,16,0,...], ...] 
+                      Her biri 25 elemanlı dizi
+    confidences: predictions_list ile aynı şekilde, tahmin edilen class'ın olasılığı
+                 (opsiyonel). min_confidence altındaki mention'lar sayılmaz.
+    
+    Returns: aspect_summary dict
+    """
+    # Her aspect için istatistikleri topla
+    aspect_stats = {}
+    
+    for aspect_idx in range(25):
+        aspect_name = ASPECT_NAMES[aspect_idx]
+        
+        pozitif_count = 0
+        negatif_count = 0
+        notr_count = 0
+        
+        poz_nedenler = []
+        neg_nedenler = []
+        
+        # Tüm yorumları tara
+        for i, preds in enumerate(predictions_list):
+            class_id = preds[aspect_idx]
+            
+            if class_id == 0:
+                continue
+            if confidences is not None and confidences[i][aspect_idx] < min_confidence:
+                continue
+            
+            duygu, neden = decode_class_id(class_id)
+            
+            if duygu == 3:  # olumlu
+                pozitif_count += 1
+                poz_nedenler.append(neden)
+            elif duygu == 1:  # olumsuz
+                negatif_count += 1
+                neg_nedenler.append(neden)
+            elif duygu == 2:  # notr
+                notr_count += 1
+        
+        # En az 1 mention varsa ekle
+        total = pozitif_count + negatif_count + notr_count
+        if total > 0:
+            poz_top = get_top_nedenler(poz_nedenler, 2)
+            neg_top = get_top_nedenler(neg_nedenler, 2)
+            
+            aspect_stats[aspect_name] = {
+                "pozitif": pozitif_count,
+                "negatif": negatif_count,
+                "notr": notr_count,
+                "poz_neden1": poz_top[0],
+                "poz_neden2": poz_top[1],
+                "neg_neden1": neg_top[0],
+                "neg_neden2": neg_top[1]
+            }
+    
+    return aspect_stats
+
+# ============================================
+# ZAMAN
+# ============================================
+def window_summary(labels, timestamps, now, window_days=30, confidences=None, min_confidence=0.0):
+    """
+    Son window_days günün özeti (unix sn zaman damgaları). Gün sınırları
+    AspectStore ile aynı: bugün dahil son window_days takvim günü (UTC).
+    """
+    labels = np.asarray(labels, dtype=np.uint8).reshape(-1, NUM_ASPECTS)
+    days = np.asarray(timestamps, dtype=np.float64) // GUN
+    mask = (days > now // GUN - window_days) & (days <= now // GUN)
+    if confidences is not None:
+        confidences = np.asarray(confidences).reshape(-1, NUM_ASPECTS)[mask]
+    return summary_from_counts(aspect_counts(labels[mask], confidences, min_confidence)[0])
+
+def decayed_summary(labels, timestamps, now, half_life_days=30, confidences=None, min_confidence=0.0):
+    """Her yorum 2^(-yaş / yarı ömür) ağırlığıyla sayılır (float sayımlar)"""
+    age = now - np.minimum(np.asarray(timestamps, dtype=np.float64), now)
+    weights = 2.0 ** (-age / (half_life_days * GUN))
+    return summary_from_counts(aspect_counts(labels, confidences, min_confidence, weights)[0])
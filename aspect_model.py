@@ -0,0 +1,300 @@
+# -*- coding: utf-8 -*-
+"""
+BertMultiHeadFocal - Ortak model tanımı ve yükleme yardımcıları
+api_server.py ve offline araçlar (ONNX export, benchmark) buradan kullanır
+
+Kullanım:
+    from aspect_model import load_model, load_tokenizer
+    model = load_model("checkpoint-6000")
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import torch
+import torch.nn as nn
+from transformers import AutoConfig, AutoModel, AutoTokenizer
+
+# ============================================
+# AYARLAR
+# ============================================
+BASE_MODEL_NAME = "dbmdz/bert-base-turkish-cased"
+NUM_ASPECTS = 25
+NUM_CLASSES = 22
+MAX_LENGTH = 256
+
+# Aspect isimleri (model çıktısındaki index 0-24)
+ASPECT_NAMES = [
+    "temizlik", "konum", "oda_kalitesi", "uyku_yatak_kalitesi", "gurultu",
+    "personel", "fiyat_performans", "yemek_kalitesi", "yemek_cesitliligi", "havuz",
+    "spa_hamam", "plaj", "cocuk_dostu", "wifi", "banyo_tuvalet",
+    "klima_isitma", "resepsiyon", "otopark", "guvenlik", "manzara",
+    "oda_servisi", "fitness_spor", "mini_bar", "balkon_teras", "aktivite_zenginligi"
+]
+
+# ============================================
+# MODEL
+# ============================================
+class BertMultiHeadFocal(nn.Module):
+    """
+    BERTurk + 25 aspect kafası -> logits [batch, 25, 22]
+    fused=True: 25 ayrı nn.Linear yerine tek bir hidden -> 25*22 projeksiyon
+    (fused_heads) kullanılır. Eski checkpoint'ler fuse_head_weights() ile yüklenir.
+    config verilirse BERT hub'dan indirilmeden bu config'ten kurulur
+    (ağırlıklar checkpoint'ten yüklenecekse ön-eğitimli ağırlıklara gerek yok).
+    """
+    def __init__(self, base_model_name, num_aspects=25, num_classes=22, dropout=0.1, fused=False,
+                 config=None):
+        super().__init__()
+        if config is not None:
+            self.bert = AutoModel.from_config(config)
+        else:
+            self.bert = AutoModel.from_pretrained(base_model_name)
+        hidden = self.bert.config.hidden_size
+        self.num_aspects = num_aspects
+        self.num_classes = num_classes
+        self.fused = fused
+        self.dropout = nn.Dropout(dropout)
+        if fused:
+            self.fused_heads = nn.Linear(hidden, num_aspects * num_classes)
+        else:
+            self.heads = nn.ModuleList([
+                nn.Linear(hidden, num_classes) for _ in range(num_aspects)
+            ])
+
+    def forward(self, input_ids=None, attention_mask=None):
+        out = self.bert(input_ids=input_ids, attention_mask=attention_mask)
+        cls = out.last_hidden_state[:, 0, :]
+        cls = self.dropout(cls)
+        if self.fused:
+            logits = self.fused_heads(cls).view(-1, self.num_aspects, self.num_classes)
+        else:
+            logits = torch.stack([head(cls) for head in self.heads], dim=1)
+        return {"logits": logits}
+
+def fuse_head_weights(state_dict, num_aspects=NUM_ASPECTS):
+    """
+    Checkpoint'teki heads.{i}.weight [22, hidden] / heads.{i}.bias [22] girdilerini
+    tek bir fused_heads.weight [25*22, hidden] / fused_heads.bias [25*22] olarak birleştirir.
+    Satır sırası aspect-major olduğundan view(-1, 25, 22) orijinal stack ile aynıdır.
+    Zaten fused kaydedilmiş checkpoint'ler (örn. distill.py öğrencisi) aynen döner.
+    """
+    if "fused_heads.weight" in state_dict:
+        return state_dict
+    fused = {k: v for k, v in state_dict.items() if not k.startswith("heads.")}
+    fused["fused_heads.weight"] = torch.cat(
+        [state_dict[f"heads.{i}.weight"] for i in range(num_aspects)], dim=0)
+    fused["fused_heads.bias"] = torch.cat(
+        [state_dict[f"heads.{i}.bias"] for i in range(num_aspects)], dim=0)
+    return fused
+
+# ============================================
+# YÜKLEME
+# ============================================
+def load_base_config(checkpoint_dir):
+    """
+    BERT config'i checkpoint klasöründen okur. Yoksa bir kez hub'dan alıp
+    checkpoint_dir/config.json olarak kaydeder; sonraki açılışlar hub'a gitmez.
+    """
+    if os.path.exists(os.path.join(checkpoint_dir, "config.json")):
+        return AutoConfig.from_pretrained(checkpoint_dir)
+    config = AutoConfig.from_pretrained(BASE_MODEL_NAME)
+    config.save_pretrained(checkpoint_dir)
+    return config
+
+def load_tokenizer(checkpoint_dir=None):
+    """
+    checkpoint_dir verilirse tokenizer oradan okunur; yoksa bir kez hub'dan
+    alınıp oraya kaydedilir (config ile aynı mantık)
+    """
+    if checkpoint_dir is None:
+        return AutoTokenizer.from_pretrained(BASE_MODEL_NAME)
+    if os.path.exists(os.path.join(checkpoint_dir, "tokenizer_config.json")):
+        return AutoTokenizer.from_pretrained(checkpoint_dir)
+    tokenizer = AutoTokenizer.from_pretrained(BASE_MODEL_NAME)
+    tokenizer.save_pretrained(checkpoint_dir)
+    return tokenizer
+
+def _init_buffers(model):
+    """
+    torch.device("meta") altında kurulan modelde checkpoint'e yazılmayan
+    (persistent=False) buffer'lar meta kalır; BERT'te bunlar sadece
+    embeddings.position_ids (arange) ve embeddings.token_type_ids (sıfır).
+    Bunlar CPU'da yeniden oluşturulur; başka meta tensör kalırsa hata verilir.
+    """
+    for module_name, module in model.named_modules():
+        for name, buf in list(module.named_buffers(recurse=False)):
+            if not buf.is_meta:
+                continue
+            if name == "position_ids":
+                yeni = torch.arange(buf.shape[-1], dtype=buf.dtype).expand(buf.shape)
+            elif name == "token_type_ids":
+                yeni = torch.zeros(buf.shape, dtype=buf.dtype)
+            else:
+                raise RuntimeError(f"Checkpoint'te olmayan meta buffer: {module_name}.{name}")
+            module.register_buffer(name, yeni, persistent=False)
+    kalan = [n for n, t in model.state_dict(keep_vars=True).items() if t.is_meta]
+    if kalan:
+        raise RuntimeError(f"Checkpoint'ten yüklenmeyen ağırlıklar: {kalan[:5]}")
+
+_SAFETENSORS_DTYPES = {
+    "F64": torch.float64, "F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16,
+    "I64": torch.int64, "I32": torch.int32, "I16": torch.int16, "I8": torch.int8,
+    "U8": torch.uint8, "BOOL": torch.bool,
+}
+
+def load_safetensors_mmap(path):
+    """
+    safetensors dosyasını kopyalamadan, mmap üzerinden tensörlere açar.
+    Sayfalar işletim sisteminin page cache'inden okunur; aynı dosyayı açan tüm
+    worker süreçleri ağırlıkları fiziksel bellekte tek kopya olarak paylaşır.
+    ACCESS_COPY: yazılırsa sadece o sayfa sürece özel kopyalanır, dosya değişmez.
+    """
+    with open(path, "rb") as f:
+        header_len = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_len))
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    base = 8 + header_len
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        dtype = _SAFETENSORS_DTYPES[info["dtype"]]
+        start, end = info["data_offsets"]
+        count = (end - start) // torch.empty((), dtype=dtype).element_size()
+        if count == 0:
+            tensor = torch.empty(0, dtype=dtype)
+        else:
+            tensor = torch.frombuffer(buf, dtype=dtype, count=count, offset=base + start)
+        tensors[name] = tensor.reshape(info["shape"])
+    return tensors
+
+def load_model(checkpoint_dir, device="cpu", fused=True, mmap=True):
+    """
+    checkpoint_dir/model.safetensors -> eval modunda BertMultiHeadFocal
+    mmap=True: ağırlıklar dosyadan kopyalanmadan paylaşımlı sayfalar olarak bağlanır
+    (çoklu worker'da RSS artmaz, bkz. load_safetensors_mmap)
+    Model yerel config'ten boş ağırlıklarla kurulur; ağırlıklar sadece bir kez,
+    checkpoint'ten yüklenir (hub'dan indirme / çift init yok).
+    """
+    from safetensors.torch import load_file
+
+    config = load_base_config(checkpoint_dir)
+    # meta cihaz: parametreler bellek ayrılmadan, rastgele init çalışmadan kurulur
+    # (torch.device bağlamı thread'e özeldir, lifespan yükleyici thread'i güvenli)
+    with torch.device("meta"):
+        model = BertMultiHeadFocal(
+            base_model_name=BASE_MODEL_NAME,
+            num_aspects=NUM_ASPECTS,
+            num_classes=NUM_CLASSES,
+            dropout=0.1,
+            fused=fused,
+            config=config
+        )
+    path = os.path.join(checkpoint_dir, "model.safetensors")
+    state_dict = load_safetensors_mmap(path) if mmap else load_file(path)
+    if fused:
+        state_dict = fuse_head_weights(state_dict)
+    # assign=True: meta parametreler kopyalanmaz, yüklenen (mmap=True ise
+    # mmap'li) tensörlerin kendisi olur
+    model.load_state_dict(state_dict, assign=True)
+    _init_buffers(model)
+
+    model = model.to(device)
+    model.eval()
+    return model
+
+def checkpoint_tag(checkpoint_dir):
+    """
+    Checkpoint için kısa versiyon etiketi (önbellek anahtarlarında kullanılır).
+    Dosya boyutu + ilk 1 MB (safetensors başlığı ve ilk ağırlıklar) + son 1 MB
+    özetlenir; 440 MB'ın tamamını okumadan yeniden eğitilmiş ağırlıkları ayırt eder.
+    """
+    path = os.path.join(checkpoint_dir, "model.safetensors")
+    size = os.path.getsize(path)
+    h = hashlib.sha1(str(size).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(1 << 20))
+        f.seek(max(0, size - (1 << 20)))
+        h.update(f.read())
+    return h.hexdigest()[:12]
+
+def quantize_int8(model):
+    """
+    Encoder ve aspect kafalarındaki tüm nn.Linear katmanlarına dinamik int8
+    quantization uygular (sadece CPU). Ağırlıklar int8, aktivasyonlar fp32 kalır.
+    """
+    from torch.ao.quantization import quantize_dynamic
+
+    return quantize_dynamic(model.cpu(), {nn.Linear}, dtype=torch.qint8)
+
+def load_onnx_session(onnx_path, intra_threads=0, inter_threads=0, opt_level="all"):
+    """
+    ONNX Runtime oturumu (CPU)
+    intra_threads/inter_threads: 0 -> ORT varsayılanı
+    opt_level: "disable" | "basic" | "extended" | "all"
+    """
+    import onnxruntime as ort
+
+    levels = {
+        "disable": ort.GraphOptimizationLevel.ORT_DISABLE_ALL,
+        "basic": ort.GraphOptimizationLevel.ORT_ENABLE_BASIC,
+        "extended": ort.GraphOptimizationLevel.ORT_ENABLE_EXTENDED,
+        "all": ort.GraphOptimizationLevel.ORT_ENABLE_ALL,
+    }
+    opts = ort.SessionOptions()
+    opts.graph_optimization_level = levels[opt_level]
+    opts.intra_op_num_threads = intra_threads
+    opts.inter_op_num_threads = inter_threads
+    return ort.InferenceSession(onnx_path, sess_options=opts, providers=["CPUExecutionProvider"])
+
+# ============================================
+# TOKENIZE
+# ============================================
+def length_buckets(tokenizer, texts, bucket_size=16, max_length=MAX_LENGTH):
+    """
+    Metinleri padding'siz tokenize eder, uzunluğa göre sıralayıp kovalara böler.
+    Her kova sadece kendi en uzun metnine kadar doldurulur.
+
+    Yields: (orijinal indeksler, input_ids, attention_mask)
+    """
+    encoded = tokenizer(texts, max_length=max_length, truncation=True)["input_ids"]
+    order = sorted(range(len(texts)), key=lambda i: len(encoded[i]))
+
+    for start in range(0, len(order), bucket_size):
+        idx = order[start:start + bucket_size]
+        width = len(encoded[idx[-1]])
+        input_ids = torch.full((len(idx), width), tokenizer.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(idx), width), dtype=torch.long)
+        for row, i in enumerate(idx):
+            seq = encoded[i]
+            input_ids[row, :len(seq)] = torch.tensor(seq, dtype=torch.long)
+            attention_mask[row, :len(seq)] = 1
+        yield idx, input_ids, attention_mask
+
+# ============================================
+# METRİKLER
+# ============================================
+def presence_scores(preds, golds):
+    """
+    Aspect var/yok (label > 0) üzerinden micro precision / recall / F1
+    preds, golds: [[25 class id], ...]
+    """
+    tp = fp = fn = 0
+    for pred_row, gold_row in zip(preds, golds):
+        for p, g in zip(pred_row, gold_row):
+            if p > 0 and g > 0:
+                tp += 1
+            elif p > 0:
+                fp += 1
+            elif g > 0:
+                fn += 1
+
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return {"precision": precision, "recall": recall, "f1": f1}
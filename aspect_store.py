@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect Özet Deposu - Otel başına birikimli aspect sayımları (SQLite)
+Her otel için 25x22 class histogramı (aspect x duygu/neden) ve eşit sayılı
+nedenlerin sırası için ilk görülme tablosu saklanır. Yeni tahminler sadece
+yeni yorumlar kadar iş yapılarak eklenir; yorumlar metin özetine göre
+tekilleştirilir (aynı yorum tekrar kazındığında iki kez sayılmaz).
+aspect_summary her eklemede yeniden üretilip saklanır, okuma tek satırdır.
+
+Zaman boyutu (yorum tarihleri verilirse, yoksa ekleme anı):
+- Gün kovaları: otel x gün başına 25x22 histogram
+- Kayan pencere (son window_days gün): pencere toplamı saklanır; gün ilerledikçe
+  sadece pencereden çıkan günlerin kovaları çıkarılır, yeni yorumlar eklenir
+- Zamanla azalan (yarı ömür half_life_days): ağırlıklı toplam ve referans anı
+  saklanır; her eklemede toplam 2^(-geçen süre / yarı ömür) ile ölçeklenir
+Bu iki görünümde eşit sayılı nedenler neden koduna göre sıralanır. Pencere
+uzunluğu ya da yarı ömür değiştirilirse durum gün kovalarından yeniden kurulur
+(azalan toplamda gün ortası varsayımıyla). Zaman tabloları eklenmeden önce
+depoya girmiş yorumlar sadece tüm zamanlar özetinde yer alır.
+
+Depodaki özet, o otele eklenmiş tüm (tekil) yorumların eklenme sırasıyla
+aspect_aggregate.summarize'a verilmesiyle aynıdır. min_confidence ekleme
+anında uygulanır; eşik değişirse eski sayımlar eski eşikle kalır.
+
+Kullanım:
+    from aspect_store import AspectStore
+    store = AspectStore("aspect_store.db")
+    yeni = store.add(otel_adi, texts, labels, probs, min_confidence=0.3)
+    aspect_summary = store.summary(otel_adi)
+    son_30_gun = store.window_summary(otel_adi)
+    agirlikli = store.decayed_summary(otel_adi)
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from aspect_aggregate import aspect_counts, summary_from_counts, NUM_ASPECTS, MAX_CLASS_ID, GUN
+
+COUNTS_SHAPE = (NUM_ASPECTS, MAX_CLASS_ID + 1)
+_YOK = np.iinfo(np.int64).max   # hiç görülmemiş class için ilk görülme değeri
+_SQL_CHUNK = 500                # IN (...) sorgusu başına özet sayısı
+
+
+def review_hash(text):
+    """Boşluk farkları aynı yorum sayılır; 16 baytlık SHA1 öneki"""
+    return hashlib.sha1(" ".join(text.split()).encode("utf-8")).digest()[:16]
+
+
+def otel_key(otel_adi):
+    return " ".join(otel_adi.split())
+
+
+class AspectStore:
+    def __init__(self, db_path="aspect_store.db", window_days=30, half_life_days=30):
+        self.window_days = window_days
+        self.half_life = half_life_days * GUN
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: çökme durumunda veritabanı bozulmaz, en fazla son eklemeler kaybolur
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS otel (
+            otel TEXT PRIMARY KEY, yorum_sayisi INTEGER, counts BLOB, first BLOB,
+            summary TEXT, updated REAL)""")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS yorum (
+            otel TEXT, hash BLOB, PRIMARY KEY (otel, hash)) WITHOUT ROWID""")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS gun (
+            otel TEXT, gun INTEGER, counts BLOB, PRIMARY KEY (otel, gun)) WITHOUT ROWID""")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS zaman (
+            otel TEXT PRIMARY KEY, pencere_gun INTEGER, pencere_son INTEGER, pencere BLOB,
+            yari_omur REAL, azalan_zaman REAL, azalan BLOB)""")
+        self.db.commit()
+
+    def _load(self, otel):
+        row = self.db.execute(
+            "SELECT yorum_sayisi, counts, first FROM otel WHERE otel = ?", (otel,)).fetchone()
+        if row is None:
+            return 0, np.zeros(COUNTS_SHAPE, dtype=np.int64), np.full(COUNTS_SHAPE, _YOK, dtype=np.int64)
+        n, counts, first = row
+        return (n, np.frombuffer(counts, dtype=np.int64).reshape(COUNTS_SHAPE).copy(),
+                np.frombuffer(first, dtype=np.int64).reshape(COUNTS_SHAPE).copy())
+
+    def _existing(self, otel, hashes):
+        found = set()
+        for start in range(0, len(hashes), _SQL_CHUNK):
+            chunk = hashes[start:start + _SQL_CHUNK]
+            found.update(h for (h,) in self.db.execute(
+                f"SELECT hash FROM yorum WHERE otel = ? AND hash IN ({','.join('?' * len(chunk))})",
+                (otel, *chunk)))
+        return found
+
+    def _bucket_sum(self, otel, after, until):
+        """after < gün <= until aralığındaki gün kovalarının toplamı"""
+        total = np.zeros(COUNTS_SHAPE, dtype=np.int64)
+        for (blob,) in self.db.execute(
+                "SELECT counts FROM gun WHERE otel = ? AND gun > ? AND gun <= ?", (otel, after, until)):
+            total += np.frombuffer(blob, dtype=np.int64).reshape(COUNTS_SHAPE)
+        return total
+
+    def _decay_from_buckets(self, otel, now):
+        """Yarı ömür değişince: azalan toplam gün kovalarından (gün ortası) yeniden kurulur"""
+        total = np.zeros(COUNTS_SHAPE, dtype=np.float64)
+        for day, blob in self.db.execute("SELECT gun, counts FROM gun WHERE otel = ?", (otel,)):
+            weight = 2.0 ** (-max(0.0, now - (day + 0.5) * GUN) / self.half_life)
+            total += weight * np.frombuffer(blob, dtype=np.int64).reshape(COUNTS_SHAPE)
+        return total
+
+    def _load_time(self, otel, now):
+        """-> (pencere, pencere_son, azalan, azalan_zaman); eksik/ayarı farklı durumlar kurulur"""
+        row = self.db.execute(
+            "SELECT pencere_gun, pencere_son, pencere, yari_omur, azalan_zaman, azalan "
+            "FROM zaman WHERE otel = ?", (otel,)).fetchone()
+        today = int(now // GUN)
+        if row is None:
+            return (np.zeros(COUNTS_SHAPE, dtype=np.int64), today,
+                    np.zeros(COUNTS_SHAPE, dtype=np.float64), now)
+        window_days, end, window, half_life, t_ref, decayed = row
+        if window_days == self.window_days:
+            window = np.frombuffer(window, dtype=np.int64).reshape(COUNTS_SHAPE).copy()
+        else:
+            window = self._bucket_sum(otel, end - self.window_days, end)
+        if half_life == self.half_life:
+            decayed = np.frombuffer(decayed, dtype=np.float64).reshape(COUNTS_SHAPE).copy()
+        else:
+            decayed = self._decay_from_buckets(otel, t_ref)
+        return window, end, decayed, t_ref
+
+    def _advance_window(self, otel, window, end, today):
+        """Pencere sonunu bugüne kaydırır: sadece pencereden çıkan günler çıkarılır"""
+        if today > end:
+            window = window - self._bucket_sum(
+                otel, end - self.window_days, min(today, end + self.window_days) - self.window_days)
+            end = today
+        return window, end
+
+    def _add_time(self, otel, labels, confidences, min_confidence, stamps, now):
+        """Yeni yorumları gün kovalarına, kayan pencereye ve azalan toplama ekler"""
+        window, end, decayed, t_ref = self._load_time(otel, now)
+        # Önce pencere kaydırılır (çıkan kovalar yeni yorumlar eklenmeden önceki halleriyle)
+        window, end = self._advance_window(otel, window, end, int(now // GUN))
+
+        days = (stamps // GUN).astype(np.int64)
+        for day in np.unique(days).tolist():
+            mask = days == day
+            new_counts, _ = aspect_counts(labels[mask],
+                                          confidences[mask] if confidences is not None else None,
+                                          min_confidence)
+            stored = new_counts
+            row = self.db.execute("SELECT counts FROM gun WHERE otel = ? AND gun = ?",
+                                  (otel, day)).fetchone()
+            if row is not None:
+                stored = stored + np.frombuffer(row[0], dtype=np.int64).reshape(COUNTS_SHAPE)
+            self.db.execute("INSERT OR REPLACE INTO gun (otel, gun, counts) VALUES (?, ?, ?)",
+                            (otel, day, stored.astype(np.int64).tobytes()))
+            if end - self.window_days < day <= end:
+                window += new_counts
+
+        t_new = max(t_ref, now)
+        weights = 2.0 ** (-(t_new - stamps) / self.half_life)
+        decayed = decayed * 2.0 ** (-(t_new - t_ref) / self.half_life)
+        decayed += aspect_counts(labels, confidences, min_confidence, weights)[0]
+
+        self.db.execute(
+            "INSERT OR REPLACE INTO zaman (otel, pencere_gun, pencere_son, pencere, yari_omur, "
+            "azalan_zaman, azalan) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (otel, self.window_days, end, window.tobytes(), self.half_life, t_new, decayed.tobytes()))
+
+    def add(self, otel_adi, texts, labels, confidences=None, min_confidence=0.0,
+            timestamps=None, now=None):
+        """
+        Yeni yorumların tahminlerini otelin sayımlarına ekler -> eklenen (yeni) yorum sayısı
+        labels: [N, 25] class id, confidences: aynı şekil (opsiyonel)
+        timestamps: [N] yorum tarihleri (unix sn, None -> ekleme anı); gelecek tarihler now'a çekilir
+        """
+        otel = otel_key(otel_adi)
+        now = time.time() if now is None else now
+        hashes = [review_hash(t) for t in texts]
+        with self.lock:
+            existing = self._existing(otel, hashes)
+            keep = []
+            for i, h in enumerate(hashes):
+                if h not in existing:
+                    existing.add(h)  # aynı partide tekrar edenler de bir kez sayılır
+                    keep.append(i)
+            if not keep:
+                return 0
+
+            labels = np.asarray(labels, dtype=np.uint8).reshape(-1, NUM_ASPECTS)[keep]
+            if confidences is not None:
+                confidences = np.asarray(confidences).reshape(-1, NUM_ASPECTS)[keep]
+            if timestamps is None:
+                stamps = np.full(len(keep), now, dtype=np.float64)
+            else:
+                stamps = np.array([now if timestamps[i] is None else min(timestamps[i], now)
+                                   for i in keep], dtype=np.float64)
+            new_counts, new_first = aspect_counts(labels, confidences, min_confidence)
+
+            n, counts, first = self._load(otel)
+            counts += new_counts
+            # Yeni partinin satırları mevcut yorumların arkasına eklenmiş sayılır
+            first = np.where(new_counts > 0, np.minimum(first, new_first + n), first)
+            n += len(keep)
+
+            with self.db:
+                self.db.executemany("INSERT INTO yorum (otel, hash) VALUES (?, ?)",
+                                    [(otel, hashes[i]) for i in keep])
+                self.db.execute(
+                    "INSERT OR REPLACE INTO otel (otel, yorum_sayisi, counts, first, summary, updated) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (otel, n, counts.tobytes(), first.tobytes(),
+                     json.dumps(summary_from_counts(counts, first), ensure_ascii=False), now))
+                self._add_time(otel, labels, confidences, min_confidence, stamps, now)
+        return len(keep)
+
+    def window_counts(self, otel_adi, now=None):
+        """Son window_days gündeki yorumların [25, 22] sayımı (now'a kadar kaydırılmış)"""
+        otel = otel_key(otel_adi)
+        now = time.time() if now is None else now
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM zaman WHERE otel = ?", (otel,)).fetchone() is None:
+                return np.zeros(COUNTS_SHAPE, dtype=np.int64)
+            window, end, _, _ = self._load_time(otel, now)
+            return self._advance_window(otel, window, end, int(now // GUN))[0]
+
+    def decayed_counts(self, otel_adi, now=None):
+        """Yarı ömürle ağırlıklı [25, 22] sayım (now anına göre)"""
+        otel = otel_key(otel_adi)
+        now = time.time() if now is None else now
+        with self.lock:
+            if self.db.execute("SELECT 1 FROM zaman WHERE otel = ?", (otel,)).fetchone() is None:
+                return np.zeros(COUNTS_SHAPE, dtype=np.float64)
+            _, _, decayed, t_ref = self._load_time(otel, now)
+        return decayed * 2.0 ** (-max(0.0, now - t_ref) / self.half_life)
+
+    def window_summary(self, otel_adi, now=None):
+        """Son window_days günün aspect_summary'si"""
+        return summary_from_counts(self.window_counts(otel_adi, now))
+
+    def decayed_summary(self, otel_adi, now=None):
+        """Zamanla azalan ağırlıklı aspect_summary (sayılar float, aynı anahtarlar)"""
+        return summary_from_counts(self.decayed_counts(otel_adi, now))
+
+    def summary(self, otel_adi):
+        """Otelin güncel aspect_summary'si (otel yoksa boş dict)"""
+        with self.lock:
+            row = self.db.execute(
+                "SELECT summary FROM otel WHERE otel = ?", (otel_key(otel_adi),)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def review_count(self, otel_adi):
+        with self.lock:
+            row = self.db.execute(
+                "SELECT yorum_sayisi FROM otel WHERE otel = ?", (otel_key(otel_adi),)).fetchone()
+        return row[0] if row else 0
+
+    def counts(self, otel_adi):
+        """(yorum sayısı, sayım [25, 22], ilk görülme [25, 22])"""
+        with self.lock:
+            return self._load(otel_key(otel_adi))
+
+    def hotels(self):
+        with self.lock:
+            return [r[0] for r in self.db.execute("SELECT otel FROM otel ORDER BY otel")]
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect Özet Benchmark - build_aspect_summary (saf Python) vs aspect_aggregate.summarize
+N = 50, 5k, 500k yorum için süre; NumPy tarafı hem hazır uint8 matris hem de
+liste girdiyle (dönüşüm dahil) ölçülür. Eşdeğerlik testi: tests/test_aggregate.py
+
+Çalıştırma: python bench_aggregate.py
+"""
+
+import time
+
+import numpy as np
+
+from aspect_aggregate import build_aspect_summary, summarize
+
+# ============================================
+# AYARLAR
+# ============================================
+SEED = 42
+BOYUTLAR = [50, 5_000, 500_000]
+SURE_HEDEF = 1.0                 # her ölçüm için en az bu kadar sn tekrar edilir
+MENTION_ORANI = 0.12             # benchmark verisinde sıfır olmayan aspect oranı
+
+# ============================================
+# HIZ
+# ============================================
+def timed(fn):
+    """SURE_HEDEF doluncaya kadar tekrar -> ortalama sn"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= SURE_HEDEF:
+            return elapsed / count
+
+def main():
+    rng = np.random.default_rng(SEED)
+    print(f"\n{'N':>8} | {'python':>10} | {'numpy':>10} | {'numpy+liste':>11} | {'hızlanma':>9}")
+    print("-" * 60)
+    for n in BOYUTLAR:
+        labels = np.where(rng.random((n, 25)) < MENTION_ORANI,
+                          rng.integers(1, 22, size=(n, 25)), 0).astype(np.uint8)
+        probs = rng.random((n, 25)).astype(np.float16)
+        labels_list = labels.tolist()
+        probs_list = probs.astype(np.float32).tolist()
+
+        ref_s = timed(lambda: build_aspect_summary(labels_list, probs_list, 0.3))
+        np_s = timed(lambda: summarize(labels, probs, 0.3))
+        list_s = timed(lambda: summarize(labels_list, probs_list, 0.3))
+        assert summarize(labels, probs, 0.3) == build_aspect_summary(labels_list, probs_list, 0.3)
+        print(f"{n:>8} | {ref_s * 1000:8.2f}ms | {np_s * 1000:8.2f}ms | {list_s * 1000:9.2f}ms | "
+              f"{ref_s / np_s:8.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Backend Karşılaştırma - PyTorch (eager fp32) vs ONNX Runtime
+- Doğrulama: val fold'larındaki tüm yorumlarda argmax çıktıları birebir aynı mı?
+- Gecikme: tek yorumluk istek (batch=1) p50/p95
+- Throughput: uzunluk kovalı batch'lerle yorum/sn
+
+Çalıştırma: python onnx_export.py && python bench_backend.py
+"""
+
+import glob
+import json
+import os
+import statistics
+import time
+
+import torch
+
+from aspect_model import load_model, load_tokenizer, load_onnx_session, length_buckets
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+ONNX_PATH = os.path.join(CHECKPOINT_DIR, "model.onnx")
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+LIMIT = None            # None -> tüm fold'lar; hızlı deneme için örn. 2000
+BUCKET_SIZE = 16
+LATENCY_ORNEK = 200     # batch=1 gecikme ölçümü için yorum sayısı
+ORT_INTRA_THREADS = 0
+ORT_INTER_THREADS = 0
+ORT_OPT_LEVEL = "all"
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                texts.append(json.loads(line)["yorum"])
+    return texts[:LIMIT] if LIMIT else texts
+
+def torch_runner(model):
+    def run(input_ids, attention_mask):
+        with torch.no_grad():
+            logits = model(input_ids, attention_mask)["logits"]
+        return logits.argmax(-1).tolist()
+    return run
+
+def onnx_runner(session):
+    def run(input_ids, attention_mask):
+        logits = session.run(["logits"], {
+            "input_ids": input_ids.numpy(),
+            "attention_mask": attention_mask.numpy()
+        })[0]
+        return logits.argmax(-1).tolist()
+    return run
+
+def throughput(run, tokenizer, texts):
+    preds = [None] * len(texts)
+    start = time.perf_counter()
+    for idx, input_ids, attention_mask in length_buckets(tokenizer, texts, BUCKET_SIZE):
+        for i, pred in zip(idx, run(input_ids, attention_mask)):
+            preds[i] = pred
+    elapsed = time.perf_counter() - start
+    return preds, len(texts) / elapsed
+
+def latency(run, tokenizer, texts):
+    times = []
+    for text in texts:
+        inputs = tokenizer(text, return_tensors="pt", truncation=True, max_length=256)
+        start = time.perf_counter()
+        run(inputs["input_ids"], inputs["attention_mask"])
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95) - 1]
+
+def main():
+    if not os.path.exists(ONNX_PATH):
+        print(f"❌ {ONNX_PATH} bulunamadı! Önce: python onnx_export.py")
+        return
+
+    texts = load_texts()
+    print(f"📊 {len(texts)} yorum | torch threads: {torch.get_num_threads()}\n")
+
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    runners = {
+        "torch": torch_runner(load_model(CHECKPOINT_DIR)),
+        "onnx": onnx_runner(load_onnx_session(ONNX_PATH, ORT_INTRA_THREADS, ORT_INTER_THREADS, ORT_OPT_LEVEL)),
+    }
+
+    preds = {}
+    for name, run in runners.items():
+        run(*next(length_buckets(tokenizer, texts[:4], 4))[1:])  # ısınma
+        p50, p95 = latency(run, tokenizer, texts[:LATENCY_ORNEK])
+        preds[name], rate = throughput(run, tokenizer, texts)
+        print(f"  {name:<6} batch=1 p50: {p50:7.2f} ms | p95: {p95:7.2f} ms | "
+              f"bucket throughput: {rate:7.1f} yorum/sn")
+
+    farkli = sum(a != b for a, b in zip(preds["torch"], preds["onnx"]))
+    print()
+    if farkli == 0:
+        print(f"✅ Argmax çıktıları {len(texts)} yorumun hepsinde aynı!")
+    else:
+        print(f"❌ {farkli}/{len(texts)} yorumda argmax farklı!")
+
+if __name__ == "__main__":
+    main()
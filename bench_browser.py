@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+"""
+Kazıyıcı Benchmark - otel başına duvar saati süresi (yerel fixture site)
+Google yerine maps_fixture.py kullanılır (ağ, kota ve sayfa değişikliklerinden
+bağımsız, aynı seçiciler, çerez onayı dahil). Üç düzen karşılaştırılır:
+- tek:     her otel için ChromeDriverManager().install() + yeni Chrome/profil +
+           Maps ana sayfası + çerez onayı + kazıma + quit, sabit sleep'ler
+- havuz:   BrowserPool bir kez açılıp ısıtılır, sabit sleep'ler
+- bekleme: havuz + koşullu bekleme (scrape_wait.py)
+"Sabit sleep" düzeni SCRAPE_SABIT_BEKLEME ile eski bekleme sürelerini
+uygular. Her düzende çekilen yorumlar karşılaştırılır (aynı olmalı). Havuzda
+çerez onayının kalıcı olduğu da böylece doğrulanır: sıfırlama çerezi silseydi
+fixture onay sayfası döner ve yorum çekilemezdi.
+pipeline kazıyıcısında ayrıca yorum okuma yolları karşılaştırılır: eleman
+başına WebDriver çağrısı (collect_reviews_reference) vs tek execute_script
+(collect_reviews); aynı sayfada metin ve tarihler aynı, puanlar fixture ile
+aynı olmalı.
+
+Çalıştırma: python bench_browser.py [--oteller 5] [--max-yorum 30] [--kaziyici vericekme]
+"""
+
+import argparse
+import time
+
+import browser_pool
+import maps_fixture
+import otel_pipeline as op
+import scrape_wait
+from browser_pool import BrowserPool
+
+# ============================================
+# AYARLAR
+# ============================================
+OTEL_LISTESI = "otellistesi.txt"
+OTEL_SAYISI = 5
+MAX_YORUM = 30
+
+def load_hotels(n):
+    with open(OTEL_LISTESI, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()][:n]
+
+# ============================================
+# KAZIYICILAR
+# ============================================
+def pipeline_scraper(maps_url):
+    op.MAPS_URL = maps_url
+    def scrape(otel, max_yorum, pool):
+        return [y["yorum"] for y in op.scrape_reviews(otel, max_yorum, pool=pool)]
+    return scrape, op.warmup_maps, ()
+
+def vericekme_scraper(maps_url):
+    from vericekme import otelvericekme as ov
+    ov.MAPS_URL = maps_url
+    def scrape(otel, max_yorum, pool):
+        df = ov.google_maps_yorum_cek_otomatik(otel, max_yorum, pool=pool)
+        return list(df["yorum"]) if len(df) else []
+    return scrape, ov._maps_isit, ov._chrome_args
+
+# ============================================
+# DÜZENLER
+# ============================================
+def run_fresh(scraper, hotels, max_yorum):
+    """Havuz öncesi: her otel için sıfırdan tarayıcı"""
+    scrape, warmup, extra = scraper
+    sonuc, sureler = {}, []
+    for otel in hotels:
+        t0 = time.perf_counter()
+        browser_pool._driver_path = None          # eski akış: her otelde install()
+        with BrowserPool(1, max_uses=1, warmup=warmup, extra_args=extra) as pool:
+            sonuc[otel] = scrape(otel, max_yorum, pool)
+        sureler.append(time.perf_counter() - t0)
+    return sonuc, sureler, 0.0
+
+def run_pool(scraper, hotels, max_yorum, origin):
+    """Havuz: bir kez açılır (süre ayrı raporlanır), her otel sıcak oturum alır"""
+    scrape, warmup, extra = scraper
+    t0 = time.perf_counter()
+    pool = BrowserPool(1, warmup=warmup, extra_args=extra, reset_origins=[origin]).start()
+    baslatma = time.perf_counter() - t0
+    sonuc, sureler = {}, []
+    for otel in hotels:
+        t0 = time.perf_counter()
+        sonuc[otel] = scrape(otel, max_yorum, pool)
+        sureler.append(time.perf_counter() - t0)
+    pool.close()
+    return sonuc, sureler, baslatma
+
+def run_extraction(hotels, max_yorum, origin):
+    """Sayfa yüklendikten sonra okuma süresi: tek JS çağrısı vs eleman başına çağrılar"""
+    sureler = {"js": [], "eleman": []}
+    ok = True
+    with BrowserPool(1, warmup=op.warmup_maps, reset_origins=[origin]).start() as pool:
+        for otel in hotels:
+            with pool.session() as driver:
+                acik = op._open_reviews(driver, otel, {})
+                if not acik:
+                    ok = False
+                    continue
+                scroll_div, secici = acik
+                op._load_reviews(driver, scroll_div, secici, max_yorum, {})
+                # JS önce: "Daha fazla"ları o açar, eleman yolu aynı açılmış sayfayı okur
+                t0 = time.perf_counter()
+                js = op.collect_reviews(driver, scroll_div, secici, max_yorum)
+                t1 = time.perf_counter()
+                ref = op.collect_reviews_reference(driver, secici, max_yorum)
+                t2 = time.perf_counter()
+            sureler["js"].append(t1 - t0)
+            sureler["eleman"].append(t2 - t1)
+            ok &= [(y["yorum"], y["tarih"]) for y in js] == [(y["yorum"], y["tarih"]) for y in ref]
+            puanlar = [y["puan"] for y in js]
+            beklenen = [y["puan"] for y in maps_fixture.reviews_for(otel)[:len(js)]]
+            ok &= puanlar == beklenen
+    return sureler, ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Kazıyıcı benchmark (yerel fixture)")
+    parser.add_argument("--oteller", type=int, default=OTEL_SAYISI)
+    parser.add_argument("--max-yorum", type=int, default=MAX_YORUM)
+    parser.add_argument("--kaziyici", choices=["pipeline", "vericekme"], default="pipeline")
+    args = parser.parse_args()
+
+    server, maps_url = maps_fixture.start()
+    origin = maps_url.rsplit("/maps", 1)[0]
+    scraper = (pipeline_scraper if args.kaziyici == "pipeline" else vericekme_scraper)(maps_url)
+    hotels = load_hotels(args.oteller)
+    print(f"🗺️  Fixture: {maps_url} | {args.kaziyici} | {len(hotels)} otel, max {args.max_yorum} yorum")
+
+    duzenler = {}
+    try:
+        scrape_wait.SABIT_BEKLEME = True
+        duzenler["tek"] = run_fresh(scraper, hotels, args.max_yorum)
+        duzenler["havuz"] = run_pool(scraper, hotels, args.max_yorum, origin)
+        scrape_wait.SABIT_BEKLEME = False
+        scrape_wait.stats.clear()
+        duzenler["bekleme"] = run_pool(scraper, hotels, args.max_yorum, origin)
+        adim_raporu = scrape_wait.report()
+        cikarim = run_extraction(hotels, args.max_yorum, origin) if args.kaziyici == "pipeline" else None
+    finally:
+        server.shutdown()
+
+    print(f"\n{'otel':<36} | {'tek':>7} | {'havuz':>7} | {'bekleme':>7} | {'yorum':>5} | eşit")
+    print("-" * 82)
+    ok = True
+    for i, otel in enumerate(hotels):
+        sonuclar = [d[0][otel] for d in duzenler.values()]
+        esit = all(s == sonuclar[0] for s in sonuclar)
+        beklenen = [y["yorum"] for y in maps_fixture.reviews_for(otel)[:args.max_yorum]]
+        ok &= esit and bool(sonuclar[-1])
+        sureler = " | ".join(f"{d[1][i]:6.2f}s" for d in duzenler.values())
+        print(f"{otel[:36]:<36} | {sureler} | {len(sonuclar[-1]):>5} | {'✅' if esit else '❌'}"
+              f"{'' if sonuclar[-1] == beklenen else ' (fixture ile farklı)'}")
+
+    n = len(hotels)
+    print("\n📊 Ortalama otel süresi:")
+    for ad, (_, sureler, baslatma) in duzenler.items():
+        ek = f" (+ bir kerelik havuz açılışı {baslatma:.2f}s)" if baslatma else ""
+        print(f"   {ad:<8} {sum(sureler) / n:6.2f}s{ek}")
+    print("\n⏱️  Koşullu bekleme, adım başına:")
+    for adim, r in adim_raporu.items():
+        print(f"   {adim:<14} n={r['n']:<4} ort {r['ort_sn']:.3f}s  zaman aşımı {r['zaman_asimi']}")
+    if cikarim:
+        sureler, esit = cikarim
+        k = max(len(sureler["js"]), 1)
+        js, el = sum(sureler["js"]) / k, sum(sureler["eleman"]) / k
+        print(f"\n📊 Yorum okuma (otel başına): eleman başına {el * 1000:.0f} ms, tek JS {js * 1000:.0f} ms "
+              f"({el / max(js, 1e-9):.1f}x) | {'✅ aynı kayıtlar, puanlar doğru' if esit else '❌ fark var'}")
+        ok &= esit
+    print("✅ Tüm düzenlerde çekilen yorumlar aynı" if ok else "❌ Düzenler arasında fark / boş sonuç var")
+
+if __name__ == "__main__":
+    main()
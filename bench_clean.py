@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Temizleme Benchmark - clean_text_reference (sıralı regex zinciri) vs text_clean.clean_text
+aspectveri/val_fold*.jsonl yorumları ve kirletilmiş halleri (emoji, html, url,
+email, telefon, tekrar eden harf/noktalama, Unicode boşluklar rastgele eklenir)
+üzerinde yorum/sn; clean_texts ile süreç sayısına göre.
+Eşdeğerlik testi: tests/test_clean_text.py
+
+Çalıştırma: python bench_clean.py
+"""
+
+import glob
+import json
+import os
+import random
+import time
+
+from text_clean import clean_text, clean_text_reference, clean_texts
+
+# ============================================
+# AYARLAR
+# ============================================
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+SEED = 42
+SURECLER = [1, 2, 4]
+TEKRAR = 3                     # hız ölçümlerinde en iyi tekrar alınır
+
+GURULTU = [
+    "😀", "😂😂😂", "🇹🇷", "✂", "Ⓜ", "⭐⭐⭐⭐⭐", "👍🏻", "<b>", "</p>", "<br/>", "<a href='x'>",
+    "https://maps.google.com/x?y=1", "www.otel.com", "HTTP://A.B", "info@otel.com",
+    "+90 555 123 45 67", "0212-555-44-33", "5551234567", "çoooook", "güzeeeel",
+    "!!!", "???", "...", ",,", "!?!?", "&", "%50", "#otel", "’", "“", "…", "\u00a0", "\t", "\n",
+    "\u3000", "İ", "I", "\u0307",
+]
+
+# ============================================
+# VERİ
+# ============================================
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, encoding="utf-8") as f:
+            texts.extend(json.loads(line)["yorum"] for line in f if line.strip())
+    return texts
+
+def dirty(texts, rng):
+    """Her yoruma 1-4 gürültü parçası rastgele konumlara eklenir"""
+    out = []
+    for t in texts:
+        for _ in range(rng.randint(1, 4)):
+            i = rng.randint(0, len(t))
+            t = t[:i] + rng.choice([" ", ""]) + rng.choice(GURULTU) + rng.choice([" ", ""]) + t[i:]
+        out.append(t)
+    return out
+
+# ============================================
+# HIZ
+# ============================================
+def timed(fn):
+    best = float("inf")
+    for _ in range(TEKRAR):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    rng = random.Random(SEED)
+    temiz = load_texts()
+    if not temiz:
+        print(f"❌ {FOLD_PATTERN} bulunamadı!")
+        return
+    kirli = dirty(temiz, rng)
+
+    print(f"\n{'korpus':>8} | {'referans':>12} | {'hızlı':>12} | {'hızlanma':>8}")
+    print("-" * 50)
+    for name, texts in (("temiz", temiz), ("kirli", kirli)):
+        ref_s = timed(lambda: [clean_text_reference(t) for t in texts])
+        fast_s = timed(lambda: [clean_text(t) for t in texts])
+        print(f"{name:>8} | {len(texts) / ref_s:8.0f}/sn | {len(texts) / fast_s:8.0f}/sn | "
+              f"{ref_s / fast_s:7.1f}x")
+
+    # Süreç havuzu: başlatma maliyeti dahil, daha büyük korpusta
+    buyuk = kirli * 4
+    print(f"\n📊 clean_texts ({len(buyuk)} kirli yorum, {os.cpu_count()} CPU)")
+    for workers in SURECLER:
+        s = timed(lambda: clean_texts(buyuk, workers=workers))
+        print(f"   {workers} süreç: {len(buyuk) / s:8.0f} yorum/sn")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Kazıma Modu Benchmark - otel başına aktarılan bayt ve süre (yerel fixture site)
+otel_pipeline.scrape_reviews modları maps_fixture.py üzerinde karşılaştırılır:
+- dom:   tam sayfa (harita karoları, avatarlar, font), yorumlar DOM'dan
+- hafif: görsel/font/medya CDP Network.setBlockedURLs ile engellenir, yorumlar DOM'dan
+- ag:    hafif + yorumlar sayfanın yüklediği RPC yanıtlarından (listugcposts)
+- oynatma: ag modunda kaydedilen RPC yanıtları (AG_KAYIT_DIR) fixture'a
+  KAYIT_DIR olarak verilip tekrar çekilir; kayıt/oynatma zinciri doğrulanır
+Bayt ve istek sayıları Chrome performans logundan (Network.loadingFinished
+encodedDataLength) okunur; bu yüzden tüm modlarda havuz perf_log ile açılır.
+Her modda çekilen kayıtlar (id, metin, tarih, puan) fixture ile aynı olmalı.
+Fixture'daki görsel boyutları (KARO_BAYT, AVATAR_BAYT, FONT_BAYT) temsilidir:
+gerçek Maps'teki tasarruf farklıdır, oran değil yöntem doğrulanır.
+
+Çalıştırma: python bench_fetch.py [--oteller 5] [--max-yorum 30]
+"""
+
+import argparse
+import tempfile
+import time
+
+import maps_fixture
+import otel_pipeline as op
+from browser_pool import BrowserPool
+
+# ============================================
+# AYARLAR
+# ============================================
+OTEL_LISTESI = "otellistesi.txt"
+OTEL_SAYISI = 5
+MAX_YORUM = 30
+MODLAR = ["dom", "hafif", "ag", "oynatma"]
+
+def load_hotels(n):
+    with open(OTEL_LISTESI, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()][:n]
+
+def run_mode(mod, hotels, max_yorum, origin):
+    """-> ({otel: kayıtlar}, [sn], [bayt], [istek], [engellenen])"""
+    pool = BrowserPool(1, warmup=op.warmup_maps, reset_origins=[origin],
+                       block_urls=op.ENGELLENEN_KAYNAKLAR if mod != "dom" else (), perf_log=True).start()
+    sonuc, sureler, bayt, istek, engellenen = {}, [], [], [], []
+    try:
+        for otel in hotels:
+            onceki = op.ag_istatistik.copy()
+            t0 = time.perf_counter()
+            sonuc[otel] = op.scrape_reviews(otel, max_yorum, pool=pool, mod="ag" if mod == "oynatma" else mod)
+            sureler.append(time.perf_counter() - t0)
+            fark = op.ag_istatistik - onceki
+            bayt.append(fark["bayt"])
+            istek.append(fark["istek"])
+            engellenen.append(fark["engellenen"])
+    finally:
+        pool.close()
+    return sonuc, sureler, bayt, istek, engellenen
+
+def _kayitlar(ys):
+    return [(y["id"], y["yorum"], y["tarih"], y["puan"]) for y in ys]
+
+def main():
+    parser = argparse.ArgumentParser(description="Kazıma modu benchmark (yerel fixture)")
+    parser.add_argument("--oteller", type=int, default=OTEL_SAYISI)
+    parser.add_argument("--max-yorum", type=int, default=MAX_YORUM)
+    args = parser.parse_args()
+
+    server, maps_url = maps_fixture.start()
+    origin = maps_url.rsplit("/maps", 1)[0]
+    op.MAPS_URL = maps_url
+    hotels = load_hotels(args.oteller)
+    kayit_dir = tempfile.mkdtemp(prefix="maps_kayit_")
+    print(f"🗺️  Fixture: {maps_url} | {len(hotels)} otel, max {args.max_yorum} yorum")
+
+    modlar = {}
+    try:
+        for mod in MODLAR:
+            # ag: yanıtlar kaydedilir; oynatma: fixture "yeni" sıralı parçaları bu kayıtlardan verir
+            op.AG_KAYIT_DIR = kayit_dir if mod == "ag" else None
+            maps_fixture.KAYIT_DIR = kayit_dir if mod == "oynatma" else None
+            modlar[mod] = run_mode(mod, hotels, args.max_yorum, origin)
+    finally:
+        op.AG_KAYIT_DIR = maps_fixture.KAYIT_DIR = None
+        server.shutdown()
+
+    print(f"\n{'otel':<30} | " + " | ".join(f"{m:>16}" for m in modlar) + " | eşit")
+    print("-" * (36 + 19 * len(modlar)))
+    ok = True
+    for i, otel in enumerate(hotels):
+        beklenen = _kayitlar(maps_fixture.reviews_for(otel)[:args.max_yorum])
+        esit = all(_kayitlar(m[0][otel]) == beklenen for m in modlar.values())
+        ok &= esit
+        hucre = " | ".join(f"{m[1][i]:5.2f}s {m[2][i] / 1e3:7.0f}KB" for m in modlar.values())
+        print(f"{otel[:30]:<30} | {hucre} | {'✅' if esit else '❌'}")
+
+    n = max(len(hotels), 1)
+    taban_sn, taban_bayt = sum(modlar["dom"][1]) / n, sum(modlar["dom"][2]) / n
+    print("\n📊 Otel başına ortalama:")
+    for mod, (_, sureler, bayt, istek, engellenen) in modlar.items():
+        sn, b = sum(sureler) / n, sum(bayt) / n
+        print(f"   {mod:<8} {sn:6.2f}s  {b / 1e6:6.2f} MB  {sum(istek) / n:5.0f} istek  "
+              f"{sum(engellenen) / n:5.0f} engellenen  "
+              f"(dom'a göre: süre x{taban_sn / max(sn, 1e-9):.2f}, bayt x{taban_bayt / max(b, 1):.1f})")
+    print(f"\n💾 Kayıtlı RPC yanıtları: {kayit_dir}  (python maps_fixture.py --kayit {kayit_dir})")
+    print("✅ Tüm modlarda kayıtlar fixture ile aynı" if ok else "❌ Modlar arasında fark / boş sonuç var")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect Kafaları Micro-Benchmark - 25 ayrı Linear + stack vs tek fused projeksiyon
+Aynı checkpoint iki şekilde yüklenir; batch 1, 16 ve 64 için:
+- sadece kafa katmanı (CLS vektörü -> logits) süresi
+- tam forward (BERT + kafalar) süresi
+ölçülür ve iki yolun logits/argmax çıktıları karşılaştırılır.
+
+Çalıştırma: python bench_heads.py
+"""
+
+import time
+
+import torch
+
+from aspect_model import load_model
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+BATCH_SIZES = [1, 16, 64]
+SEQ_LEN = 64            # tam forward için token sayısı
+HEAD_TEKRAR = 2000      # kafa ölçümü tekrar sayısı
+FORWARD_TEKRAR = 10     # tam forward tekrar sayısı
+
+def per_batch_ms(fn, tekrar):
+    for _ in range(3):  # ısınma
+        fn()
+    start = time.perf_counter()
+    for _ in range(tekrar):
+        fn()
+    return (time.perf_counter() - start) / tekrar * 1000
+
+def heads_unfused(model, cls):
+    return torch.stack([head(cls) for head in model.heads], dim=1)
+
+def heads_fused(model, cls):
+    return model.fused_heads(cls).view(-1, model.num_aspects, model.num_classes)
+
+def main():
+    unfused = load_model(CHECKPOINT_DIR, fused=False)
+    fused = load_model(CHECKPOINT_DIR, fused=True)
+    hidden = fused.bert.config.hidden_size
+    vocab = fused.bert.config.vocab_size
+
+    print(f"📊 torch threads: {torch.get_num_threads()} | hidden: {hidden}\n")
+    print(f"{'batch':>5} | {'kafa 25x':>10} | {'kafa fused':>10} | {'forward 25x':>11} | {'forward fused':>13} | eşit")
+    print("-" * 72)
+
+    with torch.no_grad():
+        for bs in BATCH_SIZES:
+            cls = torch.randn(bs, hidden)
+            input_ids = torch.randint(5, vocab, (bs, SEQ_LEN))
+            attention_mask = torch.ones_like(input_ids)
+
+            h_old = per_batch_ms(lambda: heads_unfused(unfused, cls), HEAD_TEKRAR)
+            h_new = per_batch_ms(lambda: heads_fused(fused, cls), HEAD_TEKRAR)
+            f_old = per_batch_ms(lambda: unfused(input_ids, attention_mask), FORWARD_TEKRAR)
+            f_new = per_batch_ms(lambda: fused(input_ids, attention_mask), FORWARD_TEKRAR)
+
+            a = unfused(input_ids, attention_mask)["logits"]
+            b = fused(input_ids, attention_mask)["logits"]
+            esit = torch.allclose(a, b, atol=1e-5) and torch.equal(a.argmax(-1), b.argmax(-1))
+
+            print(f"{bs:>5} | {h_old:8.3f}ms | {h_new:8.3f}ms | {f_old:9.2f}ms | {f_new:11.2f}ms | {'✅' if esit else '❌'}")
+
+if __name__ == "__main__":
+    main()
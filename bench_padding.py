@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Padding Benchmark - max_length vs uzunluk kovaları
+aspectveri/val_fold*.jsonl yorumlarını 50'lik "otel" gruplarına böler,
+iki padding modunu süre, işlenen token sayısı ve tahmin uyumu açısından karşılaştırır.
+
+Çalıştırma: python bench_padding.py
+"""
+
+import glob
+import json
+import random
+import time
+
+import api_server
+from aspect_model import length_buckets
+
+# ============================================
+# AYARLAR
+# ============================================
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+YORUM_PER_OTEL = 50
+OTEL_SAYISI = 20
+SEED = 42
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                texts.append(json.loads(line)["yorum"])
+    return texts
+
+def padded_tokens(texts, mode):
+    """Modelin gördüğü toplam token sayısı (padding dahil)"""
+    if mode == "max_length":
+        return len(texts) * api_server.MAX_LENGTH
+    buckets = length_buckets(api_server.tokenizer, texts, api_server.BUCKET_SIZE)
+    return sum(ids.numel() for _, ids, _ in buckets)
+
+def run_mode(oteller, mode):
+    preds = []
+    tokens = 0
+    start = time.perf_counter()
+    for texts in oteller:
+        preds.extend(api_server.labels_of(r) for r in api_server.run_model(texts, padding=mode))
+    elapsed = time.perf_counter() - start
+    for texts in oteller:
+        tokens += padded_tokens(texts, mode)
+    return preds, tokens, elapsed
+
+def main():
+    api_server.load_all()  # model sunucu açılışında yüklenir, burada elle yükle
+    texts = load_texts()
+    random.Random(SEED).shuffle(texts)
+    oteller = [
+        texts[i * YORUM_PER_OTEL:(i + 1) * YORUM_PER_OTEL]
+        for i in range(OTEL_SAYISI)
+    ]
+    n = sum(len(o) for o in oteller)
+    print(f"📊 {OTEL_SAYISI} otel x {YORUM_PER_OTEL} yorum = {n} yorum "
+          f"(kova boyutu: {api_server.BUCKET_SIZE})\n")
+
+    # Isınma
+    api_server.run_model(oteller[0][:4], padding="max_length")
+    api_server.run_model(oteller[0][:4], padding="bucket")
+
+    sonuc = {}
+    for mode in ["max_length", "bucket"]:
+        preds, tokens, elapsed = run_mode(oteller, mode)
+        sonuc[mode] = (preds, tokens, elapsed)
+        print(f"  {mode:<11} süre: {elapsed:7.2f} sn | {n / elapsed:7.1f} yorum/sn | token: {tokens}")
+
+    base_preds, base_tokens, base_time = sonuc["max_length"]
+    new_preds, new_tokens, new_time = sonuc["bucket"]
+
+    esit = sum(a == b for a, b in zip(base_preds, new_preds))
+    print(f"\n  Token oranı (bucket / max_length): {new_tokens / base_tokens:.3f}")
+    print(f"  Hızlanma: {base_time / new_time:.2f}x")
+    print(f"  Tahmin uyumu: {esit}/{n} yorum birebir aynı")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Yanıt Formatı Benchmark - /predict_batch JSON vs .npy vs msgpack
+Aynı tahminler (val_fold yorumları) her formatta kodlanır; yanıt boyutu,
+sunucu tarafı kodlama ve istemci tarafı çözme süresi ölçülür, çözülen
+label'ların JSON ile birebir aynı olduğu kontrol edilir.
+
+Çalıştırma: python bench_response.py
+"""
+
+import glob
+import io
+import json
+import time
+
+import numpy as np
+
+import api_server
+
+# ============================================
+# AYARLAR
+# ============================================
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+YORUM_SAYISI = 1000
+TEKRAR = 20
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                texts.append(json.loads(line)["yorum"])
+    return texts[:YORUM_SAYISI]
+
+def encode(results, fmt, top_k):
+    if fmt == "json" and top_k == 0:
+        return json.dumps([api_server.labels_of(r) for r in results]).encode("utf-8")
+    return api_server.encode_results(results, top_k, fmt).body
+
+def decode(body, fmt, top_k):
+    """İstemcinin yapacağı çözme -> label'lar (JSON'da liste, ikili formatlarda numpy dizisi)"""
+    if fmt == "json":
+        data = json.loads(body)
+        return data if top_k == 0 else [d["labels"] for d in data]
+    if fmt == "npy":
+        arr = np.load(io.BytesIO(body))
+        return arr if top_k == 0 else arr["labels"]
+    import msgpack
+    data = msgpack.unpackb(body)
+    return np.frombuffer(data["labels"], dtype=np.uint8).reshape(data["shape"])
+
+def timed(fn):
+    start = time.perf_counter()
+    for _ in range(TEKRAR):
+        out = fn()
+    return out, (time.perf_counter() - start) / TEKRAR * 1000
+
+def main():
+    api_server.load_all()
+    texts = load_texts()
+    results = api_server.run_model(texts)
+    reference = [api_server.labels_of(r) for r in results]
+
+    formats = [("json", 0), ("json", 1), ("npy", 0), ("npy", 1), ("npy", 2)]
+    if api_server.MSGPACK_AVAILABLE:
+        formats += [("msgpack", 1), ("msgpack", 2)]
+    else:
+        print("⚠️  msgpack kurulu değil, msgpack ölçülmeyecek.")
+
+    print(f"📊 {len(texts)} yorum | {TEKRAR} tekrar ortalaması\n")
+    print(f"{'format':>8} | {'top_k':>5} | {'boyut':>10} | {'bayt/yorum':>10} | {'kodlama':>9} | {'çözme':>9} | eşit")
+    print("-" * 76)
+    for fmt, top_k in formats:
+        body, enc_ms = timed(lambda: encode(results, fmt, top_k))
+        labels, dec_ms = timed(lambda: decode(body, fmt, top_k))
+        if fmt != "json":
+            labels = labels.tolist()
+        if top_k == 2:
+            labels = [[pair[0] for pair in row] for row in labels]
+        esit = labels == reference
+        print(f"{fmt:>8} | {top_k:>5} | {len(body) / 1024:8.1f}KB | {len(body) / len(texts):10.1f} | "
+              f"{enc_ms:7.2f}ms | {dec_ms:7.2f}ms | {'✅' if esit else '❌'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Soğuk Açılış Benchmark - eski yükleme yolu vs yerel config + tek seferlik ağırlık yükleme
+Her ölçüm ayrı bir Python sürecinde yapılır (import süreleri dahil):
+- eski: tokenizer + BERT hub'dan (from_pretrained), ön-eğitimli ağırlıklar
+  yüklenip checkpoint ile üzerine yazılır
+- yeni: config/tokenizer checkpoint klasöründen, parametreler meta cihazda
+  kurulur ve ağırlıklar sadece model.safetensors'tan (mmap) bağlanır
+SOGUK_DISK=True ise (Linux + root) her ölçümden önce page cache boşaltılır;
+böylece kütüphane ve ağırlık dosyalarının diskten okunması da ölçüme girer.
+Ayrıca api_server.py başlatılıp /health (liveness) ve /ready (readiness)
+cevap verene kadar geçen süre ölçülür.
+
+Çalıştırma: python bench_startup.py
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+TEKRAR = 3
+PORT = 8012
+BASLATMA_TIMEOUT = 300   # sn
+SOGUK_DISK = True        # her ölçümden önce page cache'i boşalt (root gerekir)
+
+ESKI_YOL = """
+import json, time
+t0 = time.perf_counter()
+import torch
+from safetensors.torch import load_file
+from aspect_model import BertMultiHeadFocal, fuse_head_weights, load_tokenizer, BASE_MODEL_NAME
+t1 = time.perf_counter()
+tokenizer = load_tokenizer()
+model = BertMultiHeadFocal(BASE_MODEL_NAME, fused=True)
+model.load_state_dict(fuse_head_weights(load_file("{ckpt}/model.safetensors")))
+model.eval()
+print(json.dumps({{"import": t1 - t0, "yukleme": time.perf_counter() - t1}}))
+"""
+
+YENI_YOL = """
+import json, time
+t0 = time.perf_counter()
+import torch
+from aspect_model import load_model, load_tokenizer
+t1 = time.perf_counter()
+tokenizer = load_tokenizer("{ckpt}")
+model = load_model("{ckpt}")
+print(json.dumps({{"import": t1 - t0, "yukleme": time.perf_counter() - t1}}))
+"""
+
+def drop_page_cache():
+    """Linux page cache'i boşalt; yetki yoksa False"""
+    try:
+        os.sync()
+        with open("/proc/sys/vm/drop_caches", "w") as f:
+            f.write("1")
+        return True
+    except OSError:
+        return False
+
+def run_snippet(code):
+    """Kodu yeni bir süreçte çalıştır -> (süreç süresi, import, yükleme)"""
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code.format(ckpt=CHECKPOINT_DIR)],
+                         capture_output=True, text=True, check=True).stdout
+    wall = time.perf_counter() - start
+    result = json.loads(out.strip().splitlines()[-1])
+    return wall, result["import"], result["yukleme"]
+
+def measure_snippet(code):
+    run_snippet(code)  # ısınma: ilk açılışta config/tokenizer checkpoint'e kaydedilir
+    runs = []
+    for _ in range(TEKRAR):
+        if SOGUK_DISK:
+            drop_page_cache()
+        runs.append(run_snippet(code))
+    return [statistics.median(r[i] for r in runs) for i in range(3)]
+
+def measure_server():
+    """api_server.py başlangıcından /health ve /ready 200 olana kadar geçen süre"""
+    env = dict(os.environ, API_PORT=str(PORT), API_WORKERS="1")
+    if SOGUK_DISK:
+        drop_page_cache()
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "api_server.py"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://localhost:{PORT}"
+    live = None
+    try:
+        while time.perf_counter() - start < BASLATMA_TIMEOUT and proc.poll() is None:
+            try:
+                if live is None and requests.get(f"{url}/health", timeout=1).status_code == 200:
+                    live = time.perf_counter() - start
+                if requests.get(f"{url}/ready", timeout=1).status_code == 200:
+                    return live, time.perf_counter() - start
+            except requests.RequestException:
+                pass
+            time.sleep(0.05)
+        return live, None
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+def main():
+    global SOGUK_DISK
+    if SOGUK_DISK and not drop_page_cache():
+        print("⚠️  Page cache boşaltılamadı (root değil?), sıcak disk ile ölçülüyor.")
+        SOGUK_DISK = False
+    print(f"📊 Checkpoint: {CHECKPOINT_DIR} | {TEKRAR} tekrarın medyanı | "
+          f"{'soğuk' if SOGUK_DISK else 'sıcak'} disk\n")
+    print(f"{'yol':>5} | {'süreç':>8} | {'import':>8} | {'yükleme':>8}")
+    print("-" * 40)
+    eski = measure_snippet(ESKI_YOL)
+    yeni = measure_snippet(YENI_YOL)
+    for name, (wall, imp, load) in [("eski", eski), ("yeni", yeni)]:
+        print(f"{name:>5} | {wall:7.2f}s | {imp:7.2f}s | {load:7.2f}s")
+    print(f"\n⏱️  Soğuk açılış: {eski[0]:.2f}s -> {yeni[0]:.2f}s ({eski[0] / yeni[0]:.2f}x) | "
+          f"model yükleme: {eski[2]:.2f}s -> {yeni[2]:.2f}s ({eski[2] / yeni[2]:.2f}x)")
+
+    live, ready = measure_server()
+    if ready is None:
+        print("❌ api_server.py hazır olmadı")
+        return
+    print(f"🚀 api_server.py: /health {live:.2f}s | /ready {ready:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect Deposu Benchmark - 1M tahminin AspectStore'a partiler halinde eklenmesi
+- Sentetik veri: OTEL_SAYISI otel, TOPLAM yorum, TEKRAR_ORANI kadarı daha önce
+  eklenmiş yorumların tekrarı (tekilleştirme yolu da ölçülür)
+- Ekleme hızı (yorum/sn), parti başına süre, veritabanı boyutu
+- Doğruluk: örnek otellerde depodaki özet == tekil yorumların tamamı üzerinde
+  aspect_aggregate.summarize; aynı partiyi tekrar eklemek 0 yeni yorum döndürür
+- Okuma: store.summary (sabit süre) vs tüm geçmişten summarize
+
+Çalıştırma: python bench_store.py
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from aspect_aggregate import summarize
+from aspect_store import AspectStore
+
+# ============================================
+# AYARLAR
+# ============================================
+TOPLAM = 1_000_000
+OTEL_SAYISI = 200
+PARTILER = [50, 5000]            # pipeline çalıştırması (~50 yorum) ve toplu yükleme
+TEKRAR_ORANI = 0.1
+MENTION_ORANI = 0.12
+MIN_CONFIDENCE = 0.3
+KONTROL_OTEL = 5
+OKUMA_TEKRAR = 2000
+SEED = 42
+DOLGU = "oda temiz ve genişti, kahvaltı çeşitliydi ama havuz kalabalıktı. " * 4
+
+def make_data(parti):
+    """
+    Partiler oteller arasında sırayla dağıtılır (bkz. ingest); yorumların
+    TEKRAR_ORANI kadarı aynı otelin bir önceki partisindeki aynı sıradaki
+    yorumun tekrarıdır (yeniden kazınan yorum: aynı metin + aynı tahmin)
+    """
+    rng = np.random.default_rng(SEED)
+    labels = np.where(rng.random((TOPLAM, 25)) < MENTION_ORANI,
+                      rng.integers(1, 22, size=(TOPLAM, 25)), 0).astype(np.uint8)
+    probs = rng.random((TOPLAM, 25)).astype(np.float16)
+    dup = rng.random(TOPLAM) < TEKRAR_ORANI
+    source = np.arange(TOPLAM)
+    tur = parti * OTEL_SAYISI  # aynı otelin bir önceki partisi bu kadar geride
+    for s in range(tur, TOPLAM, tur):
+        block = np.arange(s, min(s + tur, TOPLAM))
+        block = block[dup[block]]
+        source[block] = source[block - tur]
+    labels, probs = labels[source], probs[source]
+    texts = [f"{i} {DOLGU}" for i in source.tolist()]
+    return texts, labels, probs
+
+def ingest(store, texts, labels, probs, parti):
+    """Partileri oteller arasında sırayla dağıtır -> (süre, yeni yorum, parti süreleri, otel -> indeksler)"""
+    otel_rows = {}
+    durations = []
+    added = 0
+    start = time.perf_counter()
+    for b, s in enumerate(range(0, TOPLAM, parti)):
+        otel = f"Otel {b % OTEL_SAYISI}"
+        t0 = time.perf_counter()
+        added += store.add(otel, texts[s:s + parti], labels[s:s + parti], probs[s:s + parti], MIN_CONFIDENCE)
+        durations.append(time.perf_counter() - t0)
+        otel_rows.setdefault(otel, []).extend(range(s, min(s + parti, TOPLAM)))
+    return time.perf_counter() - start, added, durations, otel_rows
+
+def check(store, texts, labels, probs, otel_rows):
+    """Depodaki özet, tekil yorumlar üzerinde summarize ile aynı mı?"""
+    ok = True
+    for otel in list(otel_rows)[:KONTROL_OTEL]:
+        seen, rows = set(), []
+        for i in otel_rows[otel]:
+            if texts[i] not in seen:
+                seen.add(texts[i])
+                rows.append(i)
+        ok &= store.summary(otel) == summarize(labels[rows], probs[rows], MIN_CONFIDENCE)
+        ok &= store.review_count(otel) == len(rows)
+    first = otel_rows[next(iter(otel_rows))][:50]
+    ok &= store.add(next(iter(otel_rows)), [texts[i] for i in first], labels[first], probs[first],
+                    MIN_CONFIDENCE) == 0
+    return ok
+
+def main():
+    print(f"🔄 Sentetik veri: {TOPLAM} tahmin, {OTEL_SAYISI} otel, ~%{TEKRAR_ORANI * 100:.0f} tekrar")
+    print(f"\n{'parti':>6} | {'süre':>8} | {'yorum/sn':>9} | {'yeni':>8} | {'parti p50':>9} | "
+          f"{'parti p99':>9} | {'DB':>8} | doğru")
+    print("-" * 84)
+    for parti in PARTILER:
+        texts, labels, probs = make_data(parti)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "aspect_store.db")
+            store = AspectStore(path)
+            elapsed, added, durations, otel_rows = ingest(store, texts, labels, probs, parti)
+            ok = check(store, texts, labels, probs, otel_rows)
+            size = sum(os.path.getsize(os.path.join(tmp, f)) for f in os.listdir(tmp))
+            p50, p99 = np.percentile(durations, [50, 99]) * 1000
+            print(f"{parti:>6} | {elapsed:7.1f}s | {TOPLAM / elapsed:9.0f} | {added:>8} | "
+                  f"{p50:7.2f}ms | {p99:7.2f}ms | {size / 1e6:6.1f}MB | {'✅' if ok else '❌'}")
+
+            otel = next(iter(otel_rows))
+            rows = otel_rows[otel]
+            t0 = time.perf_counter()
+            for _ in range(OKUMA_TEKRAR):
+                store.summary(otel)
+            read_ms = (time.perf_counter() - t0) / OKUMA_TEKRAR * 1000
+            t0 = time.perf_counter()
+            summarize(labels[rows], probs[rows], MIN_CONFIDENCE)
+            full_ms = (time.perf_counter() - t0) * 1000
+            store.close()
+    print(f"\n📊 Özet okuma ({len(rows)} yorumluk otel): depodan {read_ms:.3f}ms | "
+          f"tüm geçmişten summarize {full_ms:.2f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Zaman Penceresi Benchmark - AspectStore artımlı pencere/azalan özet vs her seferinde
+tüm geçmişten hesaplama (aspect_aggregate.window_summary / decayed_summary)
+- GUN_SAYISI gün boyunca her gün her otele yeni yorumlar eklenir; bir kısmı
+  geç gelen (GEC_GELEN_GUN güne kadar eski tarihli) yorumlardır
+- Her KONTROL_ARALIGI günde: pencere sayımı birebir, azalan sayım float
+  toleransıyla, özetler (pencere) birebir karşılaştırılır
+- Pencere uzunluğu / yarı ömür değiştirilip depo yeniden açılınca sonuçlar
+  yine tüm geçmişten hesaplananla aynı olmalı
+- Süre: günlük ekleme + okuma vs tüm geçmişten yeniden hesaplama
+
+Çalıştırma: python bench_window.py
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from aspect_aggregate import aspect_counts, summary_from_counts, GUN
+from aspect_store import AspectStore
+
+# ============================================
+# AYARLAR
+# ============================================
+GUN_SAYISI = 365
+OTEL_SAYISI = 20
+GUNLUK_YORUM = 40          # otel başına günlük ortalama yorum
+GEC_GELEN_ORANI = 0.2
+GEC_GELEN_GUN = 60
+PENCERE_GUN = 30
+YARI_OMUR_GUN = 30
+MENTION_ORANI = 0.12
+MIN_CONFIDENCE = 0.3
+KONTROL_ARALIGI = 30
+BASLANGIC = 1_700_000_000.0  # sentetik takvimin ilk günü (unix sn)
+SEED = 42
+
+def reference_counts(labels, probs, stamps, now, window_days, half_life_days):
+    """Tüm geçmişten: (pencere sayımı, azalan sayım)"""
+    days = stamps // GUN
+    mask = (days > now // GUN - window_days) & (days <= now // GUN)
+    window = aspect_counts(labels[mask], probs[mask], MIN_CONFIDENCE)[0]
+    weights = 2.0 ** (-(now - stamps) / (half_life_days * GUN))
+    decayed = aspect_counts(labels, probs, MIN_CONFIDENCE, weights)[0]
+    return window, decayed
+
+def compare(store, history, now, window_days, half_life_days):
+    """Örnek otellerde depo == tüm geçmişten hesaplama -> (eşit mi, yeniden hesaplama süresi)"""
+    ok = True
+    recompute = 0.0
+    for otel, (labels, probs, stamps) in history.items():
+        labels, probs, stamps = np.concatenate(labels), np.concatenate(probs), np.concatenate(stamps)
+        t0 = time.perf_counter()
+        window, decayed = reference_counts(labels, probs, stamps, now, window_days, half_life_days)
+        summary_from_counts(window)
+        summary_from_counts(decayed)
+        recompute += time.perf_counter() - t0
+        ok &= np.array_equal(store.window_counts(otel, now), window)
+        ok &= np.allclose(store.decayed_counts(otel, now), decayed, rtol=1e-9, atol=1e-9)
+        ok &= store.window_summary(otel, now) == summary_from_counts(window)
+    return ok, recompute / len(history)
+
+def main():
+    rng = np.random.default_rng(SEED)
+    history = {f"Otel {h}": ([], [], []) for h in range(OTEL_SAYISI)}
+    add_time = read_time = 0.0
+    adds = reads = 0
+    all_ok = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "aspect_store.db")
+        store = AspectStore(path, PENCERE_GUN, YARI_OMUR_GUN)
+        print(f"🔄 {GUN_SAYISI} gün x {OTEL_SAYISI} otel x ~{GUNLUK_YORUM} yorum/gün "
+              f"(%{GEC_GELEN_ORANI * 100:.0f} geç gelen)\n")
+        print(f"{'gün':>5} | {'yorum/otel':>10} | {'ekleme':>9} | {'okuma':>8} | {'yeniden hesap':>13} | doğru")
+        print("-" * 66)
+        for day in range(GUN_SAYISI):
+            now = BASLANGIC + (day + 1) * GUN - 1  # günün sonu
+            for otel in history:
+                n = int(rng.poisson(GUNLUK_YORUM))
+                labels = np.where(rng.random((n, 25)) < MENTION_ORANI,
+                                  rng.integers(1, 22, size=(n, 25)), 0).astype(np.uint8)
+                probs = rng.random((n, 25)).astype(np.float16)
+                late = rng.random(n) < GEC_GELEN_ORANI
+                stamps = now - rng.random(n) * GUN
+                stamps[late] -= rng.integers(1, GEC_GELEN_GUN, size=late.sum()) * GUN
+                texts = [f"{otel} {day} {i}" for i in range(n)]
+
+                t0 = time.perf_counter()
+                store.add(otel, texts, labels, probs, MIN_CONFIDENCE, stamps.tolist(), now=now)
+                add_time += time.perf_counter() - t0
+                adds += 1
+                for lst, arr in zip(history[otel], (labels, probs, stamps)):
+                    lst.append(arr)
+
+            t0 = time.perf_counter()
+            for otel in history:
+                store.window_summary(otel, now)
+                store.decayed_summary(otel, now)
+            read_time += time.perf_counter() - t0
+            reads += len(history)
+
+            if (day + 1) % KONTROL_ARALIGI == 0:
+                ok, recompute = compare(store, history, now, PENCERE_GUN, YARI_OMUR_GUN)
+                all_ok &= ok
+                print(f"{day + 1:>5} | {sum(map(len, history['Otel 0'][0])):>10} | "
+                      f"{add_time / adds * 1000:7.2f}ms | {read_time / reads * 1000:6.2f}ms | "
+                      f"{recompute * 1000:11.2f}ms | {'✅' if ok else '❌'}")
+        store.close()
+
+        # Ayar değişikliği: pencere ve yarı ömür farklı -> gün kovalarından yeniden kurulur
+        # (azalan toplam gün ortası varsayımıyla kurulduğu için sadece pencere birebir kontrol edilir)
+        store = AspectStore(path, window_days=7, half_life_days=90)
+        later = now + 3 * GUN
+        ok = True
+        for otel, (labels, probs, stamps) in history.items():
+            window, _ = reference_counts(np.concatenate(labels), np.concatenate(probs),
+                                         np.concatenate(stamps), later, 7, 90)
+            ok &= np.array_equal(store.window_counts(otel, later), window)
+        store.close()
+        all_ok &= ok
+        print(f"\n{'✅' if ok else '❌'} Ayar değişimi (7 gün pencere, 3 gün sonra okuma): pencere birebir aynı")
+
+    print(f"\n{'✅ Tüm kontroller geçti' if all_ok else '❌ Fark bulundu'} | ekleme başına {add_time / adds * 1000:.2f}ms, "
+          f"pencere + azalan okuma {read_time / reads * 1000:.2f}ms")
+
+if __name__ == "__main__":
+    main()
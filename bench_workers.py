@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+Çoklu Worker Benchmark - API_WORKERS = 1, 2, 4, 8
+Her seviye için api_server.py ayrı bir süreç olarak başlatılır, load_test.py
+ile yük verilir ve worker süreçlerinin bellek kullanımı ölçülür:
+- RSS: sürecin fiziksel bellekteki tüm sayfaları (paylaşılanlar dahil)
+- PSS: paylaşılan sayfalar paylaşan süreç sayısına bölünmüş hali
+  (mmap'li ağırlıklar paylaşıldıkça worker başına PSS düşer)
+Bellek ölçümü Linux'ta /proc/<pid>/smaps_rollup üzerinden yapılır.
+
+Çalıştırma: python bench_workers.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+
+import requests
+
+import load_test
+
+# ============================================
+# AYARLAR
+# ============================================
+WORKER_SAYILARI = [1, 2, 4, 8]
+PORT = 8010
+SURE = 20                  # her seviye için yük süresi (sn)
+ISTEMCI_PER_WORKER = 4     # eşzamanlı istemci = worker x bu değer
+BASLATMA_TIMEOUT = 300     # sn
+
+def smaps_rollup(pid):
+    """{'Rss': kB, 'Pss': kB, ...} (Linux)"""
+    values = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    values[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        pass
+    return values
+
+def worker_pids(url, n):
+    """/health yanıtındaki pid'lerden istek karşılayan worker süreçlerini topla"""
+    pids = set()
+    for _ in range(n * 50):
+        pids.add(requests.get(f"{url}/health", timeout=5).json()["pid"])
+        if len(pids) >= n:
+            break
+    return sorted(pids)
+
+def wait_ready(url, proc):
+    deadline = time.time() + BASLATMA_TIMEOUT
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            return False
+        try:
+            if requests.get(f"{url}/ready", timeout=2).status_code == 200:
+                return True
+        except Exception:
+            pass
+        time.sleep(0.5)
+    return False
+
+def run_workers(n, texts):
+    env = dict(os.environ, API_WORKERS=str(n), API_PORT=str(PORT), ASPECT_CACHE_SIZE="0")
+    proc = subprocess.Popen([sys.executable, "api_server.py"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://localhost:{PORT}"
+    try:
+        if not wait_ready(url, proc):
+            print(f"❌ {n} worker ile sunucu başlamadı")
+            return None
+        load_test.API_URL = url
+        load_test.run_level(texts, n, sure=3)  # ısınma
+        result = load_test.run_level(texts, n * ISTEMCI_PER_WORKER, sure=SURE)
+        mem = [smaps_rollup(pid) for pid in worker_pids(url, n)]
+        result["workers"] = n
+        result["rss_mb"] = sum(m.get("Rss", 0) for m in mem) / len(mem) / 1024 if mem else 0.0
+        result["pss_mb"] = sum(m.get("Pss", 0) for m in mem) / len(mem) / 1024 if mem else 0.0
+        result["toplam_pss_mb"] = sum(m.get("Pss", 0) for m in mem) / 1024
+        return result
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+
+def main():
+    texts = load_test.load_texts()
+    print(f"📊 {len(texts)} yorum havuzu | çekirdek: {os.cpu_count()}\n")
+    print(f"{'worker':>6} | {'yorum/sn':>8} | {'ölçek':>6} | {'p95 ms':>8} | "
+          f"{'RSS/worker':>10} | {'PSS/worker':>10} | {'toplam PSS':>10}")
+    print("-" * 78)
+
+    base = None
+    for n in WORKER_SAYILARI:
+        r = run_workers(n, texts)
+        if r is None:
+            continue
+        base = base or r["reviews_per_s"]
+        print(f"{n:>6} | {r['reviews_per_s']:8.1f} | {r['reviews_per_s'] / base:5.2f}x | {r['p95']:8.1f} | "
+              f"{r['rss_mb']:8.0f}MB | {r['pss_mb']:8.0f}MB | {r['toplam_pss_mb']:8.0f}MB")
+
+if __name__ == "__main__":
+    main()
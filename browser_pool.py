@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+Tarayıcı Havuzu - Google Maps kazıyıcıları için sıcak Chrome oturumları
+Eskiden her otel için: ChromeDriverManager().install() + yeni profil + Chrome
+açılışı + Maps ana sayfası + çerez onayı + quit (otel başına birkaç sn).
+Havuz oturumları bir kez açar ve ısıtır (warmup: örn. Maps ana sayfası + çerez
+onayı), her otel işine bir oturum verir:
+- İşler arası sıfırlama: fazla sekmeler kapanır, reset_origins için sayfa
+  depoları (localStorage, IndexedDB, önbellek...) silinir, about:blank açılır.
+  Çerezler kalır, onay tekrar sorulmaz.
+- max_uses işten sonra ya da iş hata verirse oturum kapatılır, yerine arka
+  planda yenisi açılıp ısıtılır
+- chromedriver yolu süreç başına bir kez çözülür
+- extra_args liste ya da çağrılabilir olabilir; çağrılabilirse her yeni oturumda
+  yeniden çağrılır (örn. yenilenen tarayıcıya yeni bir user-agent)
+- block_urls: oturum açılırken CDP Network.setBlockedURLs ile bu desenlere
+  uyan istekler (görsel, font, medya) hiç yapılmaz; ayar sekmede kalıcıdır
+- perf_log: Chrome performans logu açılır (driver.get_log("performance") ile
+  ağ olayları: aktarılan bayt, yanıt gövdeleri; bkz. otel_pipeline.AgKaydi)
+
+Kullanım:
+    pool = BrowserPool(size=4, warmup=isit).start()   # start: oturumları önceden aç
+    with pool.session() as driver:
+        driver.get(url)
+    # ya da: driver = pool.acquire() ... finally: pool.release(driver)
+    pool.close()
+
+Ölçüm (yerel fixture site): python bench_browser.py
+"""
+
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from webdriver_manager.chrome import ChromeDriverManager
+
+# ============================================
+# AYARLAR
+# ============================================
+HAVUZ_BOYUTU = 1
+MAX_KULLANIM = 25              # bu kadar işten sonra oturum yenilenir (bellek şişmesi, iz birikmesi)
+HEADLESS = os.environ.get("BROWSER_HEADLESS", "1") == "1"
+TEMIZLENEN_DEPOLAR = "local_storage,session_storage,indexeddb,websql,cache_storage,service_workers"
+WEBDRIVER_GIZLE = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+
+_driver_path = None
+_driver_lock = threading.Lock()
+
+# ============================================
+# CHROME
+# ============================================
+def driver_path():
+    """chromedriver yolu; ChromeDriverManager her çağrıda sürüm kontrolü yaptığı için bir kez çözülür"""
+    global _driver_path
+    with _driver_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+def chrome_options(profile_dir, headless=HEADLESS, extra_args=(), perf_log=False):
+    opts = ChromeOptions()
+    opts.add_argument("--lang=tr-TR")
+    opts.add_argument("--window-size=1920,1080")
+    opts.add_argument("--disable-notifications")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--disable-blink-features=AutomationControlled")
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument(f"--user-data-dir={profile_dir}")
+    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
+    opts.add_experimental_option("useAutomationExtension", False)
+    for arg in extra_args:
+        opts.add_argument(arg)
+    if perf_log:
+        opts.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return opts
+
+def new_driver(headless=HEADLESS, extra_args=(), block_urls=(), perf_log=False):
+    """Yeni Chrome, kendi geçici profiliyle -> (driver, profil klasörü)"""
+    profile = tempfile.mkdtemp(prefix="gm_")
+    try:
+        driver = webdriver.Chrome(service=ChromeService(driver_path()),
+                                  options=chrome_options(profile, headless, extra_args, perf_log))
+    except Exception:
+        shutil.rmtree(profile, ignore_errors=True)
+        raise
+    try:
+        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": WEBDRIVER_GIZLE})
+    except:
+        pass
+    if block_urls:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(block_urls)})
+        except Exception:
+            quit_driver(driver, profile)
+            raise
+    return driver, profile
+
+def quit_driver(driver, profile):
+    try:
+        driver.quit()
+    except:
+        pass
+    shutil.rmtree(profile, ignore_errors=True)
+
+# ============================================
+# HAVUZ
+# ============================================
+class Session:
+    def __init__(self, driver, profile):
+        self.driver = driver
+        self.profile = profile
+        self.uses = 0
+        self.broken = False
+
+class BrowserPool:
+    def __init__(self, size=HAVUZ_BOYUTU, max_uses=MAX_KULLANIM, warmup=None,
+                 headless=HEADLESS, extra_args=(), reset_origins=(), block_urls=(), perf_log=False):
+        self.size = size
+        self.max_uses = max_uses
+        self.warmup = warmup              # warmup(driver): yeni oturumda bir kez (ana sayfa + onay)
+        self.headless = headless
+        self.extra_args = extra_args if callable(extra_args) else tuple(extra_args)
+        self.reset_origins = list(reset_origins)
+        self.block_urls = tuple(block_urls)
+        self.perf_log = perf_log
+        self.stats = Counter()            # acilan, is, yenilenen, hata, acilis_sn
+        self._idle = queue.Queue()
+        self._active = {}                 # id(driver) -> Session
+        self._created = 0                 # açık + açılmakta olan oturum
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- oturum aç / kapat ----
+    def _open(self):
+        t0 = time.perf_counter()
+        extra = self.extra_args() if callable(self.extra_args) else self.extra_args
+        driver, profile = new_driver(self.headless, extra, self.block_urls, self.perf_log)
+        try:
+            if self.warmup:
+                self.warmup(driver)
+        except Exception:
+            quit_driver(driver, profile)
+            raise
+        with self._lock:
+            self.stats["acilan"] += 1
+            self.stats["acilis_sn"] += time.perf_counter() - t0
+        return Session(driver, profile)
+
+    def _reserve(self):
+        """Havuz dolmadıysa yeni oturum için yer ayırır"""
+        with self._lock:
+            if self._closed or self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _refill(self):
+        """Yeni oturumu açıp boşta bekleyenlere ekler (arka planda)"""
+        if not self._reserve():
+            return
+        try:
+            s = self._open()
+            if self._closed:
+                self._discard(s)      # açılırken havuz kapatıldı
+            else:
+                self._idle.put(s)
+        except Exception as e:
+            print(f"⚠️  Tarayıcı açılamadı: {e}")
+            with self._lock:
+                self._created -= 1
+
+    def _discard(self, s):
+        quit_driver(s.driver, s.profile)
+        with self._lock:
+            self._created -= 1
+
+    def start(self):
+        """size oturumu paralel açar ve ısıtır (ilk işler beklemesin)"""
+        threads = [threading.Thread(target=self._refill, daemon=True) for _ in range(self.size)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return self
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                s = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(s)
+
+    # ---- işler ----
+    @staticmethod
+    def _alive(s):
+        try:
+            s.driver.current_url
+            return True
+        except:
+            return False
+
+    def _acquire(self):
+        while True:
+            if self._closed:
+                raise RuntimeError("Tarayıcı havuzu kapatıldı")
+            try:
+                s = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve():
+                    try:
+                        return self._open()
+                    except Exception:
+                        with self._lock:
+                            self._created -= 1
+                        raise
+                try:
+                    s = self._idle.get(timeout=1)
+                except queue.Empty:
+                    continue
+            if self._alive(s):
+                return s
+            self._discard(s)              # tarayıcı çökmüş: yenisi açılır
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for h in handles[1:]:
+            driver.switch_to.window(h)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        for origin in self.reset_origins:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin",
+                                   {"origin": origin, "storageTypes": TEMIZLENEN_DEPOLAR})
+        driver.get("about:blank")
+
+    def _release(self, s):
+        s.uses += 1
+        with self._lock:
+            self.stats["is"] += 1
+        if not s.broken and s.uses < self.max_uses and not self._closed:
+            try:
+                self._reset(s.driver)
+                self._idle.put(s)
+                return
+            except Exception:
+                s.broken = True
+        with self._lock:
+            self.stats["hata" if s.broken else "yenilenen"] += 1
+        self._discard(s)
+        if not self._closed:
+            threading.Thread(target=self._refill, daemon=True).start()
+
+    def acquire(self):
+        """Bir iş için sıcak oturumun driver'ı; iş bitince release(driver) çağrılmalı"""
+        s = self._acquire()
+        with self._lock:
+            self._active[id(s.driver)] = s
+        return s.driver
+
+    def release(self, driver):
+        """Oturumu sıfırlayıp havuza döndürür (bozuksa kapatıp yenisini açar)"""
+        with self._lock:
+            s = self._active.pop(id(driver), None)
+        if s is not None:
+            self._release(s)
+
+    def mark_broken(self, driver):
+        """İş içinde yakalanan hata: oturum işten sonra havuza dönmez, yenilenir"""
+        with self._lock:
+            s = self._active.get(id(driver))
+        if s is not None:
+            s.broken = True
+
+    @contextmanager
+    def session(self):
+        """acquire/release'in with hali; iş hata fırlatırsa oturum yenilenir"""
+        driver = self.acquire()
+        try:
+            yield driver
+        except Exception:
+            self.mark_broken(driver)
+            raise
+        finally:
+            self.release(driver)
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+"""
+Toplu Skorlama (HTTP'siz) - Tüm yorum korpusunu süreç içinde etiketler
+BertMultiHeadFocal doğrudan yüklenir; JSONL/CSV girdiler satır satır okunur,
+tokenize işlemi arka plan thread'inde yapılırken model önceki parçayı işler.
+Sonuçlar parça parça {"row", "id", "labels"} satırları olarak yazılır.
+
+- Çok çekirdek: --workers N ile N süreç açılır, satırlar row % N ile paylaşılır;
+  her süreç kendi shard dosyasına yazar, sonunda satır sırasıyla birleştirilir.
+  Ağırlıklar mmap ile yüklendiği için süreçler aynı fiziksel sayfaları paylaşır.
+- Devam etme: --resume ile her shard dosyasının son tam satırından devam edilir
+  (yarım kalan satır kesilir); --workers kesilen çalıştırmayla aynı olmalıdır
+  (farklıysa hata verilir); --start N ilk N satırı atlar.
+
+Kullanım:
+    python bulk_score.py                                     # val_fold*.jsonl
+    python bulk_score.py tum_oteller_yorumlar3.csv -o etiketler.jsonl --workers 4
+    python bulk_score.py tum_oteller_yorumlar3.csv -o etiketler.jsonl --workers 4 --resume
+"""
+
+import argparse
+import csv
+import glob
+import heapq
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+
+import torch
+
+from aspect_model import load_model, load_tokenizer, length_buckets
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+OUTPUT_PATH = "bulk_tahminler.jsonl"
+TEXT_FIELD = "yorum"
+ID_FIELD = "yorum_id"          # yoksa satır numarası kullanılır
+KEEP_FIELDS = ["otel_adi"]     # girdide varsa çıktıya aynen kopyalanır
+CHUNK_SIZE = 1024              # tokenizer thread'inin tek seferde hazırladığı yorum sayısı
+BUCKET_SIZE = 32               # model batch'i (uzunluğa göre sıralı kova)
+PREFETCH = 2                   # tokenize edilip modeli bekleyen en fazla parça
+RAPOR_SN = 10                  # ilerleme raporu aralığı
+
+# ============================================
+# GİRDİ / ÇIKTI
+# ============================================
+def iter_rows(paths):
+    """Tüm dosyalardan sırayla (row, kayıt dict) üretir; JSONL ve CSV desteklenir"""
+    row = 0
+    for path in paths:
+        if path.lower().endswith(".csv"):
+            with open(path, "r", encoding="utf-8-sig", newline="") as f:
+                for record in csv.DictReader(f):
+                    yield row, record
+                    row += 1
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield row, json.loads(line)
+                        row += 1
+
+def shard_path(output, shard, num_shards):
+    return f"{output}.shard{shard}-of-{num_shards}"
+
+def existing_num_shards(output):
+    """Diskte kalan shard dosyalarının N değerleri (.shardK-of-N) -> sıralı liste"""
+    found = set()
+    for p in glob.glob(glob.escape(output) + ".shard*-of-*"):
+        m = re.fullmatch(r"\.shard\d+-of-(\d+)", p[len(output):])
+        if m:
+            found.add(int(m.group(1)))
+    return sorted(found)
+
+def last_done_row(path):
+    """Shard dosyasındaki son tam satırın row değeri (yoksa -1); yarım kalan son satır kesilir"""
+    if not os.path.exists(path):
+        return -1
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        tail_start = max(0, size - (1 << 20))
+        f.seek(tail_start)
+        tail = f.read()
+        end = tail.rfind(b"\n")
+        if end < 0:
+            f.truncate(tail_start)
+            return -1
+        f.truncate(tail_start + end + 1)
+        last = tail[:end].rsplit(b"\n", 1)[-1]
+        return json.loads(last)["row"]
+
+def output_record(row, record, labels):
+    out = {"row": row, "id": record.get(ID_FIELD, row), "labels": labels}
+    for field in KEEP_FIELDS:
+        if field in record:
+            out[field] = record[field]
+    return json.dumps(out, ensure_ascii=False) + "\n"
+
+# ============================================
+# SKORLAMA
+# ============================================
+def tokenize_worker(tokenizer, rows, out_queue):
+    """Girdiyi CHUNK_SIZE'lık parçalara bölüp tokenize eder (arka plan thread'i)"""
+    try:
+        chunk = []
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) >= CHUNK_SIZE:
+                texts = [str(record.get(TEXT_FIELD) or "") for _, record in chunk]
+                out_queue.put((chunk, list(length_buckets(tokenizer, texts, BUCKET_SIZE))))
+                chunk = []
+        if chunk:
+            texts = [str(record.get(TEXT_FIELD) or "") for _, record in chunk]
+            out_queue.put((chunk, list(length_buckets(tokenizer, texts, BUCKET_SIZE))))
+        out_queue.put(None)
+    except Exception as e:
+        out_queue.put(e)
+
+def score_shard(paths, output, shard, num_shards, start, resume, threads):
+    """row % num_shards == shard olan satırları skorlar -> işlenen satır sayısı"""
+    torch.set_num_threads(threads)
+    path = shard_path(output, shard, num_shards)
+    done = last_done_row(path) if resume else -1
+    skip_until = max(start - 1, done)
+
+    rows = ((row, record) for row, record in iter_rows(paths)
+            if row % num_shards == shard and row > skip_until)
+
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    model = load_model(CHECKPOINT_DIR)
+
+    chunks = queue.Queue(maxsize=PREFETCH)
+    threading.Thread(target=tokenize_worker, args=(tokenizer, rows, chunks), daemon=True).start()
+
+    prefix = f"[{shard + 1}/{num_shards}] " if num_shards > 1 else ""
+    if done >= 0:
+        print(f"🔄 {prefix}row {done} sonrasından devam ediliyor")
+
+    count = 0
+    start_time = last_report = time.perf_counter()
+    with open(path, "a" if resume else "w", encoding="utf-8") as out:
+        while True:
+            item = chunks.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            chunk, buckets = item
+
+            labels = [None] * len(chunk)
+            with torch.inference_mode():
+                for idx, input_ids, attention_mask in buckets:
+                    preds = model(input_ids, attention_mask)["logits"].argmax(dim=-1).tolist()
+                    for i, pred in zip(idx, preds):
+                        labels[i] = pred
+
+            out.write("".join(output_record(row, record, lab)
+                              for (row, record), lab in zip(chunk, labels)))
+            out.flush()
+            count += len(chunk)
+
+            now = time.perf_counter()
+            if now - last_report >= RAPOR_SN:
+                print(f"   📊 {prefix}{count} yorum ({count / (now - start_time):.0f} yorum/sn)")
+                last_report = now
+    return count
+
+def merge_shards(output, num_shards):
+    """Shard dosyalarını row sırasıyla tek çıktıda birleştirir (akış halinde)"""
+    paths = [shard_path(output, k, num_shards) for k in range(num_shards)]
+    files = [open(p, "r", encoding="utf-8") for p in paths]
+    try:
+        with open(output, "w", encoding="utf-8") as out:
+            for line in heapq.merge(*files, key=lambda l: json.loads(l)["row"]):
+                out.write(line)
+    finally:
+        for f in files:
+            f.close()
+    for p in paths:
+        os.remove(p)
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP'siz toplu aspect skorlama")
+    parser.add_argument("inputs", nargs="*", help=f"jsonl/csv dosyaları (varsayılan: {FOLD_PATTERN})")
+    parser.add_argument("-o", "--output", default=OUTPUT_PATH)
+    parser.add_argument("--workers", type=int, default=1, help="süreç (shard) sayısı")
+    parser.add_argument("--resume", action="store_true", help="shard dosyalarından devam et")
+    parser.add_argument("--start", type=int, default=0, help="ilk N satırı atla")
+    args = parser.parse_args()
+
+    paths = args.inputs or sorted(glob.glob(FOLD_PATTERN))
+    if not paths:
+        print("❌ Girdi dosyası bulunamadı!")
+        return
+    if args.resume:
+        # Satırlar row % N ile paylaşıldığı için farklı N ile devam edilemez:
+        # mevcut shard'lar bulunmaz ve iş sessizce 0. satırdan başlardı
+        onceki = existing_num_shards(args.output)
+        if onceki and onceki != [args.workers]:
+            print(f"❌ {args.output} için {', '.join(map(str, onceki))} süreçlik shard dosyaları var; "
+                  f"--resume ile aynı --workers verilmeli (örn. --workers {onceki[0]})")
+            return
+        if not onceki and os.path.exists(args.output):
+            print(f"✅ {args.output} zaten tamamlanmış.")
+            return
+
+    threads = max(1, (os.cpu_count() or 1) // args.workers)
+    print(f"📁 {len(paths)} dosya -> {args.output} | {args.workers} süreç x {threads} thread")
+
+    start = time.perf_counter()
+    jobs = [(paths, args.output, k, args.workers, args.start, args.resume, threads)
+            for k in range(args.workers)]
+    if args.workers == 1:
+        counts = [score_shard(*jobs[0])]
+    else:
+        with multiprocessing.get_context("spawn").Pool(args.workers) as pool:
+            counts = pool.starmap(score_shard, jobs)
+    elapsed = time.perf_counter() - start
+
+    merge_shards(args.output, args.workers)
+    total = sum(counts)
+    print(f"✅ {total} yorum skorlandı -> {args.output} | {elapsed:.1f} sn "
+          f"({total / elapsed:.0f} yorum/sn, model yükleme dahil)")
+
+if __name__ == "__main__":
+    main()
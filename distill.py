@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+Distillation - BERTurk-base öğretmenden CPU için küçük öğrenci model
+Öğrenci aynı BertMultiHeadFocal sınıfıdır (25x22 çıktı, fused kafalar), sadece
+BERT config'i küçültülür (daha az katman / daha küçük hidden).
+
+- Soft target: mevcut checkpoint'in fold yorumları üzerindeki logit'leri
+  (bir kez hesaplanıp öğrenci klasörüne teacher_logits.safetensors olarak kaydedilir)
+- Kayıp: ALPHA * KL(öğretmen || öğrenci, sıcaklık T) * T^2 + (1 - ALPHA) * focal(gold)
+  --extra ile verilen etiketsiz yorumlar (csv/jsonl) sadece KL kısmına girer
+- hidden öğretmenle aynıysa öğrenci öğretmenin embedding'leri, eşit aralıklı
+  seçilen katmanları ve aspect kafalarıyla başlatılır; farklıysa rastgele başlar
+  (bu durumda çok daha fazla veri / epoch gerekir)
+- EVAL_FILE eğitimden çıkarılır; öğretmen ve öğrenci bu fold üzerinde
+  presence-F1, accuracy ve CPU yorum/sn ile karşılaştırılır. Not: öğretmen bu
+  fold'u eğitimde görmüşse öğretmen skorları iyimser olur; EVAL_FILE'ı
+  öğretmenin validation fold'u olarak seçin.
+
+Çıktı STUDENT_DIR'e yazılır: model.safetensors + config.json + tokenizer +
+distill_report.json. Servis etmek için: ASPECT_MODEL=student python api_server.py
+
+Çalıştırma: python distill.py
+            python distill.py --layers 4 --hidden 384 --epochs 10 --extra tum_oteller_yorumlar3.csv
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import time
+
+import torch
+import torch.nn.functional as F
+from safetensors.torch import load_file, save_file
+
+from aspect_model import (
+    BertMultiHeadFocal, load_model, load_tokenizer, load_base_config, length_buckets,
+    checkpoint_tag, presence_scores, BASE_MODEL_NAME, NUM_ASPECTS, NUM_CLASSES
+)
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"       # öğretmen
+STUDENT_DIR = "checkpoint-student"
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+EVAL_FILE = "aspectveri/val_fold1.jsonl"  # eğitime girmez, karşılaştırma için
+TEXT_FIELD = "yorum"
+
+STUDENT_LAYERS = 6
+EPOCHS = 3
+BATCH_SIZE = 32
+LR = 5e-5
+WARMUP_RATIO = 0.1
+WEIGHT_DECAY = 0.05
+TEMPERATURE = 2.0
+ALPHA = 0.7              # KL (soft target) ağırlığı; kalanı gold label focal kaybı
+FOCAL_GAMMA = 3.0        # model1egitim.ipynb ile aynı
+SEED = 42
+
+TEACHER_BUCKET = 16      # öğretmen logit'leri ve değerlendirme için kova boyutu
+CHUNK_SIZE = 2048        # eğitimde uzunluğa göre kovalanan karışık parça
+HIZ_ORNEK = 1000         # throughput ölçümü için yorum sayısı
+
+# ============================================
+# VERİ
+# ============================================
+def read_records(path):
+    """jsonl/csv -> kayıt listesi"""
+    if path.lower().endswith(".csv"):
+        import csv
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def load_data(extra_paths):
+    """-> (eğitim metinleri, eğitim gold'ları veya None, eval metinleri, eval gold'ları)"""
+    train_texts, train_golds = [], []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        if os.path.normpath(path) == os.path.normpath(EVAL_FILE):
+            continue
+        for r in read_records(path):
+            train_texts.append(r[TEXT_FIELD])
+            train_golds.append(r["labels"])
+    for path in extra_paths:
+        for r in read_records(path):
+            if r.get(TEXT_FIELD):
+                train_texts.append(str(r[TEXT_FIELD]))
+                train_golds.append(None)
+    records = read_records(EVAL_FILE)
+    return train_texts, train_golds, [r[TEXT_FIELD] for r in records], [r["labels"] for r in records]
+
+# ============================================
+# ÖĞRETMEN
+# ============================================
+def predict_logits(model, tokenizer, texts, bucket_size=TEACHER_BUCKET):
+    """Metinler -> logits [N, 25, 22] (float32, girdi sırasıyla)"""
+    out = torch.empty((len(texts), NUM_ASPECTS, NUM_CLASSES))
+    with torch.inference_mode():
+        for idx, input_ids, attention_mask in length_buckets(tokenizer, texts, bucket_size):
+            out[idx] = model(input_ids, attention_mask)["logits"].float()
+    return out
+
+def teacher_logits(teacher, tokenizer, texts):
+    """
+    Öğretmen logit'leri; STUDENT_DIR/teacher_logits.safetensors'ta aynı öğretmen
+    ve aynı metin sayısı için kayıt varsa oradan okunur (fp16 saklanır)
+    """
+    path = os.path.join(STUDENT_DIR, "teacher_logits.safetensors")
+    tag = checkpoint_tag(CHECKPOINT_DIR)
+    if os.path.exists(path):
+        from safetensors import safe_open
+        with safe_open(path, "pt") as f:
+            meta = f.metadata() or {}
+        if meta.get("teacher") == tag and meta.get("n") == str(len(texts)):
+            print(f"✅ Öğretmen logit'leri önbellekten: {path}")
+            return load_file(path)["logits"].float()
+
+    print(f"🔄 Öğretmen logit'leri hesaplanıyor ({len(texts)} yorum)...")
+    start = time.perf_counter()
+    logits = predict_logits(teacher, tokenizer, texts)
+    print(f"   ✅ {time.perf_counter() - start:.0f} sn")
+    save_file({"logits": logits.half()}, path, metadata={"teacher": tag, "n": str(len(texts))})
+    return logits
+
+# ============================================
+# ÖĞRENCİ
+# ============================================
+def student_config(teacher_config, layers, hidden):
+    config = teacher_config.__class__.from_dict(teacher_config.to_dict())
+    config.num_hidden_layers = layers
+    if hidden != teacher_config.hidden_size:
+        config.hidden_size = hidden
+        config.num_attention_heads = max(1, hidden // 64)
+        config.intermediate_size = hidden * 4
+    return config
+
+def build_student(teacher, config):
+    """Öğretmenle aynı sınıf, küçük config; hidden aynıysa öğretmen ağırlıklarından başlatılır"""
+    torch.manual_seed(SEED)
+    student = BertMultiHeadFocal(BASE_MODEL_NAME, NUM_ASPECTS, NUM_CLASSES, dropout=0.1,
+                                 fused=True, config=config)
+    teacher_config = teacher.bert.config
+    if config.hidden_size != teacher_config.hidden_size:
+        print("⚠️  hidden farklı: öğrenci rastgele başlatıldı")
+        return student
+
+    # Öğretmen katmanlarından eşit aralıklı seçim (ilk ve son katman dahil)
+    n_t, n_s = teacher_config.num_hidden_layers, config.num_hidden_layers
+    secilen = [round(i * (n_t - 1) / max(1, n_s - 1)) for i in range(n_s)]
+    state = {}
+    for key, value in teacher.state_dict().items():
+        if key.startswith("bert.encoder.layer."):
+            layer, rest = key[len("bert.encoder.layer."):].split(".", 1)
+            if int(layer) not in secilen:
+                continue
+            key = f"bert.encoder.layer.{secilen.index(int(layer))}.{rest}"
+        state[key] = value
+    student.load_state_dict(state)
+    print(f"✅ Öğrenci öğretmen katmanları {secilen} ile başlatıldı")
+    return student
+
+def focal_loss(logits, targets):
+    """model1egitim.ipynb'deki FocalLoss (alpha=1); gold'u olmayan satırlar (-100) atlanır"""
+    ce = F.cross_entropy(logits, targets, reduction="none", ignore_index=-100)
+    mask = targets != -100
+    if not mask.any():
+        return logits.sum() * 0
+    ce = ce[mask]
+    return ((1 - torch.exp(-ce)) ** FOCAL_GAMMA * ce).mean()
+
+def distill_loss(student_logits, teacher_logits_, golds):
+    s = student_logits.reshape(-1, NUM_CLASSES)
+    t = teacher_logits_.reshape(-1, NUM_CLASSES)
+    kd = F.kl_div(F.log_softmax(s / TEMPERATURE, dim=-1), F.softmax(t / TEMPERATURE, dim=-1),
+                  reduction="batchmean") * TEMPERATURE ** 2
+    return ALPHA * kd + (1 - ALPHA) * focal_loss(s, golds.reshape(-1))
+
+def train_student(student, tokenizer, texts, golds, soft, epochs):
+    gold_tensor = torch.tensor([g if g is not None else [-100] * NUM_ASPECTS for g in golds],
+                               dtype=torch.long)
+    chunk_sizes = [min(CHUNK_SIZE, len(texts) - c) for c in range(0, len(texts), CHUNK_SIZE)]
+    steps = epochs * sum((n + BATCH_SIZE - 1) // BATCH_SIZE for n in chunk_sizes)
+    warmup = max(1, int(steps * WARMUP_RATIO))
+    opt = torch.optim.AdamW(student.parameters(), lr=LR, weight_decay=WEIGHT_DECAY)
+    sched = torch.optim.lr_scheduler.LambdaLR(
+        opt, lambda step: min((step + 1) / warmup, max(0.0, (steps - step) / max(1, steps - warmup))))
+
+    rng = random.Random(SEED)
+    student.train()
+    step = 0
+    for epoch in range(epochs):
+        order = list(range(len(texts)))
+        rng.shuffle(order)
+        start = time.perf_counter()
+        total = 0.0
+        # Karışık parçalar içinde uzunluğa göre kovala: padding az, batch sırası rastgele
+        batches = []
+        for c in range(0, len(order), CHUNK_SIZE):
+            chunk = order[c:c + CHUNK_SIZE]
+            for idx, input_ids, attention_mask in length_buckets(
+                    tokenizer, [texts[i] for i in chunk], BATCH_SIZE):
+                batches.append(([chunk[i] for i in idx], input_ids, attention_mask))
+        rng.shuffle(batches)
+
+        for idx, input_ids, attention_mask in batches:
+            logits = student(input_ids, attention_mask)["logits"]
+            loss = distill_loss(logits, soft[idx], gold_tensor[idx])
+            opt.zero_grad()
+            loss.backward()
+            torch.nn.utils.clip_grad_norm_(student.parameters(), 1.0)
+            opt.step()
+            sched.step()
+            total += loss.item()
+            step += 1
+        print(f"   📊 epoch {epoch + 1}/{epochs} | kayıp {total / len(batches):.4f} | "
+              f"{time.perf_counter() - start:.0f} sn")
+    student.eval()
+    return student
+
+def save_student(student, tokenizer, report):
+    state = {k: v.contiguous() for k, v in student.state_dict().items()}
+    save_file(state, os.path.join(STUDENT_DIR, "model.safetensors"))
+    student.bert.config.save_pretrained(STUDENT_DIR)
+    tokenizer.save_pretrained(STUDENT_DIR)
+    with open(os.path.join(STUDENT_DIR, "distill_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+# ============================================
+# KARŞILAŞTIRMA
+# ============================================
+def accuracy(preds, golds):
+    """25 aspect x tüm yorumlar üzerinde tam sınıf doğruluğu"""
+    total = sum(len(g) for g in golds)
+    return sum(p == g for pr, gr in zip(preds, golds) for p, g in zip(pr, gr)) / total
+
+def throughput(model, tokenizer, texts):
+    """CPU yorum/sn (api_server ile aynı kova boyutu, ısınma sonrası)"""
+    predict_logits(model, tokenizer, texts[:32])
+    start = time.perf_counter()
+    predict_logits(model, tokenizer, texts)
+    return len(texts) / (time.perf_counter() - start)
+
+def evaluate(name, model, tokenizer, texts, golds, teacher_preds=None, logits=None):
+    if logits is None:
+        logits = predict_logits(model, tokenizer, texts)
+    preds = logits.argmax(-1).tolist()
+    row = {
+        "model": name,
+        "katman": model.bert.config.num_hidden_layers,
+        "hidden": model.bert.config.hidden_size,
+        "parametre_m": round(sum(p.numel() for p in model.parameters()) / 1e6, 1),
+        "presence": presence_scores(preds, golds),
+        "accuracy": accuracy(preds, golds),
+        "ogretmen_uyumu": accuracy(preds, teacher_preds) if teacher_preds is not None else 1.0,
+        "yorum_sn": round(throughput(model, tokenizer, texts[:HIZ_ORNEK]), 1),
+    }
+    return row, preds
+
+def main():
+    parser = argparse.ArgumentParser(description="Öğretmen logit'leriyle küçük öğrenci model eğitimi")
+    parser.add_argument("--layers", type=int, default=STUDENT_LAYERS, help="öğrenci katman sayısı")
+    parser.add_argument("--hidden", type=int, default=None, help="öğrenci hidden (varsayılan: öğretmenle aynı)")
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--extra", nargs="*", default=[], help="etiketsiz yorumlar (csv/jsonl, 'yorum' alanı)")
+    args = parser.parse_args()
+
+    if not os.path.exists(CHECKPOINT_DIR):
+        print(f"❌ HATA: {CHECKPOINT_DIR} bulunamadı!")
+        return
+    os.makedirs(STUDENT_DIR, exist_ok=True)
+
+    train_texts, train_golds, eval_texts, eval_golds = load_data(args.extra)
+    print(f"📊 Eğitim: {len(train_texts)} yorum ({sum(g is None for g in train_golds)} etiketsiz) | "
+          f"Değerlendirme: {EVAL_FILE} ({len(eval_texts)} yorum)\n")
+
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    teacher = load_model(CHECKPOINT_DIR, "cpu")
+    # Eval fold'u da aynı önbelleğe girer (sonda); öğretmen tahminleri tekrar hesaplanmaz
+    logits = teacher_logits(teacher, tokenizer, train_texts + eval_texts)
+    soft, eval_logits = logits[:len(train_texts)], logits[len(train_texts):]
+
+    config = student_config(load_base_config(CHECKPOINT_DIR), args.layers,
+                            args.hidden or teacher.bert.config.hidden_size)
+    student = build_student(teacher, config)
+    print(f"🔄 Öğrenci eğitiliyor: {config.num_hidden_layers} katman x {config.hidden_size} hidden, "
+          f"{args.epochs} epoch")
+    student = train_student(student, tokenizer, train_texts, train_golds, soft, args.epochs)
+
+    print("\n⏱️  Karşılaştırma (CPU)...")
+    teacher_row, teacher_preds = evaluate("teacher", teacher, tokenizer, eval_texts, eval_golds,
+                                          logits=eval_logits)
+    student_row, _ = evaluate("student", student, tokenizer, eval_texts, eval_golds, teacher_preds)
+
+    print(f"\n{'model':>8} | {'katman':>6} | {'hidden':>6} | {'param':>6} | {'presence-F1':>11} | "
+          f"{'accuracy':>8} | {'uyum':>6} | {'yorum/sn':>8}")
+    print("-" * 82)
+    for row in (teacher_row, student_row):
+        print(f"{row['model']:>8} | {row['katman']:>6} | {row['hidden']:>6} | {row['parametre_m']:5.1f}M | "
+              f"{row['presence']['f1']:11.4f} | {row['accuracy']:8.4f} | {row['ogretmen_uyumu']:6.4f} | "
+              f"{row['yorum_sn']:8.1f}")
+    print(f"\n   Hızlanma: {student_row['yorum_sn'] / teacher_row['yorum_sn']:.2f}x | "
+          f"presence-F1 farkı: {student_row['presence']['f1'] - teacher_row['presence']['f1']:+.4f}")
+
+    report = {
+        "teacher": CHECKPOINT_DIR,
+        "teacher_tag": checkpoint_tag(CHECKPOINT_DIR),
+        "eval_file": EVAL_FILE,
+        "n_train": len(train_texts),
+        "epochs": args.epochs,
+        "temperature": TEMPERATURE,
+        "alpha": ALPHA,
+        "torch_threads": torch.get_num_threads(),
+        "sonuclar": [teacher_row, student_row],
+    }
+    save_student(student, tokenizer, report)
+    print(f"\n✅ Öğrenci kaydedildi: {STUDENT_DIR}")
+    print("   Servis için: ASPECT_MODEL=student python api_server.py")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Aspect API Yük Testi
+Çalışan api_server.py'ye farklı eşzamanlılık seviyelerinde istemcilerle
+/predict_batch istekleri gönderir; p50/p95/p99 gecikme, istek/sn ve
+durum kodlarını (ör. 503 geri basınç) raporlar.
+
+Kullanım:
+    Terminal 1: python api_server.py
+    Terminal 2: python load_test.py
+"""
+
+import glob
+import json
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# ============================================
+# AYARLAR
+# ============================================
+API_URL = "http://localhost:8000"
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+ESZAMANLILIK = [1, 4, 16, 64]   # eşzamanlı istemci sayıları
+SURE = 20                        # her seviye için saniye
+YORUM_PER_ISTEK = (10, 50)       # her istekteki yorum sayısı aralığı
+SEED = 42
+
+def load_texts():
+    texts = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                texts.append(json.loads(line)["yorum"])
+    return texts
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+def client(texts, deadline, seed, latencies, codes, lock):
+    rng = random.Random(seed)
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        n = rng.randint(*YORUM_PER_ISTEK)
+        batch = rng.sample(texts, n)
+        start = time.perf_counter()
+        try:
+            r = session.post(f"{API_URL}/predict_batch", json={"texts": batch}, timeout=120)
+            code = r.status_code
+        except Exception:
+            code = "hata"
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            codes[code] += 1
+            if code == 200:
+                latencies.append((elapsed, n))
+        if code == 503:
+            time.sleep(float(r.headers.get("Retry-After", 1)))
+
+def run_level(texts, concurrency, sure=SURE):
+    """Bir eşzamanlılık seviyesini çalıştırır, ölçümleri dict olarak döndürür"""
+    latencies = []
+    codes = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + sure
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex:
+        for i in range(concurrency):
+            ex.submit(client, texts, deadline, SEED + i, latencies, codes, lock)
+    wall = time.perf_counter() - start
+
+    ms = sorted(l for l, _ in latencies)
+    return {
+        "concurrency": concurrency,
+        "req_per_s": len(ms) / wall,
+        "reviews_per_s": sum(n for _, n in latencies) / wall,
+        "p50": percentile(ms, 50),
+        "p95": percentile(ms, 95),
+        "p99": percentile(ms, 99),
+        "codes": dict(codes),
+    }
+
+def print_header():
+    print(f"{'conc':>5} | {'istek/sn':>7} | {'yorum/sn':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | durum kodları")
+    print("-" * 80)
+
+def print_row(r):
+    print(f"{r['concurrency']:>5} | {r['req_per_s']:7.1f} | {r['reviews_per_s']:8.1f} | "
+          f"{r['p50']:8.1f} | {r['p95']:8.1f} | {r['p99']:8.1f} | {r['codes']}")
+
+def main():
+    try:
+        ready = requests.get(f"{API_URL}/ready", timeout=5).status_code == 200
+    except Exception:
+        print("❌ API çalışmıyor! Önce: python api_server.py")
+        return
+    if not ready:
+        print("⚠️  Model henüz yüklenmedi (/ready 503), biraz sonra tekrar deneyin.")
+        return
+
+    texts = load_texts()
+    print(f"📊 {len(texts)} yorum havuzu | her seviye {SURE} sn\n")
+    print_header()
+    for c in ESZAMANLILIK:
+        print_row(run_level(texts, c))
+
+    stats = requests.get(f"{API_URL}/stats", timeout=5).json()
+    print(f"\n📈 /stats: ort. batch {stats['avg_batch_size']} | reddedilen {stats['rejected']}")
+
+if __name__ == "__main__":
+    main()
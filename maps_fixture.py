@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Yerel Google Maps Fixture Sitesi - kazıyıcıları ağsız/deterministik ölçmek için
+Kazıyıcıların kullandığı sayfa yapısını taklit eder (aynı seçiciler):
+- Çerez onayı: CONSENT çerezi yoksa her sayfa onay ekranı döner ("Kabul et")
+- /maps/search/<otel>: a.hfpxzc sonuç linkleri
+- /maps/place/<otel>: "Yorumlar" butonu, "En alakalı" -> "En yeni" sıralama,
+  div.m6QErb.DxyBCb.kA9KIf.dS8AEf kaydırma alanı; aşağı kaydırdıkça
+  div.jftiEf yorumları 10'ar 10'ar yüklenir (yüklenirken div.qjESne spinner,
+  span.wiI7pd metin, span.rsqdSd tarih, span.kvMYJc[aria-label="4 yıldız"] puan,
+  uzun yorumlarda "Daha fazla" butonu)
+- Yorumlar sayfaya gömülü gelmez: sayfa her 10'luk parçayı
+  /maps/rpc/listugcposts?otel=..&sira=yeni|alakali&sayfa=N adresinden çeker
+  (Maps'teki gibi ")]}'" önekli iç içe dizi JSON, bkz. rpc_payload) ve DOM'u
+  bu yanıttan çizer. KAYIT_DIR verilirse "yeni" sıralı parçalar oradaki kayıtlı
+  yanıtlardan (<otel>_<N>.txt, otel_pipeline AG_KAYIT_DIR ile kaydedilir) okunur
+- Görsel/font yükü: harita karoları (/maps/vt/...png), yorumcu avatarları ve
+  bir web fontu; ENGELLENEN_KAYNAKLAR ile engellenince aktarılan bayt düşer
+Yorumlar otel adından türetilir (aynı ad -> aynı yorumlar), beklenen çıktı
+reviews_for() ile alınır.
+
+Kullanım:
+    server, maps_url = start()          # arka plan thread'i, boş port
+    otel_pipeline.MAPS_URL = maps_url   # "http://127.0.0.1:<port>/maps"
+    python maps_fixture.py --port 8765  # elle gezmek için
+    python maps_fixture.py --kayit maps_kayit   # kayıtlı RPC yanıtlarını oynatır
+"""
+
+import argparse
+import html
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote_plus, urlsplit
+
+# ============================================
+# AYARLAR
+# ============================================
+GECIKME_MS = 0                 # her yanıta eklenen gecikme (ağ benzetimi)
+YUKLEME_MS = 150               # yorum paneli / sıralama / kaydırma sonrası yükleme süresi
+PARCA = 10                     # her yüklemede gelen yorum
+KISA_LIMIT = 80                # bundan uzun yorumlar "Daha fazla" ile açılır
+KAYIT_DIR = None               # kayıtlı RPC yanıtları klasörü (None -> yanıtlar üretilir)
+KARO_SAYISI = 6                # sayfa başına harita karosu
+KARO_BAYT = 120_000
+AVATAR_BAYT = 6_000
+FONT_BAYT = 80_000
+
+IFADELER = [
+    "Oda temiz ve genişti", "kahvaltı çok çeşitliydi", "personel güler yüzlüydü",
+    "havuz kalabalıktı", "wifi sürekli koptu", "konumu merkeze çok yakın",
+    "fiyatına göre gayet iyi", "klima çalışmıyordu", "yataklar rahattı",
+    "gece çok gürültü vardı", "plaj tertemizdi", "resepsiyonda uzun süre bekledik",
+    "manzara harikaydı", "otopark yetersiz", "akşam yemekleri lezzetliydi",
+]
+TARIHLER = [("2 gün önce", 2), ("bir hafta önce", 7), ("3 hafta önce", 21),
+            ("bir ay önce", 30), ("5 ay önce", 150), ("bir yıl önce", 365)]
+
+# ============================================
+# VERİ
+# ============================================
+def reviews_for(otel_adi):
+    """Otelin tüm yorumları, "En yeni" sırasıyla -> [{"yorum", "tarih", "puan"}, ...]"""
+    r = random.Random(otel_adi)
+    out = []
+    for i in range(r.randint(25, 85)):
+        cumleler = r.sample(IFADELER, r.randint(1, 5))
+        tarih, gun = r.choice(TARIHLER)
+        out.append({"yorum": ", ".join(cumleler) + ".", "tarih": tarih, "puan": r.randint(1, 5),
+                    "gun": gun, "i": i})
+    out.sort(key=lambda y: (y["gun"], y["i"]))
+    return [{"id": f"r{y['i']}", "yorum": y["yorum"], "tarih": y["tarih"], "puan": y["puan"]} for y in out]
+
+def rpc_payload(otel_adi, sira, sayfa):
+    """
+    Bir yorum parçası, Maps listugcposts yanıtı biçiminde:
+    ")]}'\n" + [null, sonraki_sayfa_anahtarı|null, [[yorum], ...]]
+    yorum[0] id, yorum[1][6] göreli tarih, yorum[2][0][0] puan, yorum[2][15][0][0] metin
+    Alan konumları otel_pipeline.RPC_* ile aynı varsayımdır, gerçek bir yanıtla
+    doğrulanmadı: bu fixture kayıt/oynatma zincirini test eder, Maps biçimini değil.
+    """
+    if KAYIT_DIR and sira == "yeni":
+        path = os.path.join(KAYIT_DIR, f"{kayit_adi(otel_adi)}_{sayfa}.txt")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return f.read()
+    ys = reviews_for(otel_adi)
+    if sira != "yeni":
+        ys = ys[::-1]
+    parca = ys[sayfa * PARCA:(sayfa + 1) * PARCA]
+    devam = f"s{sayfa + 1}" if (sayfa + 1) * PARCA < len(ys) else None
+    items = [[[y["id"], [None] * 6 + [y["tarih"]], [[y["puan"]]] + [None] * 14 + [[[y["yorum"]]]]]]
+             for y in parca]
+    return ")]}'\n" + json.dumps([None, devam, items], ensure_ascii=False)
+
+def kayit_adi(otel_adi):
+    # otel_pipeline._kayit_yolu ile aynı ad kuralı
+    return re.sub(r"\W+", "_", otel_adi).strip("_")
+
+# ============================================
+# SAYFALAR
+# ============================================
+SABLON = """<!doctype html><html lang="tr"><head><meta charset="utf-8"><title>{baslik}</title>
+<style>body{{font-family:sans-serif}} .m6QErb{{height:500px;overflow-y:auto;border:1px solid #ccc}}
+.jftiEf{{padding:12px;border-bottom:1px solid #eee;min-height:60px}} #panel{{display:none}}
+@font-face{{font-family:GoogleSans;src:url(/maps/font/googlesans.woff2) format("woff2")}}
+h1,button{{font-family:GoogleSans,sans-serif}} .NBa7we{{width:36px;height:36px}}</style>
+</head><body>{govde}</body></html>"""
+
+ONAY = """<div id="onay"><h1>Google'a devam etmeden önce</h1>
+<button onclick="document.cookie='CONSENT=YES; path=/'; location.reload()">Tümünü Kabul et</button>
+<button>Tümünü reddet</button></div>"""
+
+PLACE_JS = """<script>
+const OTEL = %s, YUKLEME_MS = %d, KISA = %d;
+let sira = 'alakali', sayfa = 0, bitti = false, yukleniyor = false;
+const alan = document.getElementById('alan');
+function yorumDiv(r) {
+  // r: RPC yanıtındaki yorum dizisi (bkz. rpc_payload)
+  const y = {id: r[0], tarih: r[1][6], puan: r[2][0][0], yorum: r[2][15][0][0]};
+  const d = document.createElement('div');
+  d.className = 'jftiEf'; d.setAttribute('data-review-id', y.id);
+  const a = document.createElement('img'); a.className = 'NBa7we'; a.src = '/maps/img/avatar/' + y.id + '.png';
+  const p = document.createElement('span'); p.className = 'kvMYJc'; p.setAttribute('role', 'img');
+  p.setAttribute('aria-label', y.puan + ' yıldız'); p.textContent = '★'.repeat(y.puan);
+  const t = document.createElement('span'); t.className = 'rsqdSd'; t.textContent = y.tarih;
+  const m = document.createElement('div'); m.className = 'MyEned';
+  const s = document.createElement('span'); s.className = 'wiI7pd';
+  s.textContent = y.yorum.length > KISA ? y.yorum.slice(0, KISA) + '…' : y.yorum;
+  m.appendChild(s); d.appendChild(a); d.appendChild(p); d.appendChild(t); d.appendChild(m);
+  if (y.yorum.length > KISA) {
+    const b = document.createElement('button');
+    b.textContent = 'Daha fazla'; b.setAttribute('aria-label', 'Daha fazla');
+    b.onclick = () => { s.textContent = y.yorum; b.remove(); };
+    d.appendChild(b);
+  }
+  return d;
+}
+async function yukle() {
+  const istenen = sira;
+  const yanit = await fetch('/maps/rpc/listugcposts?otel=' + encodeURIComponent(OTEL)
+                            + '&sira=' + sira + '&sayfa=' + sayfa);
+  const metin = await yanit.text();
+  if (istenen !== sira) return;           // arada sıralama değişti
+  const veri = JSON.parse(metin.slice(metin.indexOf('\\n') + 1));
+  const sp = alan.querySelector('.qjESne'); if (sp) sp.remove();
+  for (const item of veri[2] || []) alan.appendChild(yorumDiv(item[0]));
+  sayfa++; bitti = !veri[1]; yukleniyor = false;
+}
+function bastan() {
+  alan.innerHTML = '<div>Yorumlar doğrulanmamıştır</div>';
+  sayfa = 0; bitti = false; yukleniyor = true; yukle();
+}
+alan.addEventListener('scroll', () => {
+  if (yukleniyor || bitti) return;
+  if (alan.scrollTop + alan.clientHeight >= alan.scrollHeight - 200) {
+    yukleniyor = true; setTimeout(yukle, YUKLEME_MS);
+    const sp = document.createElement('div'); sp.className = 'qjESne'; alan.appendChild(sp);
+  }
+});
+document.getElementById('yorumlar').onclick = () => {
+  document.getElementById('panel').style.display = 'block'; setTimeout(bastan, YUKLEME_MS);
+};
+document.getElementById('sirala').onclick = () => {
+  document.getElementById('menu').style.display = 'block';
+};
+document.getElementById('en-yeni').onclick = () => {
+  sira = 'yeni'; document.getElementById('menu').style.display = 'none';
+  alan.innerHTML = ''; setTimeout(bastan, YUKLEME_MS);
+};
+</script>"""
+
+def _karolar(otel):
+    # Harita karoları (gerçek Maps'te sayfanın en büyük yükü); otele göre farklı adres, önbelleğe alınmaz
+    k = zlib.crc32(otel.encode("utf-8"))
+    return "".join(f'<img src="/maps/vt/{k}_{i}.png" width="256" height="256">' for i in range(KARO_SAYISI))
+
+def search_page(otel):
+    links = "".join(f'<div><a class="hfpxzc" href="/maps/place/{html.escape(otel.replace(" ", "+"))}?hl=tr" '
+                    f'aria-label="{html.escape(otel)}{k}">{html.escape(otel)}{k}</a></div>'
+                    for k in ("", " 2", " 3"))
+    return f"<h1>Sonuçlar: {html.escape(otel)}</h1>{links}{_karolar(otel)}"
+
+def place_page(otel):
+    # Sayfadaki varsayılan sıra "En alakalı" (burada: en eski önce); "En yeni" ile reviews_for sırası.
+    # Yorumlar sayfaya gömülmez, RPC ile parça parça gelir
+    return (f"<h1>{html.escape(otel)}</h1>"
+            '<button id="yorumlar" aria-label="Yorumlar">Yorumlar</button>'
+            '<div id="panel"><button id="sirala" class="HQzyZ" aria-label="En alakalı">En alakalı</button>'
+            '<div id="menu" style="display:none"><div id="en-yeni" class="fontBodyLarge">En yeni</div></div>'
+            '<div id="alan" class="m6QErb DxyBCb kA9KIf dS8AEf"></div></div>' + _karolar(otel)
+            + PLACE_JS % (json.dumps(otel, ensure_ascii=False), YUKLEME_MS, KISA_LIMIT))
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code, body, baslik="Google Maps"):
+        data = SABLON.format(baslik=baslik, govde=body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_raw(self, data, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if GECIKME_MS:
+            time.sleep(GECIKME_MS / 1000)
+        url = urlsplit(self.path)
+        path = url.path
+        if not path.startswith("/maps"):
+            return self._send(404, "<h1>404</h1>")
+        if "CONSENT=YES" not in self.headers.get("Cookie", ""):
+            return self._send(200, ONAY, "Google'a devam etmeden önce")
+        if path == "/maps/rpc/listugcposts":
+            q = parse_qs(url.query)
+            body = rpc_payload(q["otel"][0], q.get("sira", ["alakali"])[0], int(q.get("sayfa", ["0"])[0]))
+            return self._send_raw(body.encode("utf-8"), "application/json; charset=utf-8")
+        if path.startswith("/maps/vt/") or path.startswith("/maps/img/"):
+            n = KARO_BAYT if path.startswith("/maps/vt/") else AVATAR_BAYT
+            return self._send_raw(b"\x89PNG\r\n\x1a\n" + bytes(n - 8), "image/png")
+        if path.startswith("/maps/font/"):
+            return self._send_raw(bytes(FONT_BAYT), "font/woff2")
+        parts = path.split("/", 3)            # ["", "maps", "search"|"place", otel]
+        if len(parts) == 4 and parts[2] == "search":
+            return self._send(200, search_page(unquote_plus(parts[3])))
+        if len(parts) == 4 and parts[2] == "place":
+            return self._send(200, place_page(unquote_plus(parts[3])))
+        return self._send(200, '<h1>Google Maps</h1><input id="searchboxinput">')
+
+def start(port=0, host="127.0.0.1"):
+    """Arka plan thread'inde sunucu -> (server, maps_url); kapatmak için server.shutdown()"""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}/maps"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Yerel Google Maps fixture sitesi")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--kayit", default=None, help="kayıtlı RPC yanıtları klasörü (KAYIT_DIR)")
+    args = parser.parse_args()
+    KAYIT_DIR = args.kayit
+    server, url = start(args.port)
+    print(f"🗺️  {url}  (Ctrl+C ile çık)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+BertMultiHeadFocal -> ONNX Export
+checkpoint-6000/model.safetensors ağırlıklarını ONNX grafiğine çevirir.
+25 aspect kafası tek bir Linear (hidden -> 25*22) matmul olarak export edilir
+(load_model fused=True, bkz. aspect_model.fuse_head_weights).
+
+Çalıştırma: python onnx_export.py
+Sonra:      ASPECT_BACKEND=onnx python api_server.py
+"""
+
+import os
+
+import torch
+import torch.nn as nn
+
+from aspect_model import load_model, load_tokenizer, load_onnx_session
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+ONNX_PATH = os.path.join(CHECKPOINT_DIR, "model.onnx")
+OPSET = 17
+
+KONTROL_METINLERI = [
+    "odalar temizdi personel çok ilgiliydi",
+    "kahvaltı çeşitliliği azdı, fiyatına göre pahalı",
+    "konum harika denize sıfır, havuz biraz küçük ama temiz",
+]
+
+# ============================================
+# EXPORT MODELİ
+# ============================================
+class ExportModel(nn.Module):
+    """Fused BertMultiHeadFocal'ı saran, dict yerine logits tensörü döndüren katman"""
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids, attention_mask)["logits"]
+
+def export(model, tokenizer, path):
+    wrapper = ExportModel(model).eval()
+    dummy = tokenizer(KONTROL_METINLERI, return_tensors="pt", padding=True)
+
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            (dummy["input_ids"], dummy["attention_mask"]),
+            path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "logits": {0: "batch"},
+            },
+            opset_version=OPSET,
+        )
+
+def check(model, tokenizer, path):
+    """Export edilen grafik PyTorch ile aynı argmax'ı veriyor mu?"""
+    session = load_onnx_session(path)
+    inputs = tokenizer(KONTROL_METINLERI, return_tensors="pt", padding=True)
+
+    with torch.no_grad():
+        torch_logits = model(inputs["input_ids"], inputs["attention_mask"])["logits"]
+    onnx_logits = session.run(["logits"], {
+        "input_ids": inputs["input_ids"].numpy(),
+        "attention_mask": inputs["attention_mask"].numpy()
+    })[0]
+
+    max_diff = (torch_logits - torch.from_numpy(onnx_logits)).abs().max().item()
+    same = torch.equal(torch_logits.argmax(-1), torch.from_numpy(onnx_logits).argmax(-1))
+    return max_diff, same
+
+def main():
+    if not os.path.exists(CHECKPOINT_DIR):
+        print(f"❌ HATA: {CHECKPOINT_DIR} bulunamadı!")
+        return
+
+    print("🔄 Model yükleniyor...")
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    model = load_model(CHECKPOINT_DIR, fused=True)
+
+    print(f"📦 ONNX export: {ONNX_PATH}")
+    export(model, tokenizer, ONNX_PATH)
+
+    max_diff, same = check(model, tokenizer, ONNX_PATH)
+    print(f"   Max logit farkı: {max_diff:.2e}")
+    if same:
+        print("✅ Argmax çıktıları PyTorch ile aynı!")
+    else:
+        print("❌ Argmax çıktıları farklı!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""
+Toplu Otel Analizi - otel listesindeki tüm oteller için otel_pipeline akışı
+Aşamalar sınırlı kuyruklarla bağlıdır, her aşamanın kendi eşzamanlılığı vardır:
+
+    kazıma (--scrapers tarayıcı) -> temizleme -> BERT (tek tüketici) -> Ollama (--llm istek)
+
+Yavaş kazıma, çıkarım ve özet üretimiyle örtüşür; tarayıcılar açık kalır
+(browser_pool.BrowserPool, her otelde yeniden açılıp onay verilmez). BERT aşaması kuyrukta bekleyen
+otellerin (en fazla BERT_OTEL_BATCH) yorumlarını tek /predict_batch isteğinde
+gönderir. Biten her otel DURUM_DOSYASI'na bir satır olarak yazılır; çökme ya da
+Ctrl+C sonrası aynı komut kaldığı yerden devam eder (yarım kalan oteller baştan
+işlenir, AspectStore aynı yorumu iki kez saymaz; "hata" durumundakiler tekrar
+denenir). Sonunda aşama başına iş süresi ve otel/sn raporu yazdırılır.
+
+Kullanım:
+    python otel_batch.py                                   # otellistesi.txt
+    python otel_batch.py liste.txt --scrapers 4 --llm 2 -o analizler
+    python otel_batch.py --kazima-modu hafif               # görsel/font/medya indirilmez
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+
+import otel_pipeline as op
+import scrape_wait
+from aspect_store import AspectStore
+from vericekme.otelvericekme import otel_adlarini_oku, ATLA_ILLER
+
+# ============================================
+# AYARLAR
+# ============================================
+OTEL_LISTESI = "otellistesi.txt"
+CIKTI_DIR = "analizler"
+DURUM_DOSYASI = "durum.jsonl"   # CIKTI_DIR içinde; otel başına bir satır
+MAX_YORUM = 50
+SCRAPER_SAYISI = 4
+LLM_SAYISI = 2
+KUYRUK_BOYUTU = 8               # aşamalar arası kuyruk; dolunca önceki aşama bekler
+BERT_OTEL_BATCH = 8             # BERT'e tek istekte gönderilen en fazla otel
+RAPOR_SN = 60                   # ilerleme raporu aralığı
+
+BITTI = object()                # kuyruk sonu işareti
+
+# ============================================
+# AŞAMA
+# ============================================
+class Stage:
+    """
+    Girdi kuyruğundan okuyup fn ile işleyen worker thread'leri.
+    batch > 1 ise fn liste alır: ilk öğe beklenir, kuyrukta hazır olanlar
+    (en fazla batch) beklemeden eklenir. fn'in None döndürdüğü öğeler sonraki
+    aşamaya geçmez. Son worker bitince çıkış kuyruğuna BITTI koyulur.
+    """
+    def __init__(self, name, fn, workers, inq, outq=None, batch=1, on_error=None):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.inq = inq
+        self.outq = outq
+        self.batch = batch
+        self.on_error = on_error
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0              # worker'ların iş üzerinde geçirdiği toplam süre
+        self.start_time = None
+        self.end_time = None
+        self._remaining = workers
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self._threads = [threading.Thread(target=self._run, name=f"{self.name}-{k}", daemon=True)
+                         for k in range(self.workers)]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def join(self):
+        for t in self._threads:
+            t.join()
+
+    def _take(self):
+        """-> öğe listesi ya da None (kuyruk bitti)"""
+        item = self.inq.get()
+        if item is BITTI:
+            self.inq.put(BITTI)      # aynı aşamadaki diğer worker'lar da görsün
+            return None
+        items = [item]
+        while len(items) < self.batch:
+            try:
+                item = self.inq.get_nowait()
+            except queue.Empty:
+                break
+            if item is BITTI:
+                self.inq.put(BITTI)
+                break
+            items.append(item)
+        return items
+
+    def _run(self):
+        try:
+            while True:
+                items = self._take()
+                if items is None:
+                    break
+                t0 = time.perf_counter()
+                try:
+                    outs = self.fn(items) if self.batch > 1 else [self.fn(items[0])]
+                except Exception as e:
+                    outs = []
+                    print(f"❌ [{self.name}] {e}")
+                    with self._lock:
+                        self.errors += len(items)
+                    if self.on_error:
+                        for item in items:
+                            self.on_error(item, e)
+                with self._lock:
+                    self.busy += time.perf_counter() - t0
+                    self.items += len(items)
+                for out in outs:
+                    if out is not None and self.outq is not None:
+                        self.outq.put(out)
+        finally:
+            # Worker beklenmedik şekilde ölse de sonraki aşama kilitlenmesin
+            with self._lock:
+                self._remaining -= 1
+                last = self._remaining == 0
+            if last:
+                self.end_time = time.perf_counter()
+                if self.outq is not None:
+                    self.outq.put(BITTI)
+
+# ============================================
+# DURUM (CHECKPOINT)
+# ============================================
+class Checkpoint:
+    """Biten oteller JSONL'e eklenir; her satır yazıldığı anda diske gider"""
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.done = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue     # çökmede yarım kalmış son satır
+                    self.done[rec["otel"]] = rec["durum"]
+        self._f = open(path, "a", encoding="utf-8")
+
+    def completed(self, otel):
+        return self.done.get(otel) in ("ok", "yorum_yok")
+
+    def mark(self, otel, durum, **extra):
+        rec = {"otel": otel, "durum": durum, "zaman": time.time(), **extra}
+        with self._lock:
+            self.done[otel] = durum
+            self._f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self):
+        self._f.close()
+
+# ============================================
+# PIPELINE
+# ============================================
+class BatchPipeline:
+    def __init__(self, out_dir, max_yorum=MAX_YORUM, ollama_ok=False):
+        self.out_dir = out_dir
+        self.max_yorum = max_yorum
+        self.ollama_ok = ollama_ok
+        self.checkpoint = Checkpoint(os.path.join(out_dir, DURUM_DOSYASI))
+        self.store = (AspectStore(op.ASPECT_STORE_DB, op.PENCERE_GUN, op.YARI_OMUR_GUN)
+                      if op.ASPECT_STORE_DB else None)
+
+    def fail(self, item, e):
+        otel = item if isinstance(item, str) else item["otel"]   # kazıma aşamasında öğe otel adı
+        self.checkpoint.mark(otel, "hata", hata=str(e))
+
+    # 1. Kazıma
+    def scrape(self, otel):
+        raw = op.scrape_reviews(otel, max_yorum=self.max_yorum)
+        if not raw:
+            self.checkpoint.mark(otel, "yorum_yok")
+            return None
+        return {"otel": otel, "raw": raw}
+
+    # 2. Temizleme
+    def clean(self, item):
+        yorumlar, zamanlar = op.clean_reviews(item.pop("raw"))
+        if not yorumlar:
+            self.checkpoint.mark(item["otel"], "yorum_yok")
+            return None
+        item["yorumlar"], item["zamanlar"] = yorumlar, zamanlar
+        return item
+
+    # 3. BERT: birden çok otelin yorumları tek istekte
+    def score(self, items):
+        texts = [y for item in items for y in item["yorumlar"]]
+        result = op.predict_batch(texts)
+        if result is None:
+            raise RuntimeError(f"API yanıt vermedi ({len(items)} otel, {len(texts)} yorum)")
+        predictions, confidences = result
+        s = 0
+        for item in items:
+            e = s + len(item["yorumlar"])
+            item["ozetler"] = op.build_summaries(item["otel"], item["yorumlar"], item["zamanlar"],
+                                                 predictions[s:e], confidences[s:e], self.store)
+            s = e
+        return items
+
+    # 4. Ollama + dosya
+    def summarize(self, item):
+        otel, ozetler = item["otel"], item["ozetler"]
+        llama_result = op.generate_summary(otel, ozetler[op.OZET_MODU]) if self.ollama_ok else None
+        path = os.path.join(self.out_dir, op.output_filename(otel))
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(op.build_output(otel, len(item["yorumlar"]), ozetler, llama_result),
+                      f, ensure_ascii=False, indent=2)
+        self.checkpoint.mark(otel, "ok", dosya=os.path.basename(path),
+                             yorum=len(item["yorumlar"]), ozet=bool(llama_result and llama_result.get("success")))
+
+    def run(self, oteller, scrapers=SCRAPER_SAYISI, llm=LLM_SAYISI):
+        q_otel, q_raw, q_clean, q_scored = (queue.Queue(maxsize=KUYRUK_BOYUTU) for _ in range(4))
+        stages = [
+            Stage("kazıma", self.scrape, scrapers, q_otel, q_raw, on_error=self.fail),
+            Stage("temizleme", self.clean, 1, q_raw, q_clean, on_error=self.fail),
+            Stage("bert", self.score, 1, q_clean, q_scored, batch=BERT_OTEL_BATCH, on_error=self.fail),
+            Stage("ollama", self.summarize, llm, q_scored, on_error=self.fail),
+        ]
+        start = time.perf_counter()
+        for stage in stages:
+            stage.start()
+
+        # Besleyici: kuyruk dolunca bekler; ara ara ilerleme yazar
+        son_rapor = start
+        try:
+            for otel in oteller:
+                q_otel.put(otel)
+                if time.perf_counter() - son_rapor > RAPOR_SN:
+                    son_rapor = time.perf_counter()
+                    print("📊 " + " | ".join(f"{s.name}: {s.items}" for s in stages))
+            q_otel.put(BITTI)
+            for stage in stages:
+                stage.join()
+        finally:
+            if self.store is not None:
+                self.store.close()
+            self.checkpoint.close()
+        return stages, time.perf_counter() - start
+
+def print_report(stages, elapsed):
+    print(f"\n{'aşama':>10} | {'worker':>6} | {'otel':>6} | {'hata':>5} | {'iş süresi':>9} | "
+          f"{'sn/otel':>8} | {'otel/sn':>8}")
+    print("-" * 72)
+    for s in stages:
+        per_item = s.busy / s.items if s.items else 0.0
+        # Aşamanın tek başına kapasitesi: worker sayısı / otel başına süre
+        capacity = s.workers / per_item if per_item else 0.0
+        print(f"{s.name:>10} | {s.workers:>6} | {s.items:>6} | {s.errors:>5} | {s.busy:8.1f}s | "
+              f"{per_item:8.2f} | {capacity:8.3f}")
+    done = stages[-1].items - stages[-1].errors
+    print(f"\n✅ {done} otel analiz edildi | toplam {elapsed:.1f} sn ({done / elapsed:.3f} otel/sn)")
+
+# ============================================
+# MAIN
+# ============================================
+def main():
+    parser = argparse.ArgumentParser(description="Otel listesi için toplu analiz")
+    parser.add_argument("liste", nargs="?", default=OTEL_LISTESI)
+    parser.add_argument("-o", "--out", default=CIKTI_DIR, help="analiz JSON'ları ve durum dosyası")
+    parser.add_argument("--scrapers", type=int, default=SCRAPER_SAYISI, help="aynı anda açık tarayıcı")
+    parser.add_argument("--llm", type=int, default=LLM_SAYISI, help="aynı anda Ollama isteği")
+    parser.add_argument("--max-yorum", type=int, default=MAX_YORUM)
+    parser.add_argument("--limit", type=int, default=0, help="sadece ilk N otel (0 = hepsi)")
+    parser.add_argument("--filtre", default=None, help="atlanacak satırlar (TXT)")
+    parser.add_argument("--atla-il", nargs="*", default=list(ATLA_ILLER), help="bu illerdeki oteller atlanır")
+    # "ag" (yorumlar RPC yanıtlarından) gerçek bir listugcposts kaydıyla doğrulanana
+    # kadar seçenek değil; bkz. otel_pipeline RPC_* ve bench_fetch.py
+    parser.add_argument("--kazima-modu", choices=["dom", "hafif"],
+                        default=op.SCRAPE_MODU if op.SCRAPE_MODU in ("dom", "hafif") else "dom",
+                        help="dom: tam sayfa | hafif: görsel/font/medya engelli")
+    args = parser.parse_args()
+    op.SCRAPE_MODU = args.kazima_modu
+
+    # Satırlar "Otel, ilçe, il": aramaya ve dosya adlarına sadece otel adı gider
+    oteller = list(dict.fromkeys(otel_adlarini_oku(args.liste, args.filtre, args.atla_il)))
+    if args.limit:
+        oteller = oteller[:args.limit]
+
+    print("🔌 BERT API kontrol ediliyor...")
+    if not op.check_api():
+        print("❌ API çalışmıyor veya model yüklenemedi! Önce: python api_server.py")
+        return
+    ollama_ok = op.OLLAMA_AVAILABLE and op.check_ollama()
+    if not ollama_ok:
+        print("⚠️  Ollama çalışmıyor! Özet üretilmeyecek.")
+
+    os.makedirs(args.out, exist_ok=True)
+    pipeline = BatchPipeline(args.out, args.max_yorum, ollama_ok)
+    kalan = [o for o in oteller if not pipeline.checkpoint.completed(o)]
+    print(f"🏨 {len(oteller)} otel | {len(oteller) - len(kalan)} tamamlanmış, {len(kalan)} kaldı | "
+          f"{args.scrapers} tarayıcı, 1 BERT, {args.llm} Ollama\n")
+    if not kalan:
+        pipeline.checkpoint.close()
+        return
+
+    # Tarayıcılar önceden açılıp ısıtılır; kazıma worker'ları havuzdan sıcak oturum alır
+    pool = op.get_pool(args.scrapers)
+    print(f"🌐 {args.scrapers} tarayıcı açılıyor...")
+    pool.start()
+    stages, elapsed = pipeline.run(kalan, args.scrapers, args.llm)
+    print_report(stages, elapsed)
+    st = pool.stats
+    print(f"🌐 Tarayıcı: {st['acilan']} açılış ({st['acilis_sn'] / max(st['acilan'], 1):.1f} sn/açılış), "
+          f"{st['is']} iş, {st['yenilenen']} yenileme, {st['hata']} hata")
+    adimlar = scrape_wait.report()
+    if adimlar:
+        print("⏱️  Kazıma adımları: " + " | ".join(
+            f"{k} {r['ort_sn']:.2f}s" + (f" ({r['zaman_asimi']} zaman aşımı)" if r["zaman_asimi"] else "")
+            for k, r in adimlar.items()))
+    ag = op.ag_istatistik
+    if pool.perf_log and st["is"]:
+        print(f"📶 Ağ: otel başına {ag['bayt'] / st['is'] / 1e6:.2f} MB, "
+              f"{ag['istek'] / st['is']:.0f} istek, {ag['engellenen'] / st['is']:.0f} engellenen")
+    pool.close()
+
+if __name__ == "__main__":
+    main()
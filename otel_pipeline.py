@@ -9,22 +9,27 @@ Kullanım:
     Terminal 3: python otel_pipeline_with_ollama.py
 """
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
 import requests
+import numpy as np
+import io
 import time
-import tempfile
 import os
 import random
 import re
 import json
+import atexit
+import threading
+from urllib.parse import urlsplit
 from datetime import datetime
 from collections import defaultdict, Counter
+from aspect_aggregate import summarize, window_summary, decayed_summary, build_aspect_summary
+from aspect_store import AspectStore
+from text_clean import clean_text, MIN_TEXT_LENGTH
+from browser_pool import BrowserPool, MAX_KULLANIM
+from scrape_wait import (wait, record, clickable, any_present, replaced, grew, summary, BITTI,
+                         YUKLENIYOR_SECICI)
 
 # Ollama modülünü import et
 try:
@@ -38,155 +43,73 @@ except ImportError:
 # AYARLAR
 # ============================================
 API_URL = "http://localhost:8000"
-
-# Aspect isimleri (index 0-24)
-ASPECT_NAMES = [
-    "temizlik", "konum", "oda_kalitesi", "uyku_yatak_kalitesi", "gurultu",
-    "personel", "fiyat_performans", "yemek_kalitesi", "yemek_cesitliligi", "havuz",
-    "spa_hamam", "plaj", "cocuk_dostu", "wifi", "banyo_tuvalet",
-    "klima_isitma", "resepsiyon", "otopark", "guvenlik", "manzara",
-    "oda_servisi", "fitness_spor", "mini_bar", "balkon_teras", "aktivite_zenginligi"
-]
-
-# Neden kodları
-NEDEN_MAP = {
-    1: "yokluk",
-    2: "kalite", 
-    3: "erisim",
-    4: "servis",
-    5: "fiyat",
-    6: "olumlu_kalite",
-    7: "notr_bilgi"
-}
-
-def decode_class_id(class_id):
-    """
-    Class ID'den duygu ve neden çıkar
-    class_id = 1 + (duygu-1)*7 + (neden-1)
-    
-    Returns: (duygu, neden) veya (None, None) if class_id == 0
-    duygu: 1=olumsuz, 2=notr, 3=olumlu
-    neden: 1-7
-    """
-    if class_id == 0:
-        return None, None
-    
-    # Tersine hesapla
-    # class_id - 1 = (duygu-1)*7 + (neden-1)
-    idx = class_id - 1
-    duygu = (idx // 7) + 1  # 1, 2, 3
-    neden = (idx % 7) + 1   # 1-7
-    
-    return duygu, neden
-
-def get_top_nedenler(neden_list, top_n=2):
-    """En sık geçen nedenleri döndür"""
-    if not neden_list:
-        return [None] * top_n
-    
-    counter = Counter(neden_list)
-    most_common = counter.most_common(top_n)
-    
-    result = []
-    for i in range(top_n):
-        if i < len(most_common):
-            neden_code = most_common[i][0]
-            result.append(NEDEN_MAP.get(neden_code))
-        else:
-            result.append(None)
-    
-    return result
-
-def build_aspect_summary(predictions_list):
-    """
-    Tüm yorumların tahminlerinden aspect_summary oluştur
-    
-    predictions_list: [[0,2,16,0,...], [0,0,16,0,...], ...] 
-                      Her biri 25 elemanlı dizi
-    
-    Returns: aspect_summary dict
-    """
-    # Her aspect için istatistikleri topla
-    aspect_stats = {}
-    
-    for aspect_idx in range(25):
-        aspect_name = ASPECT_NAMES[aspect_idx]
-        
-        pozitif_count = 0
-        negatif_count = 0
-        notr_count = 0
-        
-        poz_nedenler = []
-        neg_nedenler = []
-        
-        # Tüm yorumları tara
-        for preds in predictions_list:
-            class_id = preds[aspect_idx]
-            
-            if class_id == 0:
-                continue
-            
-            duygu, neden = decode_class_id(class_id)
-            
-            if duygu == 3:  # olumlu
-                pozitif_count += 1
-                poz_nedenler.append(neden)
-            elif duygu == 1:  # olumsuz
-                negatif_count += 1
-                neg_nedenler.append(neden)
-            elif duygu == 2:  # notr
-                notr_count += 1
-        
-        # En az 1 mention varsa ekle
-        total = pozitif_count + negatif_count + notr_count
-        if total > 0:
-            poz_top = get_top_nedenler(poz_nedenler, 2)
-            neg_top = get_top_nedenler(neg_nedenler, 2)
-            
-            aspect_stats[aspect_name] = {
-                "pozitif": pozitif_count,
-                "negatif": negatif_count,
-                "notr": notr_count,
-                "poz_neden1": poz_top[0],
-                "poz_neden2": poz_top[1],
-                "neg_neden1": neg_top[0],
-                "neg_neden2": neg_top[1]
-            }
-    
-    return aspect_stats
-
-# ============================================
-# TEMİZLEME
-# ============================================
-emoji_pattern = re.compile("[" u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF" 
-    u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF" u"\U00002702-\U000027B0" 
-    u"\U000024C2-\U0001F251" "]+", flags=re.UNICODE)
-html_pattern = re.compile(r"<.*?>", flags=re.DOTALL)
-url_pattern = re.compile(r"(https?://\S+|www\.\S+)", flags=re.IGNORECASE)
-email_pattern = re.compile(r"\S+@\S+")
-phone_pattern = re.compile(r"(\+?\d[\d\s\-]{8,}\d)")
-symbol_pattern = re.compile(r"[^0-9a-zA-ZçğıöşüÇĞİÖŞÜ\s\.\,\!\?\;\:\(\)\'\"\-]")
-multi_punct = re.compile(r"([!?.,;:])\1+")
-repeat_char = re.compile(r"(\S)\1{2,}")
-
-def clean_text(text):
-    if not text: return ""
-    t = str(text).lower()
-    t = html_pattern.sub(" ", t)
-    t = emoji_pattern.sub(" ", t)
-    t = url_pattern.sub(" ", t)
-    t = email_pattern.sub(" ", t)
-    t = phone_pattern.sub(" ", t)
-    t = symbol_pattern.sub(" ", t)
-    t = repeat_char.sub(r"\1\1", t)
-    t = multi_punct.sub(r"\1", t)
-    t = re.sub(r"\s+", " ", t).strip()
-    return t
+MAPS_URL = "https://www.google.com/maps"   # bench_browser.py yerel fixture siteye çevirir
+# Tarayıcı havuzu: oturumlar açık kalır, her otel için yeniden açılıp onay verilmez
+# (bkz. browser_pool.py). Toplu modda boyut tarayıcı sayısıdır (otel_batch --scrapers)
+BROWSER_POOL_SIZE = 1
+BROWSER_MAX_USES = MAX_KULLANIM
+# Kazıma modu: "dom" (tam sayfa, yorumlar DOM'dan) | "hafif" (görsel/font/medya
+# engellenir, yorumlar DOM'dan) | "ag" (engelleme + yorumlar sayfanın yüklediği
+# RPC yanıtlarından, bkz. AgKaydi; ayrıştırılamazsa DOM'a düşer; deneysel)
+SCRAPE_MODU = os.environ.get("SCRAPE_MODU", "dom")
+AG_KAYIT_DIR = os.environ.get("SCRAPE_KAYIT_DIR")   # "ag" modunda RPC yanıtları buraya da yazılır
+API_READY_TIMEOUT = 120   # model yüklenirken /ready için en fazla bekleme (sn)
+MIN_CONFIDENCE = 0.0      # bu olasılığın altındaki aspect tahminleri özete sayılmaz
+# Otel başına birikimli özet deposu (SQLite); her çalıştırmadaki yeni yorumlar
+# eklenir, özet tüm geçmişten üretilir. Boş -> sadece bu çalıştırmanın yorumları
+ASPECT_STORE_DB = "aspect_store.db"
+PENCERE_GUN = 30          # "son N gün" özeti
+YARI_OMUR_GUN = 30        # zamanla azalan özette bir yorumun ağırlığı bu sürede yarıya iner
+# Ollama'ya giden özet: "tum" (tüm geçmiş) | "pencere" (son PENCERE_GUN gün) | "azalan"
+OZET_MODU = "tum"
 
 # ============================================
 # SCRAPER
 # ============================================
-def _try_accept_consent(driver):
+# Google Maps yorum tarihi göreli gelir ("2 hafta önce", "bir ay önce");
+# kazıma anına göre yaklaşık unix zamanına çevrilir (ay = 30, yıl = 365 gün)
+TARIH_SECICILER = ["span.rsqdSd", "span.xRkPPb"]
+tarih_pattern = re.compile(r"(\d+|bir)\s+(saniye|dakika|saat|gün|hafta|ay|yıl)\s+önce", flags=re.IGNORECASE)
+TARIH_BIRIM_SN = {"saniye": 1, "dakika": 60, "saat": 3600, "gün": 86400,
+                  "hafta": 7 * 86400, "ay": 30 * 86400, "yıl": 365 * 86400}
+
+def parse_relative_date(text, now=None):
+    """'3 ay önce' -> unix zamanı (yaklaşık); tanınmazsa None"""
+    m = tarih_pattern.search(text or "")
+    if not m:
+        return None
+    sayi = 1 if m.group(1).lower() == "bir" else int(m.group(1))
+    now = time.time() if now is None else now
+    return now - sayi * TARIH_BIRIM_SN[m.group(2).lower()]
+
+def _review_date(elem):
+    for sel in TARIH_SECICILER:
+        try:
+            txt = elem.find_element(By.CSS_SELECTOR, sel).text
+            if txt:
+                return txt
+        except:
+            continue
+    return ""
+
+# Sayfa öğeleri (bekleme koşulları bunlar üzerinden, bkz. scrape_wait.py)
+SONUC = (By.CSS_SELECTOR, "a.hfpxzc")
+YORUM_BUTONU = (By.XPATH, "//button[contains(., 'Yorum') or contains(., 'İnceleme')]")
+ONAY_BUTONU = (By.XPATH, "//button[contains(., 'Kabul')]")
+ARAMA_KUTUSU = (By.CSS_SELECTOR, "#searchboxinput")
+YORUM_SECICILER = ["div.jftiEf", "div[data-review-id]"]
+YORUM_LOC = [(By.CSS_SELECTOR, s) for s in YORUM_SECICILER]
+DAHA_FAZLA = "//button[contains(., 'Daha fazla')]"
+YENI_YORUM_TIMEOUT = 5    # kaydırma başına yeni yorum bekleme üst sınırı (sn)
+# "hafif" / "ag" modunda hiç istenmeyen kaynaklar (CDP Network.setBlockedURLs desenleri):
+# görseller, fontlar, medya, harita karoları ve kullanıcı fotoğrafları
+ENGELLENEN_KAYNAKLAR = [
+    "*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*",
+    "*.woff*", "*.ttf*", "*.otf*", "*.mp4*", "*.webm*", "*.mp3*",
+    "*/maps/vt*", "*/kh/v=*", "*googleusercontent.com/*", "*.ggpht.com/*",
+]
+
+def _try_accept_consent(driver, log=None):
     try:
         for fr in driver.find_elements(By.CSS_SELECTOR, "iframe")[:5]:
             try:
@@ -195,171 +118,375 @@ def _try_accept_consent(driver):
                 if btns:
                     driver.execute_script("arguments[0].click();", btns[0])
                     driver.switch_to.default_content()
+                    wait(driver, EC.staleness_of(fr), 5, "onay", log=log)
                     return
                 driver.switch_to.default_content()
             except:
                 driver.switch_to.default_content()
-        for btn in driver.find_elements(By.XPATH, "//button[contains(., 'Kabul')]")[:2]:
+        for btn in driver.find_elements(*ONAY_BUTONU)[:2]:
             driver.execute_script("arguments[0].click();", btn)
+            # Onay sayfası yeniden yüklenir / kapanır
+            wait(driver, EC.staleness_of(btn), 5, "onay", log=log)
             return
     except:
         pass
 
-def select_en_yeni(driver):
+def _reviews_replaced(driver, timeout, legacy_sn, log):
+    """Sıralama değişince liste yeniden çizilir: ilk yorum DOM'dan düşene kadar bekler"""
+    ilk = driver.find_elements(By.CSS_SELECTOR, ", ".join(YORUM_SECICILER))[:1]
+    def _wait():
+        if ilk:
+            wait(driver, replaced(ilk[0], *YORUM_LOC), timeout, "siralama", legacy_sn, log)
+        else:
+            wait(driver, any_present(*YORUM_LOC), timeout, "siralama", legacy_sn, log)
+    return _wait
+
+def select_en_yeni(driver, log=None):
     print("🔄 'En yeni' seçiliyor...")
     try:
         for sel in ["//button[contains(@aria-label, 'En alakalı')]", "//button[contains(@class, 'HQzyZ')]"]:
-            try:
-                btn = WebDriverWait(driver, 3).until(EC.element_to_be_clickable((By.XPATH, sel)))
+            btn = wait(driver, clickable((By.XPATH, sel)), 3, "siralama_menu", log=log)
+            if btn:
                 driver.execute_script("arguments[0].click();", btn)
-                time.sleep(1)
                 break
-            except:
-                continue
-        
+
+        yenilendi = _reviews_replaced(driver, 5, 2, log)
         for sel in ["//div[contains(text(), 'En yeni')]"]:
-            try:
-                btn = WebDriverWait(driver, 2).until(EC.element_to_be_clickable((By.XPATH, sel)))
+            btn = wait(driver, clickable((By.XPATH, sel)), 3, "siralama_menu", legacy_sn=1, log=log)
+            if btn:
                 driver.execute_script("arguments[0].click();", btn)
-                time.sleep(2)
+                yenilendi()
                 print("   ✅ 'En yeni' seçildi!")
                 return True
-            except:
-                continue
         
         for item in driver.find_elements(By.CSS_SELECTOR, "div.fontBodyLarge"):
             if "En yeni" in item.text:
                 driver.execute_script("arguments[0].click();", item)
-                time.sleep(2)
+                yenilendi()
                 return True
     except:
         pass
     return False
 
-def scrape_reviews(otel_adi, max_yorum=50):
-    print(f"\n{'='*60}")
-    print(f"🔍 '{otel_adi}' yorumları çekiliyor...")
-    print(f"{'='*60}\n")
-
-    opts = ChromeOptions()
-    opts.add_argument("--lang=tr-TR")
-    opts.add_argument("--window-size=1920,1080")
-    opts.add_argument("--disable-notifications")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    
-    profile = os.path.join(tempfile.gettempdir(), f"gm_{int(time.time())}")
-    opts.add_argument(f"--user-data-dir={profile}")
-    opts.add_argument("--disable-blink-features=AutomationControlled")
-    opts.add_experimental_option("excludeSwitches", ["enable-automation"])
-
-    driver = webdriver.Chrome(service=ChromeService(ChromeDriverManager().install()), options=opts)
-    
-    try:
-        driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
-            {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"})
-    except:
-        pass
-
-    yorumlar = []
-
+_pool = None
+_pool_lock = threading.Lock()
+
+def warmup_maps(driver):
+    """Yeni tarayıcı oturumunda bir kez: Maps ana sayfası + çerez onayı"""
+    driver.get(f"{MAPS_URL}?hl=tr")
+    wait(driver, any_present(ONAY_BUTONU, ARAMA_KUTUSU), 10, "ana_sayfa", legacy_sn=2)
+    _try_accept_consent(driver)
+
+def get_pool(size=None):
+    """Süreç genelinde paylaşılan tarayıcı havuzu (ilk çağrıda oluşturulur, çıkışta kapanır)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            u = urlsplit(MAPS_URL)
+            _pool = BrowserPool(size or BROWSER_POOL_SIZE, BROWSER_MAX_USES, warmup=warmup_maps,
+                                reset_origins=[f"{u.scheme}://{u.netloc}"],
+                                block_urls=ENGELLENEN_KAYNAKLAR if SCRAPE_MODU != "dom" else (),
+                                perf_log=SCRAPE_MODU == "ag")
+            atexit.register(_pool.close)
+        return _pool
+
+# Yorum listesi tek execute_script ile okunur (eleman başına WebDriver çağrısı yerine):
+# sayım + kaydırma yüksekliği + spinner; tam=true ise ilk maxN yorumun "Daha fazla"ları
+# açılır ve kayıtlar (id, metin, tarih, puan) tek JSON olarak döner
+YORUM_JS = r"""
+const [alan, secici, maxN, tam, spinner, tarihSec] = arguments;
+const dugumler = document.querySelectorAll(secici);
+const durum = {n: dugumler.length, h: alan.scrollHeight, yukleniyor: !!document.querySelector(spinner)};
+if (!tam) return durum;
+const sec = Array.from(dugumler).slice(0, maxN);
+let acilan = 0;
+for (const d of sec) {
+  for (const b of d.querySelectorAll('button')) {
+    if (((b.getAttribute('aria-label') || '') + b.textContent).includes('Daha fazla')) { b.click(); acilan++; }
+  }
+}
+durum.acilan = acilan;
+durum.yorumlar = sec.map(d => {
+  const metin = d.querySelector('span.wiI7pd');
+  let tarih = '';
+  for (const s of tarihSec) {
+    const e = d.querySelector(s);
+    if (e && e.innerText.trim()) { tarih = e.innerText.trim(); break; }
+  }
+  const p = d.querySelector('span.kvMYJc[aria-label], span.fzvQIb');
+  const m = p && (p.getAttribute('aria-label') || p.textContent).match(/\d+(?:[.,]\d+)?/);
+  return {id: d.getAttribute('data-review-id'), yorum: metin ? metin.innerText.trim() : '',
+          tarih: tarih, puan: m ? parseFloat(m[0].replace(',', '.')) : null};
+});
+return durum;
+"""
+KAYDIR_JS = "arguments[0].scrollTop = arguments[0].scrollHeight;"
+
+def _reviews_state(driver, scroll_div, secici, max_n=0, tam=False):
+    return driver.execute_script(YORUM_JS, scroll_div, secici, max_n, tam, YUKLENIYOR_SECICI, TARIH_SECICILER)
+
+def collect_reviews(driver, scroll_div, secici, max_n):
+    """Yüklü ilk max_n yorum -> [{"id", "yorum", "tarih", "puan"}, ...] (1-2 execute_script)"""
+    durum = _reviews_state(driver, scroll_div, secici, max_n, tam=True)
+    if durum["acilan"]:
+        # Açılan yorumların tam metni için bir kez daha (buton tıklaması DOM'u sonradan güncelleyebilir)
+        durum = _reviews_state(driver, scroll_div, secici, max_n, tam=True)
+    return [y for y in durum["yorumlar"] if y["yorum"]]
+
+def collect_reviews_reference(driver, secici, max_n):
+    """Eleman başına WebDriver çağrısıyla okuma (eski yol; bench_browser.py eşdeğerlik kontrolü)"""
+    for btn in driver.find_elements(By.XPATH, DAHA_FAZLA):
+        try: driver.execute_script("arguments[0].click();", btn)
+        except: pass
+    out = []
+    for elem in driver.find_elements(By.CSS_SELECTOR, secici)[:max_n]:
+        try:
+            txt = elem.find_element(By.CSS_SELECTOR, "span.wiI7pd").text
+            if txt and txt.strip():
+                out.append({"yorum": txt.strip(), "tarih": _review_date(elem)})
+        except:
+            pass
+    return out
+
+# Ağ modu: sayfa yorumları Maps'in iç RPC'sinden (listugcposts) ")]}'" önekli iç içe
+# dizi JSON olarak çeker; DOM bu yanıttan çizilir. Performans logundaki yanıtlar
+# CDP Network.getResponseBody ile alınıp doğrudan ayrıştırılır. Alan konumları
+# tek yerde (RPC_*): Google biçimi değiştirirse yalnız bunlar güncellenir,
+# o zamana kadar ayrıştırılamayan yanıtlar DOM okumaya düşer.
+# DİKKAT: RPC_* konumları henüz gerçek bir listugcposts yanıtıyla doğrulanmadı
+# (maps_fixture.rpc_payload da aynı varsayımla üretir). Gerçek Maps'ten
+# SCRAPE_KAYIT_DIR ile kayıt alınıp maps_fixture --kayit ile oynatılana kadar
+# "ag" otel_batch --kazima-modu seçeneği değildir
+RPC_DESENLERI = ("/listugcposts", "/listentitiesreviews")
+RPC_ID = (0,)
+RPC_TARIH = (1, 6)
+RPC_PUAN = (2, 0, 0)
+RPC_METIN = (2, 15, 0, 0)
+ag_istatistik = Counter()         # süreç geneli: bayt, istek, engellenen (perf_log'lu havuzlarda)
+
+def _rpc_alan(r, yol):
+    for i in yol:
+        r = r[i]
+    return r
+
+def parse_review_rpc(body):
+    """listugcposts yanıtı -> [{"id", "yorum", "tarih", "puan"}, ...]; tanınmayan yapı -> []"""
     try:
-        driver.get("https://www.google.com/maps?hl=tr")
-        time.sleep(2)
-        _try_accept_consent(driver)
-
-        driver.get(f"https://www.google.com/maps/search/{otel_adi.replace(' ', '+')}?hl=tr")
-        time.sleep(3)
-
+        data = json.loads(body[body.index("\n") + 1:] if body.startswith(")]}'") else body)
+        items = data[2] or []
+    except (ValueError, IndexError, TypeError):
+        return []
+    out = []
+    for item in items:
+        try:
+            r = item[0]
+            metin = _rpc_alan(r, RPC_METIN)
+        except (IndexError, TypeError):
+            continue              # metinsiz (sadece puan) yorum
+        if not isinstance(metin, str) or not metin.strip():
+            continue
+        try:
+            tarih = _rpc_alan(r, RPC_TARIH) or ""
+        except (IndexError, TypeError):
+            tarih = ""
+        try:
+            puan = _rpc_alan(r, RPC_PUAN)
+        except (IndexError, TypeError):
+            puan = None
+        if isinstance(puan, bool) or not isinstance(puan, (int, float)):
+            puan = None
+        out.append({"id": _rpc_alan(r, RPC_ID), "yorum": metin.strip(), "tarih": tarih, "puan": puan})
+    return out
+
+def _kayit_yolu(kayit_dir, otel_adi, n):
+    # maps_fixture.kayit_adi ile aynı ad kuralı (kayıtlar fixture'da oynatılır)
+    ad = re.sub(r"\W+", "_", otel_adi).strip("_")
+    return os.path.join(kayit_dir, f"{ad}_{n}.txt")
+
+class AgKaydi:
+    """Bir otel işinin ağ olayları (performans logu): aktarılan bayt, engellenen istek, yorum RPC'leri"""
+    def __init__(self, driver):
+        self.driver = driver
+        self.bayt = 0
+        self.istek = 0
+        self.engellenen = 0
+        self.rpc = []             # yorum RPC yanıtlarının requestId'leri, geliş sırasıyla
+        driver.get_log("performance")   # önceki işten / ısınmadan kalan olaylar sayılmaz
+
+    def oku(self):
+        for entry in self.driver.get_log("performance"):
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+            if method == "Network.loadingFinished":
+                self.bayt += params.get("encodedDataLength", 0)
+                self.istek += 1
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                self.engellenen += 1
+            elif method == "Network.responseReceived":
+                if any(d in params["response"]["url"] for d in RPC_DESENLERI):
+                    self.rpc.append(params["requestId"])
+
+    def yorumlar(self, max_n, otel_adi=None, kayit_dir=None):
+        """Yakalanan RPC yanıtlarındaki ilk max_n yorum; kayit_dir verilirse gövdeler de yazılır"""
+        out, gorulen = [], set()
+        for n, rid in enumerate(self.rpc):
+            try:
+                body = self.driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": rid})["body"]
+            except Exception:
+                continue          # gövde tarayıcı belleğinden düşmüş
+            if kayit_dir:
+                os.makedirs(kayit_dir, exist_ok=True)
+                with open(_kayit_yolu(kayit_dir, otel_adi, n), "w", encoding="utf-8") as f:
+                    f.write(body)
+            for y in parse_review_rpc(body):
+                if y["id"] not in gorulen:
+                    gorulen.add(y["id"])
+                    out.append(y)
+        return out[:max_n]
+
+    def kaydet(self):
+        with _pool_lock:
+            ag_istatistik["bayt"] += self.bayt
+            ag_istatistik["istek"] += self.istek
+            ag_istatistik["engellenen"] += self.engellenen
+
+def _open_reviews(driver, otel_adi, log, ag=None):
+    """Arama -> otel sayfası -> Yorumlar -> "En yeni" -> (scroll alanı, yorum seçici) ya da None"""
+    driver.get(f"{MAPS_URL}/search/{otel_adi.replace(' ', '+')}?hl=tr")
+    # Arama sonuçları listesi ya da (tek sonuçta) doğrudan otel sayfası
+    sayfa = wait(driver, any_present(SONUC, YORUM_BUTONU), 10, "arama", legacy_sn=3, log=log)
+
+    tiklandi = False
+    if sayfa and sayfa[0] == 0:
         try:
-            results = driver.find_elements(By.CSS_SELECTOR, "a.hfpxzc")
-            if results:
-                results[0].click()
-                time.sleep(3)
+            sayfa[1][0].click()
+            tiklandi = True
         except:
             pass
 
+    btn = wait(driver, clickable(YORUM_BUTONU), 10 if tiklandi else 5, "otel_sayfasi",
+               legacy_sn=3 if tiklandi else 0, log=log)
+    if btn:
         try:
-            btn = WebDriverWait(driver, 5).until(
-                EC.element_to_be_clickable((By.XPATH, "//button[contains(., 'Yorum') or contains(., 'İnceleme')]")))
             btn.click()
-            time.sleep(3)
+            wait(driver, any_present(*YORUM_LOC), 10, "yorumlar", legacy_sn=3, log=log)
         except:
             pass
 
-        select_en_yeni(driver)
+    if ag is not None:
+        # "En alakalı" sıralı ilk parça: sıralama değişirse atılır
+        ag.oku()
+        onceki, ag.rpc = ag.rpc, []
+    sirali = select_en_yeni(driver, log=log)
+    if ag is not None and not sirali:
+        ag.rpc = onceki + ag.rpc
 
-        scroll_div = None
-        for sel in ["div.m6QErb.DxyBCb.kA9KIf.dS8AEf", "div.m6QErb.DxyBCb", "div.m6QErb"]:
-            try:
-                el = driver.find_element(By.CSS_SELECTOR, sel)
-                if driver.execute_script("return arguments[0].scrollHeight > arguments[0].clientHeight", el):
-                    scroll_div = el
-                    break
-            except:
-                continue
+    scroll_div = None
+    for sel in ["div.m6QErb.DxyBCb.kA9KIf.dS8AEf", "div.m6QErb.DxyBCb", "div.m6QErb"]:
+        try:
+            el = driver.find_element(By.CSS_SELECTOR, sel)
+            if driver.execute_script("return arguments[0].scrollHeight > arguments[0].clientHeight", el):
+                scroll_div = el
+                break
+        except:
+            continue
 
-        if not scroll_div:
-            print("❌ Scroll alanı bulunamadı")
-            driver.quit()
-            return []
+    if not scroll_div:
+        print("❌ Scroll alanı bulunamadı")
+        return None
 
-        SECICI = None
-        for s in ["div.jftiEf", "div[data-review-id]"]:
-            if driver.find_elements(By.CSS_SELECTOR, s):
-                SECICI = s
-                break
+    for s in YORUM_SECICILER:
+        if driver.find_elements(By.CSS_SELECTOR, s):
+            return scroll_div, s
 
-        if not SECICI:
-            print("❌ Yorum bulunamadı")
-            driver.quit()
-            return []
+    print("❌ Yorum bulunamadı")
+    return None
 
-        print(f"📊 {max_yorum} yorum çekiliyor...")
-        
-        prev = 0
-        stag = 0
-        for _ in range(30):
-            for _ in range(10):
-                driver.execute_script("arguments[0].scrollTop += 1000;", scroll_div)
-            time.sleep(0.5)
-            
-            for btn in driver.find_elements(By.XPATH, "//button[contains(., 'Daha fazla')]")[:5]:
-                try: driver.execute_script("arguments[0].click();", btn)
-                except: pass
-            
-            elems = driver.find_elements(By.CSS_SELECTOR, SECICI)
-            cur = len(elems)
-            
-            if cur >= max_yorum:
+def _load_reviews(driver, scroll_div, secici, max_yorum, log):
+    """Aşağı kaydırarak max_yorum yorum yüklenene ya da liste bitene kadar -> yüklü yorum sayısı"""
+    def probe(d):
+        durum = _reviews_state(d, scroll_div, secici)
+        return durum["n"], durum["h"], durum["yukleniyor"], durum["n"]
+
+    prev = _reviews_state(driver, scroll_div, secici)["n"]
+    stag = 0
+    for _ in range(30):
+        if prev >= max_yorum:
+            break
+        kosul = grew(probe, prev)
+        driver.execute_script(KAYDIR_JS, scroll_div)
+        cur = wait(driver, kosul, YENI_YORUM_TIMEOUT, "kaydirma", legacy_sn=0.5, log=log)
+        if cur == BITTI:
+            break
+        if cur is None:
+            stag += 1
+            if stag >= 3:
                 break
-            if cur == prev:
-                stag += 1
-                if stag >= 3:
-                    break
-            else:
-                stag = 0
-                prev = cur
-
-        for elem in driver.find_elements(By.CSS_SELECTOR, SECICI)[:max_yorum]:
-            try:
-                txt = elem.find_element(By.CSS_SELECTOR, "span.wiI7pd").text
-                if txt and txt.strip():
-                    yorumlar.append(txt.strip())
-            except:
-                pass
+        else:
+            stag = 0
+            prev = cur
+    return prev
 
-        print(f"✅ {len(yorumlar)} yorum çekildi!")
+def scrape_reviews(otel_adi, max_yorum=50, pool=None, mod=None):
+    """
+    -> [{"yorum": metin, "tarih": "2 hafta önce", "zaman": unix sn ya da None,
+         "puan": yıldız ya da None, "id": Maps yorum id'si}, ...]
+    pool: BrowserPool (None -> get_pool())
+    mod: "dom" | "hafif" | "ag" (None -> SCRAPE_MODU); engelleme havuzun ayarıdır,
+         "ag" okuması perf_log'lu havuz ister (yoksa DOM'dan okunur)
+    """
+    print(f"\n{'='*60}")
+    print(f"🔍 '{otel_adi}' yorumları çekiliyor...")
+    print(f"{'='*60}\n")
 
-    except Exception as e:
-        print(f"❌ Hata: {e}")
-    finally:
-        driver.quit()
+    pool = get_pool() if pool is None else pool
+    mod = mod or SCRAPE_MODU
+    yorumlar = []
+
+    # Sıcak oturum: Maps ana sayfası + çerez onayı havuzda bir kez yapıldı (bkz. warmup_maps)
+    # Sabit bekleme yok: her adım sayfada beklenen öğe görünene kadar bekler (bkz. scrape_wait.py)
+    adimlar = {}
+    with pool.session() as driver:
         try:
-            import shutil
-            shutil.rmtree(profile, ignore_errors=True)
-        except:
-            pass
+            ag = AgKaydi(driver) if pool.perf_log else None
+            acik = _open_reviews(driver, otel_adi, adimlar, ag)
+            if not acik:
+                return []
+            scroll_div, secici = acik
+
+            print(f"📊 {max_yorum} yorum çekiliyor...")
+            yuklu = _load_reviews(driver, scroll_div, secici, max_yorum, adimlar)
+
+            t0 = time.perf_counter()
+            kazima_zamani = time.time()
+            kayitlar = None
+            if ag is not None:
+                ag.oku()
+                if mod == "ag":
+                    kayitlar = ag.yorumlar(max_yorum, otel_adi, AG_KAYIT_DIR)
+                    if len(kayitlar) < min(yuklu, max_yorum):
+                        print(f"⚠️  Ağ yanıtlarından {len(kayitlar)}/{min(yuklu, max_yorum)} yorum "
+                              f"ayrıştırıldı, DOM'dan okunuyor")
+                        kayitlar = None
+            if kayitlar is None:
+                kayitlar = collect_reviews(driver, scroll_div, secici, max_yorum)
+            for y in kayitlar:
+                y["zaman"] = parse_relative_date(y["tarih"], kazima_zamani)
+                yorumlar.append(y)
+            record("cikarim", time.perf_counter() - t0, log=adimlar)
+
+            print(f"✅ {len(yorumlar)} yorum çekildi!")
+            print(f"⏱️  {summary(adimlar)}")
+            if ag is not None:
+                ag.kaydet()
+                print(f"🌐 {ag.bayt / 1e6:.2f} MB, {ag.istek} istek, {ag.engellenen} engellendi")
+
+        except Exception as e:
+            print(f"❌ Hata: {e}")
+            pool.mark_broken(driver)
 
     return yorumlar
 
@@ -367,21 +494,89 @@ def scrape_reviews(otel_adi, max_yorum=50):
 # API
 # ============================================
 def check_api():
-    try:
-        r = requests.get(f"{API_URL}/health", timeout=5)
-        return r.status_code == 200
-    except:
-        return False
+    """API ayakta ve model yüklü mü? Model hâlâ yükleniyorsa /ready 200 olana kadar bekler"""
+    deadline = time.time() + API_READY_TIMEOUT
+    while True:
+        try:
+            r = requests.get(f"{API_URL}/ready", timeout=5)
+        except:
+            return False
+        if r.status_code == 200:
+            return True
+        if r.status_code != 503 or r.json().get("status") != "loading" or time.time() > deadline:
+            return False
+        time.sleep(1)
 
 def predict_batch(texts):
+    """-> (tahminler [N, 25] uint8, olasılıklar [N, 25] float16) ya da None"""
     try:
-        r = requests.post(f"{API_URL}/predict_batch", json={"texts": texts}, timeout=120)
+        # İkili .npy yanıt: uint8 class id + float16 olasılık (JSON'dan küçük ve hızlı)
+        # Birebir aynı yorumlar modele bir kez gider (sunucu varsayılanı dedup="exact");
+        # "near" isteğe bağlıdır, noktalama/büyük harf farkını yok sayar ve tahminleri değiştirebilir
+        r = requests.post(f"{API_URL}/predict_batch", params={"top_k": 1},
+                          json={"texts": texts},
+                          headers={"Accept": "application/x-npy"}, timeout=120)
         if r.status_code == 200:
-            return r.json()
+            tekrar = int(r.headers.get("X-Deduplicated", 0))
+            if tekrar:
+                print(f"   🔁 {tekrar} tekrar yorum modele gönderilmedi")
+            arr = np.load(io.BytesIO(r.content))
+            return arr["labels"], arr["probs"]
     except Exception as e:
         print(f"❌ API hatası: {e}")
     return None
 
+# ============================================
+# ANALİZ
+# ============================================
+def clean_reviews(yorumlar_raw):
+    """Ham yorumlar -> (temiz yorumlar, zamanlar); MIN_TEXT_LENGTH'ten kısalar atılır"""
+    temiz = [(clean_text(r["yorum"]), r["zaman"]) for r in yorumlar_raw]
+    temiz = [(y, z) for y, z in temiz if len(y) >= MIN_TEXT_LENGTH]
+    yorumlar = [y for y, _ in temiz]
+    zamanlar = [z for _, z in temiz]   # tarihi okunamayanlar None (ekleme anı sayılır)
+    return yorumlar, zamanlar
+
+def build_summaries(otel_adi, yorumlar, zamanlar, predictions, confidences, store=None):
+    """
+    -> {"tum", "pencere", "azalan": aspect_summary, "toplam_yorum", "yeni"}
+    store verilirse yorumlar depoya eklenir ve özetler tüm geçmişten okunur
+    """
+    if store is not None:
+        yeni = store.add(otel_adi, yorumlar, predictions, confidences, MIN_CONFIDENCE, zamanlar)
+        return {"tum": store.summary(otel_adi), "pencere": store.window_summary(otel_adi),
+                "azalan": store.decayed_summary(otel_adi),
+                "toplam_yorum": store.review_count(otel_adi), "yeni": yeni}
+    now = time.time()
+    zaman = [now if z is None else z for z in zamanlar]
+    return {"tum": summarize(predictions, confidences, MIN_CONFIDENCE),
+            "pencere": window_summary(predictions, zaman, now, PENCERE_GUN, confidences, MIN_CONFIDENCE),
+            "azalan": decayed_summary(predictions, zaman, now, YARI_OMUR_GUN, confidences, MIN_CONFIDENCE),
+            "toplam_yorum": len(yorumlar), "yeni": len(yorumlar)}
+
+def build_output(otel_adi, yorum_sayisi, ozetler, llama_result=None):
+    """Analiz JSON'u (dosyaya yazılan)"""
+    final_output = {
+        "otel_adi": otel_adi,
+        "yorum_sayisi": yorum_sayisi,
+        "toplam_yorum": ozetler["toplam_yorum"],
+        "aspect_summary": ozetler["tum"],
+        f"aspect_summary_son_{PENCERE_GUN}_gun": ozetler["pencere"],
+        "aspect_summary_azalan": ozetler["azalan"],
+        "yari_omur_gun": YARI_OMUR_GUN,
+        "ozet_modu": OZET_MODU,
+        "status": "success"
+    }
+    if llama_result and llama_result.get("success"):
+        final_output["aspect_text"] = llama_result["aspect_text"]
+        final_output["ozet"] = llama_result["summary"]
+    return final_output
+
+def output_filename(otel_adi):
+    safe = "".join(c if c.isalnum() or c in " -_" else "_" for c in otel_adi).replace(" ", "_")
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"{safe}_analiz_{ts}.json"
+
 # ============================================
 # MAIN
 # ============================================
@@ -396,7 +591,7 @@ def main():
     # API kontrol
     print("🔌 BERT API kontrol ediliyor...")
     if not check_api():
-        print("❌ API çalışmıyor! Önce: python api_server.py")
+        print("❌ API çalışmıyor veya model yüklenemedi! Önce: python api_server.py")
         return
     print("✅ BERT API OK!")
     
@@ -419,10 +614,6 @@ def main():
         print("❌ Boş olamaz!")
         return
     
-    # Dosya adları
-    safe = "".join(c if c.isalnum() or c in " -_" else "_" for c in otel_adi).replace(" ", "_")
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
     # 1. Scrape
     yorumlar_raw = scrape_reviews(otel_adi, max_yorum=50)
     if not yorumlar_raw:
@@ -431,8 +622,7 @@ def main():
     
     # 2. Temizle
     print("\n🧹 Temizleniyor...")
-    yorumlar = [clean_text(y) for y in yorumlar_raw]
-    yorumlar = [y for y in yorumlar if y and len(y) >= 10]
+    yorumlar, zamanlar = clean_reviews(yorumlar_raw)
     print(f"   Ham: {len(yorumlar_raw)} | Temiz: {len(yorumlar)}")
     
     if not yorumlar:
@@ -442,37 +632,36 @@ def main():
     # 3. API'ye gönder
     print(f"\n🚀 API'ye gönderiliyor ({len(yorumlar)} yorum)...")
     start = time.time()
-    predictions = predict_batch(yorumlar)
+    result = predict_batch(yorumlar)
     elapsed = time.time() - start
     
-    if not predictions:
+    if not result:
         print("❌ API yanıt vermedi!")
         return
+    predictions, confidences = result
     
     print(f"✅ Tahminler alındı! ({elapsed:.2f} sn)")
     
     # 4. Aspect Summary oluştur
     print("\n📊 Aspect summary oluşturuluyor...")
-    aspect_summary = build_aspect_summary(predictions)
+    if ASPECT_STORE_DB:
+        store = AspectStore(ASPECT_STORE_DB, PENCERE_GUN, YARI_OMUR_GUN)
+        ozetler = build_summaries(otel_adi, yorumlar, zamanlar, predictions, confidences, store)
+        store.close()
+        print(f"   🗄️  {ozetler['yeni']} yeni yorum eklendi | depoda toplam {ozetler['toplam_yorum']} yorum")
+    else:
+        ozetler = build_summaries(otel_adi, yorumlar, zamanlar, predictions, confidences)
+    aspect_summary = ozetler["tum"]
+    toplam_yorum = ozetler["toplam_yorum"]
     
     # 5. Ollama ile özet üret
     llama_result = None
     if ollama_ok:
-        llama_result = generate_summary(otel_adi, aspect_summary)
+        llama_result = generate_summary(otel_adi, ozetler[OZET_MODU])
     
     # 6. Final JSON
-    output_json = f"{safe}_analiz_{ts}.json"
-    
-    final_output = {
-        "otel_adi": otel_adi,
-        "yorum_sayisi": len(yorumlar),
-        "aspect_summary": aspect_summary,
-        "status": "success"
-    }
-    
-    if llama_result and llama_result.get("success"):
-        final_output["aspect_text"] = llama_result["aspect_text"]
-        final_output["ozet"] = llama_result["summary"]
+    output_json = output_filename(otel_adi)
+    final_output = build_output(otel_adi, len(yorumlar), ozetler, llama_result)
     
     with open(output_json, "w", encoding="utf-8") as f:
         json.dump(final_output, f, ensure_ascii=False, indent=2)
@@ -482,7 +671,7 @@ def main():
     print("✅ ANALİZ TAMAMLANDI!")
     print(f"{'='*70}")
     print(f"\n🏨 Otel: {otel_adi}")
-    print(f"📊 Yorum sayısı: {len(yorumlar)}")
+    print(f"📊 Yorum sayısı: {len(yorumlar)} (özet: {toplam_yorum} yorum)")
     print(f"⏱️  Süre: {elapsed:.2f} sn")
     
     print(f"\n📌 ASPECT SUMMARY:")
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+Tahmin Önbelleği - Aynı yorum için BERT'i tekrar çalıştırmamak için
+Anahtar: model versiyon etiketi + normalize edilmiş metnin SHA1 özeti
+Değer: (top-2 class id [25, 2] uint8, olasılıkları [25, 2] float16)
+
+Katmanlar:
+- Bellek: sınırlı LRU (OrderedDict)
+- Disk (opsiyonel): SQLite, yeniden başlatmalarda korunur
+
+Kullanım:
+    from prediction_cache import PredictionCache
+    cache = PredictionCache(model_tag, max_items=100_000, db_path="tahmin_cache.db")
+    results = cache.get_many(texts)      # miss -> None
+    cache.put_many(texts, preds)
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+RESULT_SHAPE = (25, 2)
+_IDS_BYTES = 25 * 2        # uint8
+_RESULT_BYTES = 25 * 2 * 3  # uint8 id + float16 olasılık
+
+
+def text_key(model_tag, text):
+    """Boşluk farkları tokenizer çıktısını değiştirmediği için normalize edilip özetlenir"""
+    norm = " ".join(text.split())
+    return hashlib.sha1(f"{model_tag}\0{norm}".encode("utf-8")).hexdigest()
+
+
+def pack_result(result):
+    """(ids, probs) -> SQLite'a yazılacak 150 baytlık blob"""
+    ids, probs = result
+    return ids.astype(np.uint8).tobytes() + probs.astype(np.float16).tobytes()
+
+def unpack_result(blob):
+    """pack_result'ın tersi; eski formattaki (sadece 25 label) kayıtlar için None"""
+    if len(blob) != _RESULT_BYTES:
+        return None
+    ids = np.frombuffer(blob[:_IDS_BYTES], dtype=np.uint8).reshape(RESULT_SHAPE)
+    probs = np.frombuffer(blob[_IDS_BYTES:], dtype=np.float16).reshape(RESULT_SHAPE)
+    return ids, probs
+
+
+class PredictionCache:
+    def __init__(self, model_tag, max_items=100_000, db_path=None):
+        self.model_tag = model_tag
+        self.max_items = max_items
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+        self.db = None
+        if db_path:
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS tahmin (key TEXT PRIMARY KEY, labels BLOB)")
+            self.db.commit()
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def get_many(self, texts):
+        """Her metin için (ids, probs) ya da None (miss)"""
+        keys = [text_key(self.model_tag, t) for t in texts]
+        results = [None] * len(texts)
+        disk_lookup = []
+
+        with self.lock:
+            for i, key in enumerate(keys):
+                result = self.memory.get(key)
+                if result is not None:
+                    self.memory.move_to_end(key)
+                    results[i] = result
+                    self.hits_memory += 1
+                else:
+                    disk_lookup.append(i)
+
+            if disk_lookup and self.db is not None:
+                for i in disk_lookup:
+                    row = self.db.execute(
+                        "SELECT labels FROM tahmin WHERE key = ?", (keys[i],)).fetchone()
+                    if row is not None:
+                        results[i] = unpack_result(row[0])
+                    if results[i] is not None:
+                        self._remember(keys[i], results[i])
+                        self.hits_disk += 1
+
+            self.misses += sum(1 for i in disk_lookup if results[i] is None)
+
+        return results
+
+    def put_many(self, texts, preds):
+        rows = [(text_key(self.model_tag, t), p) for t, p in zip(texts, preds)]
+        with self.lock:
+            if self.max_items > 0:
+                for key, result in rows:
+                    self._remember(key, result)
+            if self.db is not None:
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO tahmin (key, labels) VALUES (?, ?)",
+                    [(key, pack_result(result)) for key, result in rows])
+                self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits_memory + self.hits_disk + self.misses
+            hits = self.hits_memory + self.hits_disk
+            return {
+                "model_tag": self.model_tag,
+                "memory_items": len(self.memory),
+                "memory_max": self.max_items,
+                "disk": self.db is not None,
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            }
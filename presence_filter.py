@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Presence Ön-Filtresi - "Bu yorumda hiç aspect var mı?" için hafif lineer model
+Kelime, kelime ikilisi ve karakter 3/4-gram'ları hash'lenip (crc32) tek bir
+EmbeddingBag(sum) ile skorlanır (hashed n-gram lojistik regresyon). Hedef,
+aspectveri/val_fold*.jsonl label'larından: 25 label'dan en az biri > 0.
+
+api_server.py iki aşamalı modda (ASPECT_PRESENCE_FILTER=1) bu modelin "aspect
+yok" dediği yorumları BERT'e hiç göndermez, 25 sıfır döndürür.
+
+Çalıştırma: python presence_filter.py
+- 5-fold çapraz doğrulama ile eşik başına recall / atlanan yorum / kaybolan
+  mention oranını ve ölçülen BERT throughput'unu raporlar
+- HEDEF_RECALL'ı sağlayan en yüksek eşiği seçer, tüm veriyle son modeli eğitip
+  checkpoint klasörüne presence_filter.safetensors + presence_filter.json yazar
+"""
+
+import glob
+import json
+import os
+import time
+import zlib
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+FEATURE_BUCKETS = 1 << 18
+CHAR_NGRAMS = (3, 4)
+MAX_CHARS = 500            # karakter n-gram'ları için ilk N karakter
+EPOCHS = 5
+BATCH_SIZE = 256
+LR = 0.05
+SEED = 42
+
+ESIKLER = [0.05, 0.1, 0.2, 0.3, 0.5, 0.7]
+HEDEF_RECALL = 0.995       # aspect içeren yorumların en az bu kadarı BERT'e gitmeli
+HIZ_ORNEK = 1000           # throughput ölçümü için yorum sayısı
+BUCKET_SIZE = 16           # api_server ile aynı kova boyutu
+
+# ============================================
+# MODEL
+# ============================================
+def hashed_features(text):
+    """Metin -> hash kovası indeksleri (kelime, kelime ikilisi, karakter n-gram)"""
+    text = " ".join(text.lower().split())
+    words = text.split()
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    padded = f" {text[:MAX_CHARS]} "
+    for n in CHAR_NGRAMS:
+        grams += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    return [zlib.crc32(g.encode("utf-8")) % FEATURE_BUCKETS for g in grams] or [0]
+
+class PresenceFilter(nn.Module):
+    """Hashed n-gram lojistik regresyon: logit = sum(w[özellik]) / sqrt(n) + b"""
+    def __init__(self, buckets=FEATURE_BUCKETS):
+        super().__init__()
+        self.weights = nn.EmbeddingBag(buckets, 1, mode="sum")
+        nn.init.zeros_(self.weights.weight)
+        self.bias = nn.Parameter(torch.zeros(1))
+
+    def forward(self, flat, offsets, scale):
+        return self.weights(flat, offsets, per_sample_weights=scale).squeeze(-1) + self.bias
+
+    def encode(self, features):
+        """Özellik listeleri -> EmbeddingBag girdisi (flat, offsets, ölçek)"""
+        lengths = [len(f) for f in features]
+        flat = torch.tensor([i for f in features for i in f], dtype=torch.long)
+        offsets = torch.tensor([0] + lengths[:-1], dtype=torch.long).cumsum(0)
+        scale = torch.cat([torch.full((n,), n ** -0.5) for n in lengths])
+        return flat, offsets, scale
+
+    def predict_proba(self, texts):
+        """Metin listesi -> "en az bir aspect var" olasılıkları (numpy)"""
+        if not texts:
+            return np.zeros(0, dtype=np.float32)
+        with torch.no_grad():
+            logits = self(*self.encode([hashed_features(t) for t in texts]))
+        return torch.sigmoid(logits).numpy()
+
+def train_filter(features, targets):
+    torch.manual_seed(SEED)
+    model = PresenceFilter()
+    opt = torch.optim.Adam(model.parameters(), lr=LR)
+    loss_fn = nn.BCEWithLogitsLoss()
+    y = torch.tensor(targets, dtype=torch.float32)
+    for _ in range(EPOCHS):
+        order = torch.randperm(len(features)).tolist()
+        for start in range(0, len(order), BATCH_SIZE):
+            idx = order[start:start + BATCH_SIZE]
+            logits = model(*model.encode([features[i] for i in idx]))
+            loss = loss_fn(logits, y[idx])
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+    model.eval()
+    return model
+
+def save_filter(model, threshold, report, checkpoint_dir=CHECKPOINT_DIR):
+    from safetensors.torch import save_file
+
+    save_file(model.state_dict(), os.path.join(checkpoint_dir, "presence_filter.safetensors"))
+    with open(os.path.join(checkpoint_dir, "presence_filter.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "threshold": threshold,
+            "feature_buckets": FEATURE_BUCKETS,
+            "char_ngrams": list(CHAR_NGRAMS),
+            "max_chars": MAX_CHARS,
+            "report": report,
+        }, f, ensure_ascii=False, indent=2)
+
+def load_filter(checkpoint_dir=CHECKPOINT_DIR):
+    """-> (PresenceFilter, config dict) ya da dosyalar yoksa (None, None)"""
+    from safetensors.torch import load_file
+
+    config_path = os.path.join(checkpoint_dir, "presence_filter.json")
+    weights_path = os.path.join(checkpoint_dir, "presence_filter.safetensors")
+    if not (os.path.exists(config_path) and os.path.exists(weights_path)):
+        return None, None
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    model = PresenceFilter(config["feature_buckets"])
+    model.load_state_dict(load_file(weights_path))
+    model.eval()
+    return model, config
+
+# ============================================
+# DEĞERLENDİRME
+# ============================================
+def load_folds():
+    folds = []
+    for path in sorted(glob.glob(FOLD_PATTERN)):
+        with open(path, "r", encoding="utf-8") as f:
+            folds.append([json.loads(line) for line in f])
+    return folds
+
+def out_of_fold_scores(folds, features):
+    """Her fold, diğer fold'larla eğitilen modelle skorlanır"""
+    scores = []
+    for k in range(len(folds)):
+        train_feats, train_y = [], []
+        for j, fold in enumerate(folds):
+            if j != k:
+                train_feats += features[j]
+                train_y += [any(l > 0 for l in row["labels"]) for row in fold]
+        model = train_filter(train_feats, train_y)
+        with torch.no_grad():
+            scores.append(torch.sigmoid(model(*model.encode(features[k]))).numpy())
+        print(f"   ✅ fold {k + 1}/{len(folds)}")
+    return scores
+
+def bert_throughput(texts, scores, thresholds):
+    """Ölçülen yorum/sn: sadece BERT vs filtre + eşiği geçenler için BERT"""
+    from aspect_model import load_model, load_tokenizer, length_buckets
+
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    model = load_model(CHECKPOINT_DIR)
+    filt = PresenceFilter()  # süre ölçümü için; ağırlıkların değeri süreyi etkilemez
+
+    def run_bert(batch):
+        with torch.inference_mode():
+            for _, input_ids, attention_mask in length_buckets(tokenizer, batch, BUCKET_SIZE):
+                model(input_ids, attention_mask)
+
+    run_bert(texts[:32])  # ısınma
+    start = time.perf_counter()
+    run_bert(texts)
+    base = len(texts) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    filt.predict_proba(texts)
+    print(f"   Filtre tek başına: {len(texts) / (time.perf_counter() - start):.0f} yorum/sn")
+
+    result = {}
+    for t in thresholds:
+        start = time.perf_counter()
+        filt.predict_proba(texts)
+        run_bert([text for text, s in zip(texts, scores) if s >= t])
+        result[t] = len(texts) / (time.perf_counter() - start)
+    return base, result
+
+def main():
+    folds = load_folds()
+    if not folds:
+        print(f"❌ {FOLD_PATTERN} bulunamadı!")
+        return
+    print(f"📊 {sum(len(f) for f in folds)} yorum, {len(folds)} fold | özellikler hesaplanıyor...")
+    features = [[hashed_features(row["yorum"]) for row in fold] for fold in folds]
+
+    print("🔄 Çapraz doğrulama...")
+    scores = np.concatenate(out_of_fold_scores(folds, features))
+    rows = [row for fold in folds for row in fold]
+    labels = np.array([row["labels"] for row in rows])
+    present = (labels > 0).any(axis=1)
+    mentions = (labels > 0).sum(axis=1)
+    print(f"   Aspect içermeyen yorum oranı: {1 - present.mean():.3f}")
+
+    texts = [row["yorum"] for row in folds[0][:HIZ_ORNEK]]
+    print(f"\n⏱️  Throughput ölçülüyor ({len(texts)} yorum)...")
+    base, speed = bert_throughput(texts, scores[:len(texts)], ESIKLER)
+
+    print(f"\n{'eşik':>5} | {'atlanan':>8} | {'recall':>7} | {'kayıp mention':>13} | {'yorum/sn':>8} | {'hızlanma':>8}")
+    print("-" * 66)
+    print(f"{'-':>5} | {0:8.3f} | {1:7.4f} | {0:13.4f} | {base:8.1f} | {1:7.2f}x")
+    report = {"aspectsiz_oran": round(float(1 - present.mean()), 4), "bert_yorum_sn": round(base, 1), "esikler": []}
+    for t in ESIKLER:
+        skipped = scores < t
+        row = {
+            "esik": t,
+            "atlanan_oran": round(float(skipped.mean()), 4),
+            "recall": round(float(1 - (skipped & present).sum() / present.sum()), 4),
+            "kayip_mention_orani": round(float(mentions[skipped].sum() / mentions.sum()), 4),
+            "yorum_sn": round(speed[t], 1),
+        }
+        report["esikler"].append(row)
+        print(f"{t:>5} | {row['atlanan_oran']:8.3f} | {row['recall']:7.4f} | {row['kayip_mention_orani']:13.4f} | "
+              f"{speed[t]:8.1f} | {speed[t] / base:7.2f}x")
+
+    uygun = [r for r in report["esikler"] if r["recall"] >= HEDEF_RECALL]
+    if not uygun:
+        print(f"\n⚠️  Hiçbir eşik recall >= {HEDEF_RECALL} sağlamadı, filtre kaydedilmedi.")
+        return
+    secilen = max(uygun, key=lambda r: r["esik"])
+    report["secilen_esik"] = secilen["esik"]
+
+    print(f"\n🔄 Son model tüm veriyle eğitiliyor (eşik {secilen['esik']}, recall {secilen['recall']})...")
+    model = train_filter([f for fold in features for f in fold], present.tolist())
+    save_filter(model, secilen["esik"], report)
+    print(f"✅ Kaydedildi: {CHECKPOINT_DIR}/presence_filter.safetensors + presence_filter.json")
+    print(f"   Açmak için: ASPECT_PRESENCE_FILTER=1 python api_server.py")
+
+if __name__ == "__main__":
+    main()
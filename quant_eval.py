@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+INT8 Quantization Değerlendirmesi - fp32 vs dinamik int8
+aspectveri/val_fold1.jsonl üzerinde iki modeli çalıştırır:
+- Aspect bazında fp32/int8 tahmin uyumu
+- Gold etiketlere göre presence-F1 ve fark
+Sonuç checkpoint klasörüne quant_report.json olarak yazılır (ölçülen ağırlıkların
+checkpoint_tag'i dahil). api_server.py int8 modunu sadece bu rapor aynı
+checkpoint için F1 düşüşünü eşiğin altında gösteriyorsa açar.
+
+Çalıştırma: python quant_eval.py
+Sonra:      ASPECT_QUANTIZE=int8 python api_server.py
+"""
+
+import json
+import os
+import time
+
+import torch
+
+from aspect_model import (
+    load_model, load_tokenizer, quantize_int8, length_buckets,
+    presence_scores, checkpoint_tag, ASPECT_NAMES
+)
+
+# ============================================
+# AYARLAR
+# ============================================
+CHECKPOINT_DIR = "checkpoint-6000"
+EVAL_FILE = "aspectveri/val_fold1.jsonl"
+REPORT_PATH = os.path.join(CHECKPOINT_DIR, "quant_report.json")
+MAX_F1_DROP = 0.01      # presence-F1 en fazla bu kadar düşebilir (mutlak)
+BUCKET_SIZE = 16
+
+def load_records():
+    with open(EVAL_FILE, "r", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    return [r["yorum"] for r in records], [r["labels"] for r in records]
+
+def predict(model, tokenizer, texts):
+    preds = [None] * len(texts)
+    start = time.perf_counter()
+    with torch.no_grad():
+        for idx, input_ids, attention_mask in length_buckets(tokenizer, texts, BUCKET_SIZE):
+            logits = model(input_ids, attention_mask)["logits"]
+            for i, pred in zip(idx, logits.argmax(-1).tolist()):
+                preds[i] = pred
+    return preds, time.perf_counter() - start
+
+def model_size_mb(model):
+    """state_dict'teki tensörlerin toplam boyutu (MB), int8 packed ağırlıklar dahil"""
+    def nbytes(value):
+        if isinstance(value, torch.Tensor):
+            return value.nelement() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(nbytes(v) for v in value)
+        return 0
+
+    return sum(nbytes(v) for v in model.state_dict().values()) / 1024 / 1024
+
+def main():
+    if not os.path.exists(CHECKPOINT_DIR):
+        print(f"❌ HATA: {CHECKPOINT_DIR} bulunamadı!")
+        return
+
+    texts, golds = load_records()
+    print(f"📊 {EVAL_FILE}: {len(texts)} yorum\n")
+
+    tokenizer = load_tokenizer(CHECKPOINT_DIR)
+    fp32 = load_model(CHECKPOINT_DIR, "cpu")
+    int8 = quantize_int8(fp32)
+
+    fp32_preds, fp32_time = predict(fp32, tokenizer, texts)
+    int8_preds, int8_time = predict(int8, tokenizer, texts)
+
+    # Aspect bazında uyum
+    print("Aspect uyumu (fp32 vs int8)")
+    print("-" * 40)
+    uyum = {}
+    for a, name in enumerate(ASPECT_NAMES):
+        same = sum(p[a] == q[a] for p, q in zip(fp32_preds, int8_preds))
+        uyum[name] = same / len(texts)
+        print(f"{a + 1:02d} {name:<22} {uyum[name]:.4f}")
+
+    fp32_scores = presence_scores(fp32_preds, golds)
+    int8_scores = presence_scores(int8_preds, golds)
+    drop = fp32_scores["f1"] - int8_scores["f1"]
+    approved = drop <= MAX_F1_DROP
+
+    fp32_mb = model_size_mb(fp32)
+    int8_mb = model_size_mb(int8)
+
+    print(f"\n  Presence-F1 fp32: {fp32_scores['f1']:.4f} | int8: {int8_scores['f1']:.4f} | düşüş: {drop:+.4f}")
+    print(f"  Boyut fp32: {fp32_mb:.0f} MB | int8: {int8_mb:.0f} MB")
+    print(f"  Süre fp32: {fp32_time:.1f} sn | int8: {int8_time:.1f} sn")
+
+    report = {
+        "checkpoint_tag": checkpoint_tag(CHECKPOINT_DIR),   # api_server rapor başka ağırlıklarınsa reddeder
+        "eval_file": EVAL_FILE,
+        "n": len(texts),
+        "presence_fp32": fp32_scores,
+        "presence_int8": int8_scores,
+        "presence_f1_drop": drop,
+        "max_f1_drop": MAX_F1_DROP,
+        "approved": approved,
+        "aspect_agreement": uyum,
+        "size_mb": {"fp32": fp32_mb, "int8": int8_mb},
+        "seconds": {"fp32": fp32_time, "int8": int8_time},
+    }
+    with open(REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    if approved:
+        print(f"\n✅ int8 onaylandı (düşüş <= {MAX_F1_DROP}). Rapor: {REPORT_PATH}")
+    else:
+        print(f"\n❌ int8 reddedildi (düşüş > {MAX_F1_DROP}). Rapor: {REPORT_PATH}")
+
+if __name__ == "__main__":
+    main()
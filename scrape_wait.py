@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Koşullu Bekleme - kazıyıcılardaki sabit time.sleep'lerin yerine
+Her adım WebDriverWait ile bir koşul sağlanana kadar bekler (sayfa hazırsa
+hemen devam eder), adım başına zaman aşımı vardır ve süreler ölçülür:
+- wait(driver, kosul, timeout, "adim", legacy_sn=3, log=adimlar)
+  koşulun döndürdüğü değeri verir; zaman aşımında None
+- log (dict) otel başına adım süreleri, stats süreç geneli toplamlar
+- SCRAPE_SABIT_BEKLEME=1: eski davranış (legacy_sn kadar uyuyup koşula bir
+  kez bakar) - bench_browser.py karşılaştırması için
+
+Koşullar: clickable, any_present, replaced (liste yenilendi),
+grew / reviews_grew (kaydırınca yorum sayısı arttı / spinner yok, liste bitti)
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException)
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# ============================================
+# AYARLAR
+# ============================================
+SABIT_BEKLEME = os.environ.get("SCRAPE_SABIT_BEKLEME", "0") == "1"
+POLL_SN = 0.1
+# Spinner yokken bu kadar süre yeni yorum / scrollHeight değişimi gelmezse liste
+# bitti sayılır. Yavaş bağlantıda Maps parçalar arasında >1 sn boşluk bırakabilir;
+# kısaltmak erken "bitti" (eksik yorum) riskidir
+SAKIN_SN = float(os.environ.get("SCRAPE_SAKIN_SN", "1.5"))
+YUKLENIYOR_SECICI = "div.qjESne"      # Maps yorum listesinin altındaki yükleme spinner'ı
+BITTI = "bitti"                       # reviews_grew: daha fazla yorum yok
+
+stats = Counter()                     # "<adim>_sn", "<adim>", "<adim>_zaman_asimi"
+_stats_lock = threading.Lock()
+
+# ============================================
+# BEKLEME
+# ============================================
+def wait(driver, condition, timeout, step, legacy_sn=0.0, log=None):
+    """condition(driver) doğru bir değer döndürene kadar bekler -> o değer ya da None"""
+    t0 = time.perf_counter()
+    if SABIT_BEKLEME:
+        time.sleep(legacy_sn)
+        try:
+            result = condition(driver) or None
+        except Exception:
+            result = None
+    else:
+        try:
+            result = WebDriverWait(driver, timeout, poll_frequency=POLL_SN,
+                                   ignored_exceptions=(NoSuchElementException,
+                                                       StaleElementReferenceException)).until(condition)
+        except TimeoutException:
+            result = None
+    record(step, time.perf_counter() - t0, result is None, log)
+    return result
+
+def record(step, sn, timed_out=False, log=None):
+    if log is not None:
+        log[step] = log.get(step, 0.0) + sn
+    with _stats_lock:
+        stats[f"{step}_sn"] += sn
+        stats[step] += 1
+        if timed_out:
+            stats[f"{step}_zaman_asimi"] += 1
+
+def summary(log):
+    """{"arama": 0.41, ...} -> "arama 0.41s | ... | toplam 2.10s" """
+    parts = [f"{k} {v:.2f}s" for k, v in log.items()]
+    return " | ".join(parts + [f"toplam {sum(log.values()):.2f}s"])
+
+def report():
+    """Süreç geneli adım başına ortalama süre ve zaman aşımı sayısı"""
+    with _stats_lock:
+        steps = [k for k in stats if not k.endswith("_sn") and not k.endswith("_zaman_asimi")]
+        return {k: {"n": stats[k], "ort_sn": round(stats[f"{k}_sn"] / stats[k], 3),
+                    "zaman_asimi": stats[f"{k}_zaman_asimi"]} for k in steps}
+
+# ============================================
+# KOŞULLAR
+# ============================================
+def clickable(locator):
+    return EC.element_to_be_clickable(locator)
+
+def any_present(*locators):
+    """İlk bulunan locator -> (sıra, elemanlar); örn. arama sonuçları ya da direkt otel sayfası"""
+    def _cond(driver):
+        for i, loc in enumerate(locators):
+            elems = driver.find_elements(*loc)
+            if elems:
+                return i, elems
+        return False
+    return _cond
+
+def replaced(old_element, *locators):
+    """Eski eleman DOM'dan düştü ve yenisi geldi (örn. sıralama sonrası liste) -> elemanlar"""
+    gone = EC.staleness_of(old_element)
+    def _cond(driver):
+        if not gone(driver):
+            return False
+        for loc in locators:
+            elems = driver.find_elements(*loc)
+            if elems:
+                return elems
+        return False
+    return _cond
+
+def grew(probe, prev, quiet_sn=None):
+    """
+    probe(driver) -> (sayı, scrollHeight, yükleniyor_mu, değer)
+    sayı prev'i geçti -> değer; yükleniyor değil ve scrollHeight quiet_sn
+    (None -> SAKIN_SN) boyunca değişmedi -> BITTI
+    """
+    quiet_sn = SAKIN_SN if quiet_sn is None else quiet_sn
+    state = {"h": None, "t": time.perf_counter()}
+    def _cond(driver):
+        n, h, loading, value = probe(driver)
+        if n > prev:
+            return value
+        if h != state["h"] or loading:
+            state["h"], state["t"] = h, time.perf_counter()
+            return False
+        return BITTI if time.perf_counter() - state["t"] >= quiet_sn else False
+    return _cond
+
+def reviews_grew(selector, prev, scroll_el, spinner=YUKLENIYOR_SECICI, quiet_sn=None):
+    """Kaydırmadan sonra yorum sayısı arttı -> yeni sayı (WebDriver çağrılarıyla; bkz. grew)"""
+    def _probe(driver):
+        n = len(driver.find_elements(By.CSS_SELECTOR, selector))
+        if n > prev:
+            return n, None, False, n
+        h = driver.execute_script("return arguments[0].scrollHeight", scroll_el)
+        return n, h, bool(driver.find_elements(By.CSS_SELECTOR, spinner)), n
+    return grew(_probe, prev, quiet_sn)
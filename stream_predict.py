@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+NDJSON Akış İstemcisi - Büyük yorum setlerini /predict_stream ile skorlar
+Girdi jsonl dosyaları satır satır okunur, {"id": yorum_id, "text": yorum}
+olarak gönderilir; sonuçlar geldikçe {"id", "labels"} satırları olarak
+çıktı dosyasına yazılır. İki uçta da bellek kullanımı girdi boyutundan bağımsızdır.
+
+Gönderme ve okuma aynı anda yapılır (ayrı thread): sunucu sonuçları girdi
+bitmeden yazmaya başladığından, önce tüm gövdeyi gönderen bir istemci
+(requests vb.) büyük girdilerde iki tarafın da tamponu dolunca kilitlenir.
+
+Kullanım:
+    python stream_predict.py                                  # val_fold*.jsonl
+    python stream_predict.py yorumlar.jsonl -o tahminler.jsonl
+"""
+
+import argparse
+import glob
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+# ============================================
+# AYARLAR
+# ============================================
+API_URL = "http://localhost:8000"
+FOLD_PATTERN = "aspectveri/val_fold*.jsonl"
+OUTPUT_PATH = "stream_tahminler.jsonl"
+ID_FIELD = "yorum_id"
+TEXT_FIELD = "yorum"
+CHUNK_LINES = 500   # gönderilen her HTTP chunk'taki satır sayısı
+
+def iter_requests(paths):
+    """jsonl dosyalarından NDJSON istek satırları (bytes)"""
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                row = json.loads(line)
+                yield (json.dumps({"id": row.get(ID_FIELD), "text": row[TEXT_FIELD]},
+                                  ensure_ascii=False) + "\n").encode("utf-8")
+
+def send_body(conn, lines, sent):
+    """Gövdeyi chunked transfer encoding ile gönder"""
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        sent[0] += 1
+        if len(chunk) >= CHUNK_LINES:
+            data = b"".join(chunk)
+            conn.send(b"%x\r\n%s\r\n" % (len(data), data))
+            chunk = []
+    if chunk:
+        data = b"".join(chunk)
+        conn.send(b"%x\r\n%s\r\n" % (len(data), data))
+    conn.send(b"0\r\n\r\n")
+
+def stream_predict(paths, output_path, api_url=API_URL):
+    url = urlparse(api_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=600)
+    conn.putrequest("POST", "/predict_stream")
+    conn.putheader("Content-Type", "application/x-ndjson")
+    conn.putheader("Transfer-Encoding", "chunked")
+    conn.endheaders()
+
+    sent = [0]
+    sender_error = []
+    def sender():
+        try:
+            send_body(conn, iter_requests(paths), sent)
+        except Exception as e:
+            sender_error.append(e)
+    thread = threading.Thread(target=sender, daemon=True)
+    thread.start()
+
+    received = errors = 0
+    start = time.perf_counter()
+    resp = conn.getresponse()
+    if resp.status != 200:
+        print(f"❌ API hatası: {resp.status} {resp.read().decode('utf-8', 'replace')}")
+        return
+    with open(output_path, "w", encoding="utf-8") as out:
+        for line in resp:
+            if not line.strip():
+                continue
+            out.write(line.decode("utf-8"))
+            received += 1
+            if b'"error"' in line:
+                errors += 1
+            if received % 5000 == 0:
+                print(f"   📊 {received} sonuç ({received / (time.perf_counter() - start):.0f} yorum/sn)")
+    thread.join()
+    conn.close()
+
+    elapsed = time.perf_counter() - start
+    if sender_error:
+        print(f"❌ Gönderim hatası: {sender_error[0]}")
+    print(f"✅ {received}/{sent[0]} sonuç -> {output_path} | hata: {errors} | "
+          f"{elapsed:.1f} sn ({received / elapsed:.0f} yorum/sn)")
+
+def main():
+    parser = argparse.ArgumentParser(description="NDJSON akışı ile toplu aspect tahmini")
+    parser.add_argument("inputs", nargs="*", help=f"jsonl dosyaları (varsayılan: {FOLD_PATTERN})")
+    parser.add_argument("-o", "--output", default=OUTPUT_PATH)
+    parser.add_argument("--api", default=API_URL)
+    args = parser.parse_args()
+
+    paths = args.inputs or sorted(glob.glob(FOLD_PATTERN))
+    if not paths:
+        print("❌ Girdi dosyası bulunamadı!")
+        return
+    print(f"📁 {len(paths)} dosya -> {args.api}/predict_stream")
+    stream_predict(paths, args.output, args.api)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""aspect_aggregate.summarize referans build_aspect_summary ile birebir aynı olmalı"""
+
+import json
+import random
+
+import numpy as np
+import pytest
+
+from aspect_aggregate import build_aspect_summary, summarize
+
+SEED = 42
+DENEME = 300
+
+
+def random_case(seed):
+    """-> (labels listesi, confidences listesi/None, uint8 matris, olasılık matrisi/None, eşik)"""
+    rng = np.random.default_rng(seed)
+    r = random.Random(seed)
+    n = r.choice([0, 1, 2, r.randint(3, 20), r.randint(20, 300)])
+    classes = r.choice([np.arange(1, 22), rng.choice(np.arange(1, 22), size=r.randint(1, 4))])
+    dolu = r.random()
+    labels = np.where(rng.random((n, 25)) < dolu, rng.choice(classes, size=(n, 25)), 0).astype(np.uint8)
+
+    probs, esik = None, 0.0
+    if r.random() < 0.5:
+        probs = rng.random((n, 25)).astype(r.choice([np.float16, np.float32]))
+        # Eşik bazen tam olarak bir olasılık değerine denk gelsin (sınır durumu)
+        esik = float(probs.flat[0]) if probs.size and r.random() < 0.3 else r.choice([0.0, 0.3, 0.5, 0.9])
+    # Pipeline'daki gibi: liste tarafı float32 -> Python float
+    probs_list = probs.astype(np.float32).tolist() if probs is not None else None
+    return labels.tolist(), probs_list, labels, probs, esik
+
+
+def _assert_same(labels_list, probs_list, labels, probs, esik):
+    ref = json.dumps(build_aspect_summary(labels_list, probs_list, esik))
+    assert json.dumps(summarize(labels, probs, esik)) == ref
+    assert json.dumps(summarize(labels_list, probs_list, esik)) == ref
+
+
+@pytest.mark.parametrize("seed", range(SEED, SEED + DENEME))
+def test_random_inputs_match_reference(seed):
+    _assert_same(*random_case(seed))
+
+
+def _case(rows, probs=None, esik=0.0):
+    labels = np.array(rows, dtype=np.uint8).reshape(-1, 25)
+    p = np.array(probs, dtype=np.float32).reshape(-1, 25) if probs is not None else None
+    return labels.tolist(), p.tolist() if p is not None else None, labels, p, esik
+
+
+@pytest.mark.parametrize("case", [
+    _case([]),                                                       # boş
+    _case([[0] * 25]),                                               # mention yok
+    _case([[21] * 25]),                                              # tek yorum, hepsi olumlu
+    _case([[15, 16] + [0] * 23, [16, 15] + [0] * 23]),               # eşit nedenler: ilk görülen önce
+    _case([[1] + [0] * 24, [8] + [0] * 24, [15] + [0] * 24]),        # olumsuz / nötr / olumlu
+    _case([[15] * 25, [16] * 25], [[0.5] * 25, [0.49] * 25], 0.5),   # eşik sınırı
+], ids=["bos", "mention-yok", "tek-yorum", "esitlik", "uc-duygu", "esik-siniri"])
+def test_edge_cases_match_reference(case):
+    _assert_same(*case)
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""bulk_score --resume, kesilen çalıştırmadan farklı --workers ile baştan başlamamalı"""
+
+import sys
+
+import bulk_score
+
+
+def _no_scoring(*args):
+    raise AssertionError("skorlamaya başlanmamalıydı")
+
+
+def _run(monkeypatch, *argv):
+    monkeypatch.setattr(sys, "argv", ["bulk_score.py", *argv])
+    monkeypatch.setattr(bulk_score, "score_shard", _no_scoring)
+    bulk_score.main()
+
+
+def test_existing_num_shards(tmp_path):
+    out = str(tmp_path / "etiketler[1].jsonl")
+    for k in range(4):
+        open(bulk_score.shard_path(out, k, 4), "w").close()
+    open(out + ".shard0-of-x", "w").close()
+    assert bulk_score.existing_num_shards(out) == [4]
+    assert bulk_score.existing_num_shards(str(tmp_path / "yok.jsonl")) == []
+
+
+def test_resume_with_different_workers_refuses(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "girdi.jsonl"
+    src.write_text('{"yorum": "oda temizdi"}\n', encoding="utf-8")
+    out = str(tmp_path / "etiketler.jsonl")
+    for k in range(4):
+        with open(bulk_score.shard_path(out, k, 4), "w") as f:
+            f.write('{"row": %d, "id": %d, "labels": []}\n' % (k, k))
+
+    _run(monkeypatch, str(src), "-o", out, "--workers", "2", "--resume")
+
+    assert "--workers 4" in capsys.readouterr().out
+    assert bulk_score.existing_num_shards(out) == [4]
+
+
+def test_resume_of_finished_output_is_noop(tmp_path, monkeypatch, capsys):
+    src = tmp_path / "girdi.jsonl"
+    src.write_text('{"yorum": "oda temizdi"}\n', encoding="utf-8")
+    out = tmp_path / "etiketler.jsonl"
+    out.write_text('{"row": 0, "id": 0, "labels": []}\n', encoding="utf-8")
+
+    _run(monkeypatch, str(src), "-o", str(out), "--workers", "2", "--resume")
+
+    assert "zaten tamamlanmış" in capsys.readouterr().out
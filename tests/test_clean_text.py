@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""text_clean.clean_text referans regex zinciri clean_text_reference ile birebir aynı olmalı"""
+
+import os
+import random
+
+import pytest
+
+import bench_clean
+from text_clean import MIN_PARALEL, clean_text, clean_text_reference, clean_texts
+
+SEED = 42
+FUZZ_SAYISI = 20_000
+FOLD_PATTERN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            bench_clean.FOLD_PATTERN)
+
+# Zor parçalar: url içinde etiket/emoji, "İ"/"ſ"/Kelvin işareti, bitişik
+# telefon/rakam, \x1c gibi boşluk sayılan kontrol karakterleri...
+PARCALAR = bench_clean.GURULTU + [
+    "<", ">", "http", "https", "://", "www", ".", "@", "ſ", "K", "/", "+", "-", " ", "  ",
+    "1", "23", "4567", "٣", "\x1c", "\x1f", "\u2028", "a", "aa", "ş", "Ş", "ı", "oda", "temiz",
+    "(", ")", "'", '"', ":", ";", "!", "?", ",", "é", "ß", "\U0001F251", "Ⓛ", "Ⓜ",
+]
+
+
+@pytest.fixture(scope="module")
+def folds():
+    onceki, bench_clean.FOLD_PATTERN = bench_clean.FOLD_PATTERN, FOLD_PATTERN
+    try:
+        texts = bench_clean.load_texts()
+    finally:
+        bench_clean.FOLD_PATTERN = onceki
+    if not texts:
+        pytest.skip(f"{FOLD_PATTERN} bulunamadı")
+    return texts
+
+
+def _farklar(texts):
+    return [t for t in texts if clean_text(t) != clean_text_reference(t)][:3]
+
+
+def test_fold_texts_match_reference(folds):
+    assert _farklar(folds) == []
+
+
+def test_dirtied_fold_texts_match_reference(folds):
+    kirli = bench_clean.dirty(folds, random.Random(SEED))
+    assert _farklar(kirli) == []
+
+
+def fuzz(n, rng):
+    return ["".join(rng.choice(PARCALAR) for _ in range(rng.randint(0, 40))) for _ in range(n)]
+
+
+def test_fuzz_match_reference():
+    assert _farklar(fuzz(FUZZ_SAYISI, random.Random(SEED))) == []
+
+
+def test_clean_texts_workers_match_reference():
+    texts = fuzz(MIN_PARALEL, random.Random(SEED + 1))
+    assert clean_texts(texts, workers=2) == [clean_text_reference(t) for t in texts]
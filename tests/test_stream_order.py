@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""/predict_stream çıktısı girdi sırasında olmalı (batch ortasındaki hatalı satır dahil)"""
+
+import asyncio
+import json
+
+import numpy as np
+
+import api_server
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body = body
+
+    async def stream(self):
+        yield self.body
+
+
+def _stream(body):
+    async def collect():
+        return "".join([chunk async for chunk in api_server.stream_results(FakeRequest(body))])
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+def test_bad_line_mid_batch_keeps_input_order(monkeypatch):
+    async def fake_predict(texts):
+        return [(np.zeros(api_server.RESULT_SHAPE, dtype=np.uint8),
+                 np.zeros(api_server.RESULT_SHAPE, dtype=np.float16)) for _ in texts]
+
+    monkeypatch.setattr(api_server, "predict_texts", fake_predict)
+    monkeypatch.setattr(api_server, "STREAM_BATCH_SIZE", 4)
+    lines = [json.dumps({"id": f"y{i}", "text": f"yorum {i}"}) for i in range(6)]
+    lines.insert(2, "{bozuk")                    # ilk batch'in ortasında, 3. satır
+    out = _stream(("\n".join(lines) + "\n").encode("utf-8"))
+
+    assert [o.get("id") or o["line"] for o in out] == ["y0", "y1", 3, "y2", "y3", "y4", "y5"]
+    assert "error" in out[2] and "labels" in out[3]
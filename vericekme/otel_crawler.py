@@ -0,0 +1,207 @@
+"""
+Paralel Otel Yorum Çekici - otel listesini N worker sürecine bölerek çeker
+tum_otelleri_txtten_cek'in paralel ve kaldığı yerden devam eden hali:
+- Oteller ada göre (crc32) N parçaya (shard) bölünür; her worker süreci kendi
+  tarayıcısıyla kendi parçasını çeker. Liste değişse de bir otel hep aynı
+  parçaya düşer.
+- Biten her otelin yorumları hemen out/shard_<k>.jsonl dosyasına tek satır
+  olarak eklenir (fsync), ardından otel out/tamamlanan_<k>.jsonl manifestine
+  yazılır. Çökme ya da Ctrl+C'de en fazla worker başına o an çekilen otel
+  kaybolur; aynı komut manifestteki otelleri atlayıp devam eder.
+- "Yorumu olan otel" hedefi (YORUMLU_OTEL_HEDEF) süreçler arası paylaşılan
+  sayaçla kontrol edilir; hedefe ulaşınca worker'lar yeni otel almaz (o an
+  çekilmekte olanlar bitirilir, hedef worker sayısı kadar aşılabilir).
+- Sonunda parçalar birleştirilip tum_otelleri_txtten_cek ile aynı CSV'ler yazılır.
+
+Kullanım:
+    python vericekme/otel_crawler.py otellistesi.txt --workers 4 -o cekim
+    python vericekme/otel_crawler.py otellistesi.txt --workers 4 -o cekim   # kaldığı yerden
+    python vericekme/otel_crawler.py --sadece-birlestir -o cekim
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+import zlib
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import otelvericekme as ov
+
+# ============================================
+# AYARLAR
+# ============================================
+OTEL_LISTESI = "otellistesi.txt"
+CIKTI_DIR = "cekim"
+CIKTI_CSV = "tum_oteller_yorumlar.csv"   # CIKTI_DIR içinde; csvleri_yaz bu adı temel alır
+WORKER_SAYISI = 4
+MAX_YORUM = 50
+
+
+def shard_of(otel_adi, n):
+    return zlib.crc32(otel_adi.encode("utf-8")) % n
+
+
+def _ekle(f, rec):
+    """JSONL'e bir satır; yazıldığı anda diske gider"""
+    f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _ac(path):
+    """Eklemeye açar; çökmede yarım kalmış son satır varsa yeni kayıtlar alt satırdan başlar"""
+    f = open(path, "a", encoding="utf-8")
+    if f.tell() > 0:
+        with open(path, "rb") as r:
+            r.seek(-1, os.SEEK_END)
+            if r.read(1) != b"\n":
+                f.write("\n")
+    return f
+
+
+def _satirlar(pattern):
+    """Eşleşen JSONL dosyalarındaki kayıtlar (çökmede yarım kalmış son satır atlanır)"""
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def tamamlananlar(out_dir):
+    """Manifest -> {otel: yorum sayısı}"""
+    return {r["otel"]: r["yorum"] for r in _satirlar(os.path.join(out_dir, "tamamlanan_*.jsonl"))}
+
+
+# ============================================
+# WORKER
+# ============================================
+def _worker(k, oteller, out_dir, max_yorum, sayac, hedef, headless):
+    """Bir parça: kendi tarayıcısı, kendi veri ve manifest dosyası"""
+    ov.YORUMLU_OTEL_SAYACI = sayac          # süreçler arası ortak sayaç
+    ov.YORUMLU_OTEL_HEDEF = hedef
+    ov.HEADLESS = headless
+
+    # Alt süreçte atexit çalışmaz: tarayıcı finally ile kapatılır
+    try:
+        _shard_cek(k, oteller, out_dir, max_yorum, hedef)
+    finally:
+        if ov._pool is not None:
+            ov._pool.close()
+
+
+def _shard_cek(k, oteller, out_dir, max_yorum, hedef):
+    with _ac(os.path.join(out_dir, f"shard_{k}.jsonl")) as veri, \
+         _ac(os.path.join(out_dir, f"tamamlanan_{k}.jsonl")) as manifest:
+        for i, otel in enumerate(oteller, 1):
+            if ov.hedefe_ulasildi():
+                print(f"[{k}] ✅ Hedefe ulaşıldı ({hedef} otel), worker duruyor.")
+                break
+            df = ov.google_maps_yorum_cek_otomatik(otel, max_yorum=max_yorum)
+            yorumlar = list(df["yorum"]) if not df.empty else []
+            # Önce veri, sonra manifest: arada çökülürse otel tekrar çekilir,
+            # birleştirmede otelin son satırı alınır
+            _ekle(veri, {"otel": otel, "yorumlar": yorumlar, "zaman": time.time()})
+            _ekle(manifest, {"otel": otel, "yorum": len(yorumlar)})
+            print(f"[{k}] {i}/{len(oteller)} {otel}: {len(yorumlar)} yorum")
+
+
+# ============================================
+# BİRLEŞTİRME
+# ============================================
+def birlestir(out_dir):
+    """Parçaları tek DataFrame'e toplar ve CSV'leri yazar"""
+    son = {}
+    for rec in _satirlar(os.path.join(out_dir, "shard_*.jsonl")):
+        son[rec["otel"]] = rec["yorumlar"]
+    rows = [{"otel_adi": otel, "yorum": y} for otel, yorumlar in son.items() for y in yorumlar]
+    if not rows:
+        print("❌ Hiç otelden veri gelmedi.")
+        return None
+
+    combined_df = pd.DataFrame(rows)
+    csv_tum_yorumlar, csv_otel_listesi, csv_otel_sayim = ov.csvleri_yaz(
+        combined_df, os.path.join(out_dir, CIKTI_CSV))
+
+    print("\n✅ TOPLU İŞLEM BİTTİ")
+    print(f"   İşlenen otel: {len(son)} | yorumu olan: {combined_df['otel_adi'].nunique()}")
+    print(f"   Toplam yorum sayısı: {len(combined_df)}")
+    print(f"   CSV 1 (tüm yorumlar):    {csv_tum_yorumlar}")
+    print(f"   CSV 2 (otel listesi):    {csv_otel_listesi}")
+    print(f"   CSV 3 (yorum sayıları):  {csv_otel_sayim}")
+    return combined_df
+
+
+# ============================================
+# ANA AKIŞ
+# ============================================
+def crawl(oteller, out_dir, workers=WORKER_SAYISI, max_yorum=MAX_YORUM,
+          hedef=ov.YORUMLU_OTEL_HEDEF, headless=ov.HEADLESS, bos_tekrar=False):
+    os.makedirs(out_dir, exist_ok=True)
+    bitti = tamamlananlar(out_dir)
+    kalan = [o for o in dict.fromkeys(oteller)
+             if o not in bitti or (bos_tekrar and bitti[o] == 0)]
+    yorumlu = sum(1 for o, n in bitti.items() if n > 0)
+    print(f"📊 {len(oteller)} otel | {len(bitti)} tamamlanmış ({yorumlu} yorumlu) | "
+          f"{len(kalan)} kalan | {workers} worker")
+    if not kalan or yorumlu >= hedef:
+        return
+
+    # Parça numarası dosya adında; worker sayısı değişirse eski parça dosyaları yine okunur
+    parcalar = [[] for _ in range(workers)]
+    for otel in kalan:
+        parcalar[shard_of(otel, workers)].append(otel)
+
+    ctx = multiprocessing.get_context("spawn")
+    sayac = ctx.Value("i", yorumlu)
+    procs = [ctx.Process(target=_worker, args=(k, parca, out_dir, max_yorum, sayac, hedef, headless))
+             for k, parca in enumerate(parcalar) if parca]
+    t0 = time.time()
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        print("\n⚠️  Durduruldu; aynı komutla kaldığı yerden devam edilir.")
+        for p in procs:
+            p.join()
+        raise
+    hatali = [p.exitcode for p in procs if p.exitcode]
+    print(f"\n⏱️  {time.time() - t0:.0f} sn | yorumlu otel: {sayac.value}"
+          + (f" | ⚠️ {len(hatali)} worker hatayla bitti" if hatali else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paralel, kaldığı yerden devam eden otel yorum çekici")
+    parser.add_argument("liste", nargs="?", default=OTEL_LISTESI)
+    parser.add_argument("-o", "--out", default=CIKTI_DIR, help="parça, manifest ve CSV klasörü")
+    parser.add_argument("--workers", type=int, default=WORKER_SAYISI, help="süreç (= tarayıcı) sayısı")
+    parser.add_argument("--max-yorum", type=int, default=MAX_YORUM)
+    parser.add_argument("--hedef", type=int, default=ov.YORUMLU_OTEL_HEDEF, help="yorumu olan otel hedefi")
+    parser.add_argument("--filtre", default=None, help="atlanacak satırlar (TXT)")
+    parser.add_argument("--atla-il", nargs="*", default=list(ov.ATLA_ILLER),
+                        help=f"bu illerdeki oteller atlanır (varsayılan: {' '.join(ov.ATLA_ILLER)}; "
+                             f"hiçbiri için boş --atla-il)")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--bos-tekrar", action="store_true", help="0 yorumla bitenleri tekrar dene")
+    parser.add_argument("--sadece-birlestir", action="store_true")
+    args = parser.parse_args()
+
+    if not args.sadece_birlestir:
+        oteller = ov.otel_adlarini_oku(args.liste, args.filtre, args.atla_il)
+        crawl(oteller, args.out, args.workers, args.max_yorum, args.hedef,
+              args.headless or ov.HEADLESS, args.bos_tekrar)
+    birlestir(args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,64 @@ en sonda CSV dosyalarında birleştirir.
 
 # pip install selenium webdriver-manager pandas
 
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.options import Options as ChromeOptions
-import time
 import pandas as pd
 from pathlib import Path
 
-import tempfile
+import atexit
+import multiprocessing
 import os
 import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from browser_pool import BrowserPool
+from scrape_wait import wait, clickable, any_present, reviews_grew, summary, BITTI
+
+# Otel listesinde bu illerdeki oteller çekilmez (otel_adlarini_oku varsayılanı)
+ATLA_ILLER = ("Adana",)
 
 # ---- Global sayaç: yorumu olan otel sayısı ----
-YORUMLU_OTEL_SAYACI = 0
+# Süreçler arası paylaşılan sayaç: paralel çekimde (otel_crawler.py) her worker
+# sürecine aynı Value verilir, hedef tüm worker'ların toplamına göre kontrol edilir
+YORUMLU_OTEL_SAYACI = multiprocessing.Value("i", 0)
 YORUMLU_OTEL_HEDEF = 300  # 300 otele ulaşınca duracağız
 
 
+def hedefe_ulasildi():
+    return YORUMLU_OTEL_SAYACI.value >= YORUMLU_OTEL_HEDEF
+
+# ---- Tarayıcı havuzu: Chrome her otel için yeniden açılmaz (bkz. browser_pool.py) ----
+MAPS_URL = "https://www.google.com/maps"
+HEADLESS = False  # Headless istersen True yap
+HAVUZ_MAX_KULLANIM = 25  # bu kadar otelden sonra tarayıcı yenilenir (UA da yeniden seçilir)
+
+# Basit UA döndürme (bazen fayda ediyor)
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
+]
+
+# Bekleme koşullarında kullanılan öğeler (sabit sleep yerine, bkz. scrape_wait.py)
+ONAY_XPATH = (
+    "//button[contains(., 'Kabul') or contains(., 'Accept') or contains(., 'I agree') "
+    "or contains(., 'Tümünü kabul') or contains(., 'Accept all')]"
+)
+ARAMA_KUTUSU = (By.CSS_SELECTOR, "#searchboxinput")
+ARAMA_SONUCU = (By.CSS_SELECTOR, "a.hfpxzc")
+YORUM_BUTONU = (By.XPATH, "//button[contains(., 'Yorum') or contains(., 'İnceleme') or contains(@aria-label, 'Yorum')]")
+YORUM_ELEMANLARI = [
+    (By.CSS_SELECTOR, "div.jftiEf"),
+    (By.CSS_SELECTOR, "div[data-review-id]"),
+    (By.CSS_SELECTOR, "div.fontBodyMedium[aria-label]"),
+]
+
+_pool = None
+
+
 def _try_accept_google_consent(driver, timeout=4):
     """
     Google 'Before you continue' / çerez onayı çıkarsa kapatmayı dener.
@@ -44,8 +82,8 @@ def _try_accept_google_consent(driver, timeout=4):
                 )
                 if btns:
                     driver.execute_script("arguments[0].click();", btns[0])
-                    time.sleep(0.6)
                     driver.switch_to.default_content()
+                    wait(driver, EC.staleness_of(fr), timeout, "onay", legacy_sn=0.6)
                     return True
                 driver.switch_to.default_content()
             except:
@@ -53,14 +91,11 @@ def _try_accept_google_consent(driver, timeout=4):
                 continue
 
         # iframe yoksa direkt sayfa üzerinde dene
-        candidates = driver.find_elements(
-            By.XPATH,
-            "//button[contains(., 'Kabul') or contains(., 'Accept') or contains(., 'I agree') "
-            "or contains(., 'Tümünü kabul') or contains(., 'Accept all')]"
-        )
+        candidates = driver.find_elements(By.XPATH, ONAY_XPATH)
         if candidates:
             driver.execute_script("arguments[0].click();", candidates[0])
-            time.sleep(0.6)
+            # Onay sayfası yeniden yüklenene / kapanana kadar
+            wait(driver, EC.staleness_of(candidates[0]), timeout, "onay", legacy_sn=0.6)
             return True
 
     except:
@@ -69,109 +104,60 @@ def _try_accept_google_consent(driver, timeout=4):
     return False
 
 
-def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
+def _maps_isit(driver):
+    """Yeni tarayıcıda bir kez: Maps ana sayfası + consent/çerez ekranı"""
+    print("🗺️ 0. Adım: Google Maps ana sayfası açılıyor...")
+    driver.get(f"{MAPS_URL}?hl=tr")
+    wait(driver, any_present((By.XPATH, ONAY_XPATH), ARAMA_KUTUSU), 10, "ana_sayfa", legacy_sn=2)
+    _try_accept_google_consent(driver, timeout=4)
+
+
+def _chrome_args():
+    """Her yeni tarayıcı oturumunda çağrılır: UA oturum başına yeniden seçilir"""
+    return ["--disable-popup-blocking", f"--user-agent={random.choice(USER_AGENTS)}"]
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        _pool = BrowserPool(
+            size=1,
+            max_uses=HAVUZ_MAX_KULLANIM,
+            warmup=_maps_isit,
+            headless=HEADLESS,
+            extra_args=_chrome_args,
+            reset_origins=["https://www.google.com"],
+        )
+        atexit.register(_pool.close)
+    return _pool
+
+
+def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50, pool=None):
     """
     Google Maps'ten otel yorumlarını tamamen otomatik çeker
+    pool: BrowserPool (None -> modül genelinde tek sıcak tarayıcı)
     """
-    global YORUMLU_OTEL_SAYACI, YORUMLU_OTEL_HEDEF
-
     print(f"\n🔍 '{otel_adi}' için otomatik yorum çekme başlıyor...\n")
 
-    # --- CHROME ayarları (Gerekli iyileştirmeler: temiz profil + automation izi azalt) ---
-    chrome_options = ChromeOptions()
-    chrome_options.add_argument("--lang=tr-TR")
-    chrome_options.add_argument("--window-size=1920,1080")
-    chrome_options.add_argument("--disable-notifications")
-    chrome_options.add_argument("--disable-popup-blocking")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    # A) Temiz profil klasörü (her çalıştırmada yeni)
-    profile_dir = os.path.join(
-        tempfile.gettempdir(),
-        f"gmaps_selenium_profile_{int(time.time())}"
-    )
-    chrome_options.add_argument(f"--user-data-dir={profile_dir}")
-
-    # (ÖNEMLİ) --guest + --user-data-dir aynı anda sıkıntı çıkarabiliyor.
-    # Bu yüzden guest'i kaldırdım. Temiz user-data-dir zaten yeterli.
-    # chrome_options.add_argument("--guest")
-
-    # Automation izlerini azalt (çok kritik değil ama kapanma/engelleme ihtimalini düşürür)
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-    chrome_options.add_experimental_option("useAutomationExtension", False)
-
-    # Basit UA döndürme (bazen fayda ediyor)
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36",
-    ]
-    chrome_options.add_argument(f"--user-agent={random.choice(user_agents)}")
-
-    # Headless istersen aç:
-    # chrome_options.add_argument("--headless=new")
-
-    driver = webdriver.Chrome(
-        service=ChromeService(ChromeDriverManager().install()),
-        options=chrome_options
-    )
-
-    # navigator.webdriver izini azalt
-    try:
-        driver.execute_cdp_cmd(
-            "Page.addScriptToEvaluateOnNewDocument",
-            {
-                "source": """
-                    Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
-                """
-            },
-        )
-    except:
-        pass
+    # Sıcak oturum: Maps ana sayfası + çerez onayı havuzda bir kez yapıldı (bkz. _maps_isit)
+    pool = _get_pool() if pool is None else pool
+    driver = pool.acquire()
+    adimlar = {}  # adım başına bekleme süreleri
 
     yorumlar = []
 
     try:
-        # B) Önce Maps ana sayfasını aç, sonra arama yap
-        print("🗺️ 0. Adım: Google Maps ana sayfası açılıyor...")
-        driver.get("https://www.google.com/maps?hl=tr")
-        time.sleep(2)
-
-        # Consent/çerez ekranı varsa kapatmayı dene
-        _try_accept_google_consent(driver, timeout=4)
-
-        time.sleep(1)
-
         # 1. Google Maps'te ara
         print("📍 1. Adım: Google Maps'te otel aranıyor...")
-        arama_url = f"https://www.google.com/maps/search/{otel_adi.replace(' ', '+')}?hl=tr"
+        arama_url = f"{MAPS_URL}/search/{otel_adi.replace(' ', '+')}?hl=tr"
         driver.get(arama_url)
-        time.sleep(3)
 
         # 2. Sayfa tipini kontrol et (tek sonuç mu, arama sonuçları mı?)
         print("🏨 2. Adım: Sayfa tipi kontrol ediliyor...")
-        time.sleep(2)
+        sayfa = wait(driver, any_present(ARAMA_SONUCU, YORUM_BUTONU), 10, "arama", legacy_sn=5, log=adimlar)
 
-        yorumlar_butonu_var = False
-        arama_sonuclari_var = False
-
-        try:
-            arama_sonuclari = driver.find_elements(By.CSS_SELECTOR, "a.hfpxzc")
-            if len(arama_sonuclari) > 0:
-                arama_sonuclari_var = True
-        except:
-            pass
-
-        try:
-            driver.find_element(
-                By.XPATH,
-                "//button[contains(., 'Yorum') or contains(., 'İnceleme') or contains(@aria-label, 'Yorum')]"
-            )
-            yorumlar_butonu_var = True
-        except:
-            pass
+        arama_sonuclari_var = bool(sayfa) and sayfa[0] == 0
+        yorumlar_butonu_var = bool(sayfa) and sayfa[0] == 1
 
         if yorumlar_butonu_var and not arama_sonuclari_var:
             print("   ✅ Direkt otel sayfasına gidildi (tek sonuç)")
@@ -182,7 +168,7 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "a.hfpxzc"))
                 )
                 ilk_sonuc.click()
-                time.sleep(3)
+                wait(driver, clickable(YORUM_BUTONU), 10, "otel_sayfasi", legacy_sn=3, log=adimlar)
                 print("   ✅ Otel sayfası açıldı!")
             except Exception as e:
                 print(f"   ❌ İlk sonuca tıklanamadı: {e}")
@@ -191,7 +177,6 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
 
         # 3. Popup'ları kapat (devre dışı)
         print("🚫 3. Adım: Popup kontrolü atlanıyor...")
-        time.sleep(1)
 
         # 4. Yorumlar butonunu bul ve tıkla
         print("💬 4. Adım: Yorumlar sekmesine gidiliyor...")
@@ -239,7 +224,8 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
             if not yorum_butonu_bulundu:
                 print("   ⚠️  Yorumlar butonu bulunamadı, yine de devam ediliyor...")
 
-            time.sleep(3)
+            # Yorum listesi ilk parça gelene kadar
+            wait(driver, any_present(*YORUM_ELEMANLARI), 10, "yorumlar", legacy_sn=3, log=adimlar)
 
         except Exception as e:
             print(f"   ⚠️  Yorumlar butonuna tıklanamadı: {e}")
@@ -257,7 +243,6 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
             )
             driver.execute_script("arguments[0].click();", dogrulama_text)
             print("   ✅ 'Yorumlar doğrulanmamıştır' metnine tıklandı")
-            time.sleep(1)
         except:
             print("   ℹ️  Doğrulama metni bulunamadı, devam ediliyor...")
 
@@ -291,19 +276,14 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
 
         if not scrollable_div:
             print("   ❌ Scroll alanı bulunamadı!")
-            time.sleep(2)
-            driver.quit()
             return pd.DataFrame()
 
         # 6. Yorumların yüklenmesini bekle
         print("⏳ 6. Adım: Yorumlar yükleniyor...")
 
-        for _ in range(5):
-            driver.execute_script('arguments[0].scrollTop += 300', scrollable_div)
-            time.sleep(0.3)
-
+        driver.execute_script('arguments[0].scrollTop += 1500', scrollable_div)
+        wait(driver, any_present(*YORUM_ELEMANLARI), 10, "yorumlar", legacy_sn=2.5, log=adimlar)
         driver.execute_script('arguments[0].scrollTop = 0', scrollable_div)
-        time.sleep(1)
 
         # 7. Yorum seçiciyi belirle
         print("🔎 7. Adım: Yorum elemanları aranıyor...")
@@ -324,8 +304,6 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
 
         if not YORUM_SECICI:
             print("   ❌ Yorum elemanları bulunamadı!")
-            time.sleep(2)
-            driver.quit()
             return pd.DataFrame()
 
         # 8. Yorumları çek
@@ -340,13 +318,11 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
                 for buton in daha_fazla_butonlar[:10]:
                     try:
                         driver.execute_script("arguments[0].click();", buton)
-                        time.sleep(0.1)
                     except:
                         pass
             except:
                 pass
 
-        eski_yorum_sayisi = 0
         dongu_sayaci = 0
         max_dongu = 50
 
@@ -371,15 +347,18 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
         # “artmıyor” durumunda hemen kırma; 3 deneme şansı ver
         stagnation_hits = 0
 
+        eski_yorum_sayisi = len(driver.find_elements(By.CSS_SELECTOR, YORUM_SECICI))
+
         while dongu_sayaci < max_dongu:
+            kosul = reviews_grew(YORUM_SECICI, eski_yorum_sayisi, scrollable_div)
+
             # hızlı burst
             _fast_scroll_burst()
 
-            # UI’nin nefes alması lazım, yoksa yeni batch hiç gelmiyor.
-            time.sleep(0.25)
+            # Yeni batch gelene kadar (ya da spinner kaybolup liste bitene kadar)
+            sonuc = wait(driver, kosul, 5, "kaydirma", legacy_sn=0.5, log=adimlar)
 
             butonu_genislet()
-            time.sleep(0.25)
 
             yorum_elemanlari = driver.find_elements(By.CSS_SELECTOR, YORUM_SECICI)
             cur = len(yorum_elemanlari)
@@ -388,6 +367,10 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
                 print("   ✅ Hedef yorum sayısına ulaşıldı!")
                 break
 
+            if sonuc == BITTI:
+                print("   ℹ️  Yeni yorum yüklenmiyor, liste sonu.")
+                break
+
             if cur == eski_yorum_sayisi:
                 stagnation_hits += 1
                 if stagnation_hits >= 3:
@@ -403,6 +386,8 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
                 print(f"   📝 Çekilen: {cur} yorum...")
 
 
+        butonu_genislet()
+        yorum_elemanlari = driver.find_elements(By.CSS_SELECTOR, YORUM_SECICI)
         print(f"\n✅ Toplam {len(yorum_elemanlari)} yorum bulundu!")
         print("📝 Yorumlar işleniyor...\n")
 
@@ -424,62 +409,44 @@ def google_maps_yorum_cek_otomatik(otel_adi, max_yorum=50):
             except Exception:
                 continue
 
-        print(f"✅ {len(yorumlar)} yorum başarıyla işlendi!\n")
+        print(f"✅ {len(yorumlar)} yorum başarıyla işlendi!")
+        print(f"⏱️  {summary(adimlar)}\n")
 
         # Sayaç
         if len(yorumlar) > 0:
-            YORUMLU_OTEL_SAYACI += 1
-            print(f"🔢 Şu ana kadar yorumu olan otel sayısı: {YORUMLU_OTEL_SAYACI}")
-            if YORUMLU_OTEL_SAYACI >= YORUMLU_OTEL_HEDEF:
+            with YORUMLU_OTEL_SAYACI.get_lock():
+                YORUMLU_OTEL_SAYACI.value += 1
+                sayac = YORUMLU_OTEL_SAYACI.value
+            print(f"🔢 Şu ana kadar yorumu olan otel sayısı: {sayac}")
+            if sayac >= YORUMLU_OTEL_HEDEF:
                 print(f"🚫 Hedefe ulaşıldı ({YORUMLU_OTEL_HEDEF} otel).")
 
     except Exception as e:
         print(f"❌ Hata oluştu: {e}")
         import traceback
         traceback.print_exc()
+        pool.mark_broken(driver)  # tarayıcı kapatılıp yenisi açılır
 
     finally:
-        print("🔒 Tarayıcı kapatılıyor...")
-        time.sleep(1)
-        driver.quit()
-
-        # Temiz profil klasörünü silmeyi dene (kilitli olursa sorun etme)
-        try:
-            import shutil
-            shutil.rmtree(profile_dir, ignore_errors=True)
-        except:
-            pass
+        # Sekmeler kapatılır, sayfa depoları silinir; tarayıcı sonraki otel için açık kalır
+        pool.release(driver)
 
     return pd.DataFrame(yorumlar)
 
 
 # Diğer fonksiyonların aynı kalsın:
-def tum_otelleri_txtten_cek(
-    all_hotels_txt=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\otelk.txt",
-    filtered_txt=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\otelk_filtered.txt",
-    max_yorum=50,
-    output_csv=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\tum_oteller_yorumlar3.csv"
-):
-    global YORUMLU_OTEL_SAYACI, YORUMLU_OTEL_HEDEF
-
-    all_hotels_path = Path(all_hotels_txt)
-    filtered_path = Path(filtered_txt)
-
-    if not all_hotels_path.exists():
-        print(f"❌ Tüm oteller TXT dosyası bulunamadı: {all_hotels_path}")
-        return
-
-    if not filtered_path.exists():
-        print(f"❌ Filtre TXT dosyası bulunamadı: {filtered_path}")
-        return
-
-    with open(filtered_path, "r", encoding="utf-8") as f:
-        filtered_lines = {line.strip() for line in f.readlines() if line.strip()}
-
-    all_dfs = []
-    YORUMLU_OTEL_SAYACI = 0
+def otel_adlarini_oku(all_hotels_txt, filtered_txt=None, atla_iller=ATLA_ILLER):
+    """
+    TXT'deki otel adları (satırın virgülden önceki kısmı), sırayla.
+    filtered_txt'deki satırlar ve il'i atla_iller'de olanlar atlanır.
+    """
+    filtered_lines = set()
+    if filtered_txt:
+        with open(filtered_txt, "r", encoding="utf-8") as f:
+            filtered_lines = {line.strip() for line in f.readlines() if line.strip()}
 
-    with open(all_hotels_path, "r", encoding="utf-8") as f:
+    oteller = []
+    with open(all_hotels_txt, "r", encoding="utf-8") as f:
         for line in f:
             line = line.strip()
             if not line:
@@ -492,32 +459,15 @@ def tum_otelleri_txtten_cek(
             if len(parts) == 0:
                 continue
 
-            otel_adi = parts[0]
-
-            if len(parts) > 1:
-                il = parts[-1]
-                if il == "Adana":
-                    continue
-
-            if YORUMLU_OTEL_SAYACI >= YORUMLU_OTEL_HEDEF:
-                print(f"✅ Zaten {YORUMLU_OTEL_HEDEF} otelin yorumu alındı, döngü sonlandırılıyor.")
-                break
-
-            df_otel = google_maps_yorum_cek_otomatik(otel_adi=otel_adi, max_yorum=max_yorum)
+            if len(parts) > 1 and parts[-1] in atla_iller:
+                continue
 
-            if not df_otel.empty:
-                all_dfs.append(df_otel)
+            oteller.append(parts[0])
+    return oteller
 
-            if YORUMLU_OTEL_SAYACI >= YORUMLU_OTEL_HEDEF:
-                print(f"✅ {YORUMLU_OTEL_HEDEF} otelin yorumu alındı, döngü durduruluyor.")
-                break
-
-    if not all_dfs:
-        print("❌ Hiç otelden veri gelmedi.")
-        return
-
-    combined_df = pd.concat(all_dfs, ignore_index=True)
 
+def csvleri_yaz(combined_df, output_csv):
+    """Tüm yorumlar, otel listesi ve otel başına yorum sayısı CSV'leri -> (yollar)"""
     output_csv = Path(output_csv)
     base_dir = output_csv.parent
     base_stem = output_csv.stem
@@ -534,8 +484,53 @@ def tum_otelleri_txtten_cek(
     csv_otel_sayim = base_dir / f"{base_stem}_otel_yorum_sayilari.csv"
     df_counts.to_csv(csv_otel_sayim, index=False, encoding="utf-8-sig")
 
+    return csv_tum_yorumlar, csv_otel_listesi, csv_otel_sayim
+
+
+# Paralel, kaldığı yerden devam eden sürüm: otel_crawler.py
+def tum_otelleri_txtten_cek(
+    all_hotels_txt=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\otelk.txt",
+    filtered_txt=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\otelk_filtered.txt",
+    max_yorum=50,
+    output_csv=r"C:\Users\Acer\Desktop\mucahit\nlp\nlpdersiproje\tum_oteller_yorumlar3.csv"
+):
+    all_hotels_path = Path(all_hotels_txt)
+    filtered_path = Path(filtered_txt)
+
+    if not all_hotels_path.exists():
+        print(f"❌ Tüm oteller TXT dosyası bulunamadı: {all_hotels_path}")
+        return
+
+    if not filtered_path.exists():
+        print(f"❌ Filtre TXT dosyası bulunamadı: {filtered_path}")
+        return
+
+    all_dfs = []
+    YORUMLU_OTEL_SAYACI.value = 0
+
+    for otel_adi in otel_adlarini_oku(all_hotels_path, filtered_path):
+        if hedefe_ulasildi():
+            print(f"✅ Zaten {YORUMLU_OTEL_HEDEF} otelin yorumu alındı, döngü sonlandırılıyor.")
+            break
+
+        df_otel = google_maps_yorum_cek_otomatik(otel_adi=otel_adi, max_yorum=max_yorum)
+
+        if not df_otel.empty:
+            all_dfs.append(df_otel)
+
+        if hedefe_ulasildi():
+            print(f"✅ {YORUMLU_OTEL_HEDEF} otelin yorumu alındı, döngü durduruluyor.")
+            break
+
+    if not all_dfs:
+        print("❌ Hiç otelden veri gelmedi.")
+        return
+
+    combined_df = pd.concat(all_dfs, ignore_index=True)
+    csv_tum_yorumlar, csv_otel_listesi, csv_otel_sayim = csvleri_yaz(combined_df, output_csv)
+
     print("\n✅ TOPLU İŞLEM BİTTİ")
-    print(f"   Yorumu olan otel sayısı: {YORUMLU_OTEL_SAYACI}")
+    print(f"   Yorumu olan otel sayısı: {YORUMLU_OTEL_SAYACI.value}")
     print(f"   Toplam yorum sayısı: {len(combined_df)}")
     print(f"   CSV 1 (tüm yorumlar):    {csv_tum_yorumlar}")
     print(f"   CSV 2 (otel listesi):    {csv_otel_listesi}")